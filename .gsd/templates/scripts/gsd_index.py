@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+import math
+import re
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    # Optional: without NumPy, batch scoring walks the postings per context
+    np = None
+HAVE_NUMPY = np is not None
+
+# Search structures built once per registry load and queried per context.
+
+TOKEN_RE = re.compile(r'\w+')
+MIN_TOKEN_LEN = 2
+
+# BM25 parameters (standard Okapi defaults)
+K1 = 1.2
+B = 0.75
+
+# Trigram fuzzy matching: only query tokens this long with no exact posting are expanded
+FUZZY_MIN_LEN = 4
+FUZZY_TERMS_PER_TOKEN = 3
+
+# ScoreMatrix: dense score cells per chunk of contexts (~64 MiB of float64)
+MATRIX_CELLS = 1 << 23
+
+def tokenize(text):
+    """Lowercased word tokens; single characters carry no signal and are dropped."""
+    return [t for t in TOKEN_RE.findall(text.lower()) if len(t) >= MIN_TOKEN_LEN]
+
+class PatternMatcher:
+    """
+    Aho-Corasick automaton: reports every pattern occurring in a text in one
+    linear pass, however many patterns there are. Transitions live in a single
+    dict keyed by (state << 21 | codepoint), which is far smaller than a dict
+    per trie node for registries with thousands of names.
+    """
+    def __init__(self, patterns):
+        """`patterns` is an iterable of (string, value); empty strings never match."""
+        self.goto = {}
+        self.fail = [0]
+        self.out = [()]
+        children = [[]]
+        terminal = {}
+
+        # 1. Trie of all patterns
+        for pattern, value in patterns:
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                key = state << 21 | ord(ch)
+                nxt = self.goto.get(key)
+                if nxt is None:
+                    nxt = len(self.fail)
+                    self.goto[key] = nxt
+                    self.fail.append(0)
+                    self.out.append(())
+                    children.append([])
+                    children[state].append((ord(ch), nxt))
+                state = nxt
+            terminal.setdefault(state, []).append(value)
+        for state, values in terminal.items():
+            self.out[state] = tuple(values)
+
+        # 2. Failure links, breadth first; outputs inherit along them
+        queue = [child for _, child in children[0]]
+        for state in queue:
+            for code, child in children[state]:
+                f = self.fail[state]
+                while f and (f << 21 | code) not in self.goto:
+                    f = self.fail[f]
+                self.fail[child] = self.goto.get(f << 21 | code, 0)
+                if self.out[self.fail[child]]:
+                    self.out[child] = self.out[child] + self.out[self.fail[child]]
+                queue.append(child)
+
+    def search(self, text):
+        """The set of values whose pattern occurs anywhere in `text`."""
+        goto, fail, out = self.goto, self.fail, self.out
+        hits = set()
+        state = 0
+        for ch in text:
+            code = ord(ch)
+            while True:
+                nxt = goto.get(state << 21 | code)
+                if nxt is not None:
+                    state = nxt
+                    break
+                if not state:
+                    break
+                state = fail[state]
+            if out[state]:
+                hits.update(out[state])
+        return hits
+
+    def state(self):
+        """The automaton in plain JSON types, for from_state()."""
+        return {
+            "keys": list(self.goto),
+            "next": list(self.goto.values()),
+            "fail": self.fail,
+            "out": [[state, list(values)] for state, values in enumerate(self.out) if values],
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """A matcher restored from state() without rebuilding the trie."""
+        matcher = cls.__new__(cls)
+        matcher.goto = dict(zip(state["keys"], state["next"]))
+        matcher.fail = state["fail"]
+        matcher.out = [()] * len(matcher.fail)
+        for node, values in state["out"]:
+            matcher.out[node] = tuple(values)
+        return matcher
+
+def trigrams(term):
+    """Character trigrams of `term`, padded with a space so short terms and word edges count."""
+    padded = f" {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def item_tokens(item):
+    if 'tokens' in item:
+        return item['tokens']
+    return tokenize(" ".join((item.get('name') or "", item.get('id') or "", item.get('description') or "")))
+
+class RegistryIndex:
+    """
+    Inverted index over the name/id/description fields of registry items.
+    Documents are positions in `items`; postings map token -> [(doc, tf), ...].
+    Lowercased names and ids are also compiled into a PatternMatcher for
+    substring hits (see name_id_hits), and the vocabulary into a trigram
+    index for approximate matches (see fuzzy_terms).
+    """
+    def __init__(self, items):
+        self.items = items
+        self.postings = {}
+        self.doc_norm = []
+        self._id_filters = {}
+        # Pattern values: doc * 2 for a name hit, doc * 2 + 1 for an id hit
+        self.matcher = PatternMatcher(
+            (pattern, doc * 2 + field)
+            for doc, item in enumerate(items)
+            for field, pattern in enumerate(((item.get('name') or "").lower(), (item.get('id') or "").lower()))
+        )
+
+        doc_lens = []
+        for doc, item in enumerate(items):
+            counts = {}
+            tokens = item_tokens(item)
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, tf in counts.items():
+                self.postings.setdefault(token, []).append((doc, tf))
+            doc_lens.append(len(tokens))
+
+        avg_len = (sum(doc_lens) / len(doc_lens)) if doc_lens else 0.0
+        for length in doc_lens:
+            # Length normalisation is per document, so fold it in at build time
+            self.doc_norm.append(K1 * (1 - B + B * length / avg_len) if avg_len else K1)
+
+        # Trigram -> ids of vocabulary terms containing it
+        self.terms = list(self.postings)
+        self.term_grams = array('H')
+        gram_postings = {}
+        for term_id, term in enumerate(self.terms):
+            grams = trigrams(term)
+            self.term_grams.append(min(len(grams), 0xFFFF))
+            for gram in grams:
+                gram_postings.setdefault(gram, []).append(term_id)
+        self.gram_postings = {gram: array('I', ids) for gram, ids in gram_postings.items()}
+
+    def state(self):
+        """
+        Everything but `items` in plain JSON types, so a stored registry
+        (see gsd_registry) can be restored with from_state() instead of rebuilt.
+        """
+        return {
+            "postings": {token: [x for posting in postings for x in posting] for token, postings in self.postings.items()},
+            "doc_norm": self.doc_norm,
+            "term_grams": self.term_grams.tolist(),
+            "gram_postings": {gram: ids.tolist() for gram, ids in self.gram_postings.items()},
+            "matcher": self.matcher.state(),
+        }
+
+    @classmethod
+    def from_state(cls, items, state):
+        index = cls.__new__(cls)
+        index.items = items
+        index._id_filters = {}
+        # Postings are stored flat as doc, tf, doc, tf, ...
+        index.postings = {token: list(zip(flat[::2], flat[1::2])) for token, flat in state["postings"].items()}
+        index.doc_norm = state["doc_norm"]
+        index.terms = list(index.postings)
+        index.term_grams = array('H', state["term_grams"])
+        index.gram_postings = {gram: array('I', ids) for gram, ids in state["gram_postings"].items()}
+        index.matcher = PatternMatcher.from_state(state["matcher"])
+        return index
+
+    def bm25(self, query):
+        """
+        Returns {doc: score} for every document sharing at least one token with
+        the query: a list of tokens, or {token: weight} as from query_weights().
+        """
+        weights = query if isinstance(query, dict) else dict.fromkeys(query, 1.0)
+        scores = {}
+        n = len(self.items)
+        for token, weight in weights.items():
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = weight * math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for doc, tf in postings:
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (K1 + 1) / (tf + self.doc_norm[doc])
+        return scores
+
+    def fuzzy_terms(self, token, threshold, limit=FUZZY_TERMS_PER_TOKEN):
+        """
+        Up to `limit` vocabulary terms whose trigram Dice similarity to `token`
+        is at least `threshold`, as [(term, similarity)] best first.
+
+        Dice >= t needs at least ceil(t * n / (2 - t)) shared trigrams out of the
+        token's n, so every match contains one of the n - overlap + 1 rarest
+        query trigrams. Only those postings are read; the common trigrams are
+        checked per candidate, which keeps lookups cheap in large vocabularies.
+        """
+        grams = trigrams(token)
+        n = len(grams)
+        if not n or not 0 < threshold <= 1:
+            return []
+        min_overlap = max(1, math.ceil(threshold * n / (2 - threshold) - 1e-9))
+        if min_overlap > n:
+            return []
+        ordered = sorted(grams, key=lambda g: len(self.gram_postings.get(g, ())))
+        prefix_ids = set()
+        for gram in ordered[:n - min_overlap + 1]:
+            prefix_ids.update(self.gram_postings.get(gram, ()))
+
+        # Length filter: a term with m trigrams can reach t only if t*n/(2-t) <= m <= (2-t)*n/t
+        min_grams = threshold * n / (2 - threshold) - 1e-9
+        max_grams = (2 - threshold) * n / threshold + 1e-9
+        matches = []
+        for term_id in prefix_ids:
+            m = self.term_grams[term_id]
+            if not min_grams <= m <= max_grams:
+                continue
+            term = self.terms[term_id]
+            similarity = 2 * len(grams & trigrams(term)) / (n + m)
+            if similarity >= threshold and term != token:
+                matches.append((similarity, term))
+        matches.sort(key=lambda x: (-x[0], x[1]))
+        return [(term, similarity) for similarity, term in matches[:limit]]
+
+    def query_weights(self, query_tokens, fuzzy_threshold=None, fuzzy_weight=1.0):
+        """
+        {token: weight} for bm25(). Every query token weighs 1; with a
+        `fuzzy_threshold`, tokens of at least FUZZY_MIN_LEN characters that
+        have no posting of their own also add their fuzzy_terms(), weighted
+        by similarity * `fuzzy_weight`.
+        """
+        weights = dict.fromkeys(query_tokens, 1.0)
+        if fuzzy_threshold is None:
+            return weights
+        for token in list(weights):
+            if len(token) < FUZZY_MIN_LEN or token in self.postings:
+                continue
+            for term, similarity in self.fuzzy_terms(token, fuzzy_threshold):
+                weights[term] = max(weights.get(term, 0.0), similarity * fuzzy_weight)
+        return weights
+
+    def name_id_hits(self, context):
+        """
+        {doc: (name_hit, id_hit)} for every item whose lowercased name or id
+        occurs in the (already lowercased) context, found in one pass.
+        """
+        hits = {}
+        for value in self.matcher.search(context):
+            doc, field = divmod(value, 2)
+            name_hit, id_hit = hits.get(doc, (False, False))
+            hits[doc] = (name_hit or not field, id_hit or bool(field))
+        return hits
+
+    def docs_with_id_containing(self, *terms):
+        """Documents whose id contains any of `terms` (memoised per term set)."""
+        cached = self._id_filters.get(terms)
+        if cached is None:
+            cached = [doc for doc, item in enumerate(self.items)
+                      if any(t in (item.get('id') or "").lower() for t in terms)]
+            self._id_filters[terms] = cached
+        return cached
+
+    def source_text(self, item):
+        """A shared copy of the item's source file, if the index holds one (see gsd_snapshot)."""
+        return None
+
+class ScoreMatrix:
+    """
+    The BM25 weights of a RegistryIndex as a sparse token x item matrix,
+    stored by token (indptr/docs/weights arrays). Scoring many contexts is one
+    sparse product Q @ W, where row r of Q holds the token weights of query r
+    (see RegistryIndex.query_weights), so each row equals RegistryIndex.bm25().
+    Requires NumPy; check HAVE_NUMPY before building one.
+    """
+    def __init__(self, index):
+        n = len(index.items)
+        self.n_items = n
+        self.vocab = {}
+        ptr, docs, weights = [0], [], []
+        for token, postings in index.postings.items():
+            df = len(postings)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            self.vocab[token] = len(self.vocab)
+            for doc, tf in postings:
+                docs.append(doc)
+                weights.append(idf * tf * (K1 + 1) / (tf + index.doc_norm[doc]))
+            ptr.append(len(docs))
+        self.ptr = np.array(ptr, dtype=np.int64)
+        self.docs = np.array(docs, dtype=np.int64)
+        self.weights = np.array(weights, dtype=np.float64)
+
+    def chunk_size(self):
+        """Contexts per scores() call that keep the dense result within MATRIX_CELLS."""
+        return max(1, MATRIX_CELLS // max(1, self.n_items))
+
+    def scores(self, queries):
+        """Dense (len(queries), n_items) BM25 scores; each query is a token list or {token: weight}."""
+        rows, cols, query_weights = [], [], []
+        for row, query in enumerate(queries):
+            weights = query if isinstance(query, dict) else dict.fromkeys(query, 1.0)
+            for token, weight in weights.items():
+                if token in self.vocab:
+                    rows.append(row)
+                    cols.append(self.vocab[token])
+                    query_weights.append(weight)
+        rows = np.array(rows, dtype=np.int64)
+        cols = np.array(cols, dtype=np.int64)
+        query_weights = np.array(query_weights, dtype=np.float64)
+
+        # Expand every (row, token) pair into that token's postings, then sum per cell
+        starts = self.ptr[cols]
+        lengths = self.ptr[cols + 1] - starts
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(int(lengths.sum()))
+        cells = np.repeat(rows, lengths) * self.n_items + self.docs[offsets]
+        shape = (len(queries), self.n_items)
+        weights = self.weights[offsets] * np.repeat(query_weights, lengths)
+        return np.bincount(cells, weights=weights, minlength=shape[0] * shape[1]).reshape(shape)
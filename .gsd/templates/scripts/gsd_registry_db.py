@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+import os
+import json
+import heapq
+import sqlite3
+
+from gsd_index import PatternMatcher, tokenize
+from gsd_registry import CACHE_DIR, inventory_stamp, load_registry, read_source
+
+# --- Configuration ---
+# Optional query store for `gsd_select.py --backend sqlite`, written by gsd_sync
+REGISTRY_DB = os.path.join(CACHE_DIR, "registry.sqlite")
+# Bump whenever the schema changes; an older database is rebuilt from scratch
+REGISTRY_DB_FORMAT = 1
+# bm25() column weights for item_text(name, description, body): the SKILL.md body
+# is long and noisy, so the curated name and description dominate the rank
+FTS_WEIGHTS = (4.0, 2.0, 1.0)
+BUSY_TIMEOUT = 10.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS items (
+    rowid INTEGER PRIMARY KEY,  -- registry order: skills, then MCP servers
+    id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    inventory TEXT NOT NULL,
+    path TEXT,
+    name_lc TEXT NOT NULL,
+    id_lc TEXT NOT NULL,
+    span_offset INTEGER,
+    span_length INTEGER,
+    sha256 TEXT,
+    source_mtime_ns INTEGER,
+    source_size INTEGER
+);
+CREATE TABLE IF NOT EXISTS sections (
+    item INTEGER NOT NULL REFERENCES items(rowid),
+    position INTEGER NOT NULL,
+    heading TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    heading_tokens TEXT NOT NULL,
+    tokens TEXT NOT NULL,
+    PRIMARY KEY (item, position)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS item_text USING fts5(name, description, body, tokenize="unicode61 tokenchars '_'");
+"""
+
+# FTS relevance of the items matching a query; only matching rows are visited
+FTS_SQL = "SELECT rowid, -bm25(item_text, {weights}) FROM item_text WHERE item_text MATCH ?"
+
+def connect(path=REGISTRY_DB):
+    """
+    Connection in WAL mode: any number of readers proceed while gsd_sync
+    rewrites the registry, each seeing the last committed version.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+def read_meta(conn):
+    try:
+        return {key: json.loads(value) for key, value in conn.execute("SELECT key, value FROM meta")}
+    except sqlite3.OperationalError:
+        return {}
+
+def is_current(conn, skills_path, mcps_path, stamp):
+    meta = read_meta(conn)
+    return (meta.get("format") == REGISTRY_DB_FORMAT
+            and meta.get("sources") == [skills_path, mcps_path]
+            and meta.get("stamp") == json.loads(json.dumps(stamp)))
+
+def _item_rows(items):
+    for rowid, item in enumerate(items, 1):
+        span = item.get('span') or (None, None)
+        source_stamp = item.get('source_stamp') or (None, None)
+        data, _ = read_source(item)
+        body = data.decode('utf-8', 'replace') if data is not None else ""
+        yield rowid, item, span, source_stamp, body
+
+def write_registry_db(compiled, path=REGISTRY_DB):
+    """
+    Replaces the database contents with a compiled registry (see
+    gsd_registry.compile_registry) in one transaction. Returns False
+    without writing if it already holds these inventory stamps.
+    """
+    skills_path, mcps_path = compiled["sources"]
+    conn = connect(path)
+    try:
+        if is_current(conn, skills_path, mcps_path, compiled["stamp"]):
+            return False
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have rebuilt it while this one waited for the lock
+            if is_current(conn, skills_path, mcps_path, compiled["stamp"]):
+                conn.execute("ROLLBACK")
+                return False
+            if read_meta(conn).get("format") not in (None, REGISTRY_DB_FORMAT):
+                for table in ("meta", "sections", "items", "item_text"):
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+            for statement in SCHEMA.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+            for table in ("sections", "items", "item_text"):
+                conn.execute(f"DELETE FROM {table}")
+            for rowid, item, span, source_stamp, body in _item_rows(compiled["skills"] + compiled["mcps"]):
+                conn.execute(
+                    "INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (rowid, item['id'], item.get('name') or "", item.get('description') or "", item['confidence'],
+                     item['inventory'], item.get('path'), item['name_lc'], item['id_lc'],
+                     span[0], span[1], item.get('sha256'), source_stamp[0], source_stamp[1]))
+                conn.execute("INSERT INTO item_text (rowid, name, description, body) VALUES (?, ?, ?, ?)",
+                             (rowid, item.get('name') or "", item.get('description') or "", body))
+                conn.executemany(
+                    "INSERT INTO sections VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    ((rowid, position, s['heading'], s['offset'], s['length'],
+                      " ".join(sorted(s['heading_tokens'])), " ".join(sorted(s['tokens'])))
+                     for position, s in enumerate(item.get('sections') or ())))
+            conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", (
+                ("format", json.dumps(REGISTRY_DB_FORMAT)),
+                ("sources", json.dumps([skills_path, mcps_path])),
+                ("stamp", json.dumps(compiled["stamp"])),
+            ))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return True
+    finally:
+        conn.close()
+
+def open_registry_db(skills_path, mcps_path, stamp=None, path=REGISTRY_DB):
+    """
+    Read connection to the registry database. Like load_registry() for the
+    sidecar, a missing, stale or older-format database is rebuilt first.
+    """
+    if stamp is None:
+        stamp = inventory_stamp((skills_path, mcps_path))
+    conn = connect(path)
+    if not is_current(conn, skills_path, mcps_path, stamp):
+        write_registry_db(load_registry(skills_path, mcps_path, stamp), path)
+    return conn
+
+def fts_query(context):
+    """FTS5 MATCH expression: any of the context's tokens, each quoted so none reads as an operator."""
+    return " OR ".join(f'"{token}"' for token in dict.fromkeys(tokenize(context)))
+
+def row_item(row):
+    """The fields of a registry item that Selector.render() and extraction use."""
+    item = {
+        "id": row["id"],
+        "name": row["name"],
+        "description": row["description"],
+        "confidence": row["confidence"],
+        "inventory": row["inventory"],
+        "path": row["path"],
+        "name_lc": row["name_lc"],
+        "id_lc": row["id_lc"],
+        "sha256": row["sha256"],
+        "rowid": row["rowid"],
+        "source_stamp": (row["source_mtime_ns"], row["source_size"]) if row["source_mtime_ns"] is not None else None,
+    }
+    if row["span_offset"] is not None:
+        item["span"] = (row["span_offset"], row["span_length"])
+    return item
+
+class ItemLookup:
+    """
+    What rank_items() needs besides FTS: an Aho-Corasick matcher over item
+    names and ids, and the rows whose id contains a heuristic term. Read from
+    `items` once per database version instead of on every query.
+    """
+    def __init__(self, conn):
+        rows = conn.execute("SELECT rowid, name_lc, id_lc FROM items ORDER BY rowid").fetchall()
+        self.ids = [(row["rowid"], row["id_lc"]) for row in rows]
+        self.matcher = PatternMatcher(
+            [(row["name_lc"], row["rowid"] * 2) for row in rows] + [(row["id_lc"], row["rowid"] * 2 + 1) for row in rows])
+        self._id_filters = {}
+
+    def name_id_hits(self, context):
+        """{rowid: (name_hit, id_hit)} for every item whose name or id occurs in the lowercased context."""
+        hits = {}
+        for value in self.matcher.search(context):
+            rowid, field = divmod(value, 2)
+            name_hit, id_hit = hits.get(rowid, (False, False))
+            hits[rowid] = (name_hit or not field, id_hit or bool(field))
+        return hits
+
+    def rows_with_id_containing(self, *terms):
+        """Rowids whose id contains any of `terms` (memoised per term set)."""
+        cached = self._id_filters.get(terms)
+        if cached is None:
+            cached = [rowid for rowid, id_lc in self.ids if any(t in id_lc for t in terms)]
+            self._id_filters[terms] = cached
+        return cached
+
+def rank_items(conn, context, limit, weights, lookup=None):
+    """
+    [(score, item)] best first, at most `limit`. SQLite supplies bm25()
+    relevance for the FTS matches; the name/id boosts and task heuristics of
+    score_candidates() come from `lookup` (an ItemLookup for `conn`), so only
+    items with some score are ever read. `weights` maps w_name, w_id,
+    w_heuristic, debug_triggers and debug_id_terms as in gsd_select.
+    """
+    lookup = lookup or ItemLookup(conn)
+    context = context.lower()
+    scores = {}
+
+    # 1. FTS relevance; MATCH rejects an empty expression, so a context
+    #    without tokens can only score through the boosts
+    query = fts_query(context)
+    if query:
+        sql = FTS_SQL.format(weights=", ".join(str(w) for w in FTS_WEIGHTS))
+        for rowid, relevance in conn.execute(sql, (query,)):
+            scores[rowid] = relevance
+
+    # 2. Name/id boosts and task heuristics, in score_candidates() order
+    for rowid, (name_hit, id_hit) in lookup.name_id_hits(context).items():
+        scores[rowid] = scores.get(rowid, 0) + (weights["w_name"] if name_hit else 0) + (weights["w_id"] if id_hit else 0)
+    if any(t in context for t in weights["debug_triggers"]):
+        for rowid in lookup.rows_with_id_containing(*weights["debug_id_terms"]):
+            scores[rowid] = scores.get(rowid, 0) + weights["w_heuristic"]
+    if "map" in context:
+        for rowid in lookup.rows_with_id_containing("mapper"):
+            scores[rowid] = scores.get(rowid, 0) + weights["w_heuristic"]
+
+    # 3. Top `limit`, then fetch just those rows
+    top = heapq.nsmallest(limit, ((-score, rowid) for rowid, score in scores.items() if score > 0))
+    if not top:
+        return []
+    rows = {row["rowid"]: row for row in conn.execute(
+        f"SELECT * FROM items WHERE rowid IN ({', '.join('?' * len(top))})", [rowid for _, rowid in top])}
+    return [(-neg_score, row_item(rows[rowid])) for neg_score, rowid in top]
+
+def item_sections(conn, rowid):
+    """The recorded `##` sections of an item, in the form gsd_registry.index_sections() returns."""
+    return [{
+        "heading": row["heading"],
+        "offset": row["offset"],
+        "length": row["length"],
+        "heading_tokens": frozenset(row["heading_tokens"].split()),
+        "tokens": frozenset(row["tokens"].split()),
+    } for row in conn.execute("SELECT * FROM sections WHERE item = ? ORDER BY position", (rowid,))]
@@ -2,55 +2,83 @@
 import os
 import re
 import json
+import mmap
 import sys
-import xml.etree.ElementTree as ET
-import fcntl
 import time
+import argparse
+import signal
+import socket
+import socketserver
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from gsd_audit import AUDIT_LOG, DURABILITY_MODES, AuditLogger, store_blob
+from gsd_index import HAVE_NUMPY, RegistryIndex, ScoreMatrix, tokenize
+from gsd_registry import extract_registry, inventory_stamp
+from gsd_registry_db import REGISTRY_DB, ItemLookup, item_sections, open_registry_db, rank_items
+from gsd_snapshot import load_shared_registry
 
 
 # --- Configuration ---
 SKILLS_INVENTORY = ".gsd/SKILLS.md"
 MCPS_INVENTORY = ".gsd/MCPS.md"
+SOCKET_PATH = ".gsd/.cache/gsd_select.sock"
+CLIENT_TIMEOUT = 30.0
+# Batch mode hands audit events to the logger in groups of this size
+BATCH_LOG_SIZE = 500
+# Pooled and vectorized batches read this many lines ahead, bounding memory
+BATCH_WINDOW = 1024
+PROFILE_PATH = ".gsd/logs/gsd_select.prof"
+# index: in-memory BM25 over the compiled registry; sqlite: ranked SQL against REGISTRY_DB
+BACKENDS = ("index", "sqlite")
 
-def extract_registry(path):
-    if not os.path.exists(path):
-        return []
-    
-    with open(path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Locate the registry tag - ensure it's the block and not a text mention
-    tag_match = re.search(r'\n(<gsd_registry.*?>.*?</gsd_registry>)', content, re.DOTALL)
-    if not tag_match:
-        # Fallback to start of string or search without leading newline if it's the only content
-        tag_match = re.search(r'(<gsd_registry.*?>.*?</gsd_registry>)', content, re.DOTALL)
-    
-    if not tag_match:
-        return []
-    
-    registry_xml = tag_match.group(1).strip()
-    
+# Post-ranking boosts on top of the BM25 relevance score
+W_NAME = 10
+W_ID = 3
+W_HEURISTIC = 5
+DEBUG_TRIGGERS = ("debug", "bug", "fix")
+DEBUG_ID_TERMS = ("debug", "fix")
+
+# Typo tolerance: context tokens missing from the vocabulary also match terms whose
+# trigram similarity reaches the threshold (0 disables), at W_FUZZY x similarity of
+# an exact match's BM25 weight, so an exact hit on a term always outranks a fuzzy one
+FUZZY_THRESHOLD = float(os.environ.get("GSD_FUZZY_THRESHOLD", "0.5"))
+W_FUZZY = 0.5
+
+# --budget-tokens: offline size estimate and knapsack bounds
+CHARS_PER_TOKEN = 4
+BUDGET_CANDIDATES = 32       # top-ranked items considered for packing
+KNAPSACK_RESOLUTION = 1000   # capacity columns in the knapsack table
+
+# --sections: how many of each selected skill's `##` sections to inject
+SECTIONS_PER_ITEM = 2
+W_SECTION_HEADING = 2
+
+def read_inventory_span(item_id, inventory_path, span):
+    """
+    Slices an item's section out of the memory-mapped inventory using the
+    (offset, length) recorded by gsd_sync. Returns None if the slice is not
+    that item's section (e.g. the inventory was edited by hand).
+    """
+    offset, length = span
     try:
-        root = ET.fromstring(registry_xml)
-        items = []
-        for item in root.findall('item'):
-            items.append({
-                "id": item.get('id'),
-                "confidence": float(item.get('confidence', 0)),
-                "name": item.find('name').text if item.find('name') is not None else "",
-                "path": item.find('path').text if item.find('path') is not None else "",
-                "description": item.find('description').text if item.find('description') is not None else ""
-            })
-        return items
-    except Exception as e:
-        print(f"Error parsing registry in {path}: {e}")
-        return []
+        with open(inventory_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if offset < 0 or offset + length > len(mm):
+                return None
+            text = mm[offset:offset + length].decode('utf-8')
+    except (OSError, ValueError):
+        return None
+    text = text.replace('\r\n', '\n')
+    if not text.startswith("## ") or f"- **ID**: `{item_id}`" not in text:
+        return None
+    return text
 
-def get_full_extraction(item_id, inventory_path, item_path=None):
+def get_full_extraction(item_id, inventory_path, item_path=None, span=None):
     """
     Extracts the full skill content.
     If item_path is provided (from registry), reads that file directly.
-    Otherwise, falls back to parsing the inventory file (legacy behavior).
+    Otherwise, slices the item's recorded span out of the inventory, falling
+    back to parsing the inventory file (legacy behavior) when there is none.
     """
     # Optimized Path: Read directly from source file
     if item_path and os.path.exists(item_path):
@@ -61,6 +89,12 @@ def get_full_extraction(item_id, inventory_path, item_path=None):
             print(f"Error reading skill file {item_path}: {e}")
             return ""
 
+    # Indexed Path: O(1) slice of the inventory at the recorded byte span
+    if span is not None:
+        text = read_inventory_span(item_id, inventory_path, span)
+        if text is not None:
+            return text
+
     # Legacy Path: extract from inventory (SKILLS.md split by ---)
     if not os.path.exists(inventory_path):
         return ""
@@ -81,137 +115,779 @@ def get_full_extraction(item_id, inventory_path, item_path=None):
     
     return ""
 
-def score_item(item, context):
+def query_weights(index, context):
+    """BM25 query for a lowercased context: its tokens plus fuzzy matches for unknown ones."""
+    return index.query_weights(tokenize(context), FUZZY_THRESHOLD or None, W_FUZZY)
+
+def score_candidates(index, context):
+    """
+    Scores registry items against context with BM25 over the inverted index,
+    then applies the name/id boosts and task heuristics to the candidates.
+    Returns unsorted [(score, doc)] for every item with a positive score.
+    """
     context = context.lower()
-    score = 0
-    
-    # Weights
-    W_NAME = 10
-    W_DESC = 5
-    W_ID = 3
-    
-    # Exact name match
-    if item['name'].lower() in context:
-        score += W_NAME
-        
-    # Description keywords
-    desc_words = re.findall(r'\w+', item['description'].lower())
-    for word in desc_words:
-        if len(word) > 3 and word in context:
-            score += W_DESC / len(desc_words)
-            
-    # ID match
-    if item['id'].lower() in context:
-        score += W_ID
-        
-    # Heuristic: if context contains "debug", "bug", or "fix" and id contains relevant terms
-    if any(k in context for k in ["debug", "bug", "fix"]) and \
-       any(k in item['id'].lower() for k in ["debug", "fix"]):
-        score += 5
+    bm25 = index.bm25(query_weights(index, context))
 
-    if "map" in context and "mapper" in item['id'].lower():
-        score += 5
-        
-    return score
+    # Every name/id occurring in the context, in a single pass
+    name_id_hits = index.name_id_hits(context)
 
-def log_context_selection(context, selected_items, prompt_fragment):
+    # Heuristic targets by document, so candidates never need their item dicts
+    debug_docs = set(index.docs_with_id_containing(*DEBUG_ID_TERMS)) if any(k in context for k in DEBUG_TRIGGERS) else ()
+    mapper_docs = set(index.docs_with_id_containing("mapper")) if "map" in context else ()
+
+    candidates = set(bm25)
+    candidates.update(name_id_hits)
+    candidates.update(debug_docs)
+    candidates.update(mapper_docs)
+
+    scored = []
+    for doc in candidates:
+        score = bm25.get(doc, 0.0)
+        name_hit, id_hit = name_id_hits.get(doc, (False, False))
+
+        # Exact name match
+        if name_hit:
+            score += W_NAME
+
+        # ID match
+        if id_hit:
+            score += W_ID
+
+        # Heuristic: if context contains "debug", "bug", or "fix" and id contains relevant terms
+        if doc in debug_docs:
+            score += W_HEURISTIC
+
+        if doc in mapper_docs:
+            score += W_HEURISTIC
+
+        if score > 0:
+            scored.append((score, doc))
+    return scored
+
+def score_batch(index, contexts, k, matrix=None):
     """
-    Safely logs the context selection event to a JSONL file using fcntl locking.
+    rank(index, score_candidates(index, c))[:k] for each context. With a
+    ScoreMatrix, BM25 for all contexts is one sparse product, the name/id and
+    heuristic boosts are added to the score rows, and top-k is taken with
+    NumPy partitioning (ties keep registry order, as in rank()). Without one,
+    each context is scored on its own.
     """
-    log_file = ".gsd/logs/audit.jsonl"
-    
-    # Ensure directory exists
-    log_dir = os.path.dirname(log_file)
-    if log_dir and not os.path.exists(log_dir):
-        os.makedirs(log_dir, exist_ok=True)
-        
+    if matrix is None:
+        return [rank(index, score_candidates(index, context), k) for context in contexts]
+
+    import numpy as np
+    debug_docs = np.array(index.docs_with_id_containing(*DEBUG_ID_TERMS), dtype=np.int64)
+    mapper_docs = np.array(index.docs_with_id_containing("mapper"), dtype=np.int64)
+
+    ranked = []
+    step = matrix.chunk_size()
+    for start in range(0, len(contexts), step):
+        # 1. BM25 for the whole chunk in one product
+        lowered = [context.lower() for context in contexts[start:start + step]]
+        scores = matrix.scores([query_weights(index, context) for context in lowered])
+
+        for context, row in zip(lowered, scores):
+            # 2. Boosts, as in score_candidates()
+            for doc, (name_hit, id_hit) in index.name_id_hits(context).items():
+                row[doc] += (W_NAME if name_hit else 0) + (W_ID if id_hit else 0)
+            if any(t in context for t in DEBUG_TRIGGERS):
+                row[debug_docs] += W_HEURISTIC
+            if "map" in context:
+                row[mapper_docs] += W_HEURISTIC
+
+            # 3. Top-k; everything tied with the k-th best is kept so the tie-break is exact
+            docs = np.flatnonzero(row > 0)
+            if len(docs) > k:
+                kth = np.partition(row[docs], len(docs) - k)[len(docs) - k]
+                docs = docs[row[docs] >= kth]
+            docs = docs[np.lexsort((docs, -row[docs]))][:k]
+            ranked.append([(float(row[doc]), index.items[doc]) for doc in docs])
+    return ranked
+
+def rank(index, scored, limit=None):
+    """
+    Sorts score_candidates() output best first; ties keep registry order, as
+    the old linear scan did. Only the first `limit` are mapped to their items.
+    """
+    scored.sort(key=lambda x: (-x[0], x[1]))
+    return [(score, index.items[doc]) for score, doc in scored[:limit]]
+
+def score_items(index, context):
+    """Returns [(score, item)] sorted best first."""
+    return rank(index, score_candidates(index, context))
+
+def rank_sections(item, context_tokens, limit=SECTIONS_PER_ITEM):
+    """
+    The item's `limit` sections that share the most terms with the context
+    (heading terms count double), returned in file order. Sections that share
+    nothing only make the cut when no section matches, so that a skill chosen
+    on its name or description alone still contributes its opening section.
+    """
+    scored = []
+    for position, section in enumerate(item.get('sections') or ()):
+        score = len(context_tokens & section['tokens']) + W_SECTION_HEADING * len(context_tokens & section['heading_tokens'])
+        scored.append((score, position, section))
+    scored.sort(key=lambda x: (-x[0], x[1]))
+    best = [entry for entry in scored[:limit] if entry[0] > 0] or scored[:1]
+    return [section for _, _, section in sorted(best, key=lambda x: x[1])]
+
+def estimate_tokens(chars):
+    """Offline token estimate: ~4 characters per token, rounded up."""
+    return -(-chars // CHARS_PER_TOKEN)
+
+def pack_budget(candidates, budget_tokens):
+    """
+    0/1 knapsack over ranked [(score, item, tokens)]: the subset with the
+    highest total score whose estimated size fits in `budget_tokens`.
+    Sizes are rounded up to 1/KNAPSACK_RESOLUTION of the budget, which bounds
+    the table and can never let the chosen set overshoot. On equal totals
+    the higher-ranked items win. Returns (chosen, skipped), both in rank order.
+    """
+    unit = max(1, -(-budget_tokens // KNAPSACK_RESOLUTION))
+    capacity = max(0, budget_tokens) // unit
+    weights = [-(-tokens // unit) for _, _, tokens in candidates]
+
+    best = [0.0] * (capacity + 1)
+    taken = []
+    for (score, _, _), weight in zip(candidates, weights):
+        row = bytearray(capacity + 1)
+        for c in range(capacity, weight - 1, -1):
+            value = best[c - weight] + score
+            if value > best[c]:
+                best[c] = value
+                row[c] = 1
+        taken.append(row)
+
+    chosen_idx = set()
+    c = capacity
+    for i in range(len(candidates) - 1, -1, -1):
+        if taken[i][c]:
+            chosen_idx.add(i)
+            c -= weights[i]
+    chosen = [cand for i, cand in enumerate(candidates) if i in chosen_idx]
+    skipped = [cand for i, cand in enumerate(candidates) if i not in chosen_idx]
+    return chosen, skipped
+
+class PhaseTimer:
+    """Monotonic milliseconds spent in each selection phase, in call order."""
+    def __init__(self):
+        self.phases = {}
+        self._last = time.perf_counter()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases[phase] = round((now - self._last) * 1000, 3)
+        self._last = now
+
+def audit_event(context, selected_items, prompt_fragment):
+    durable = get_audit_logger().durability != "async"
     event = {
         "timestamp": time.time(),
         "pid": os.getpid(),
         "context": context,
         "selected_ids": [item['id'] for score, item in selected_items],
         "fragment_length": len("\n\n".join(prompt_fragment)) if prompt_fragment else 0,
-        # Log the first 100 chars for quick debugging, but full content is available if needed
-        # We store full fragment for fidelity checks vs source
-        "full_fragment": prompt_fragment
     }
-    
     try:
-        with open(log_file, 'a', encoding='utf-8') as f:
-            # Acquire exclusive lock
-            fcntl.flock(f, fcntl.LOCK_EX)
-            
-            # Write JSON line
-            f.write(json.dumps(event) + "\n")
-            
-            # Flush to disk
-            f.flush()
-            os.fsync(f.fileno())
-            
-            # Release lock
-            fcntl.flock(f, fcntl.LOCK_UN)
+        # Fragments live once in the blob store; the event keeps sha256 + length
+        # so fidelity checks can resolve them (gsd_audit.resolve_fragments)
+        event["fragments"] = [store_blob(fragment, durable=durable) for fragment in prompt_fragment]
+    except OSError:
+        # Auditing never breaks selection: keep the fragments inline (old format) instead
+        event["full_fragment"] = list(prompt_fragment)
+    return event
+
+_audit_logger = None
+
+def get_audit_logger():
+    global _audit_logger
+    if _audit_logger is None:
+        _audit_logger = AuditLogger(AUDIT_LOG)
+    return _audit_logger
+
+def set_audit_durability(durability):
+    global _audit_logger
+    if _audit_logger is not None:
+        _audit_logger.close()
+    _audit_logger = AuditLogger(AUDIT_LOG, durability=durability)
+
+def append_audit_events(events):
+    """
+    Appends events to the JSONL audit log; locking, grouping and fsync
+    follow the logger's durability mode (see gsd_audit.py).
+    """
+    get_audit_logger().log_many(events)
+
+def log_context_selection(context, selected_items, prompt_fragment):
+    """
+    Safely logs the context selection event to a JSONL file using fcntl locking.
+    """
+    append_audit_events([audit_event(context, selected_items, prompt_fragment)])
+
+
+class Selector:
+    """
+    Holds the parsed registries and the skill bodies read from disk.
+    The CLI uses a fresh instance per run; `--serve` keeps one alive and
+    calls refresh() before every request so inventory edits are picked up.
+    """
+    def __init__(self, skills_path=SKILLS_INVENTORY, mcps_path=MCPS_INVENTORY):
+        self.skills_path = skills_path
+        self.mcps_path = mcps_path
+        self.registry = ([], [], RegistryIndex([]))
+        self._stamp = None
+        self._bodies = {}
+        self._matrix = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Reloads both inventories if either one changed since the last load."""
+        stamp = inventory_stamp((self.skills_path, self.mcps_path))
+        if stamp == self._stamp:
+            return False
+        with self._lock:
+            if stamp == self._stamp:
+                return False
+            # Attached from the shared snapshot when one is published (see gsd_snapshot)
+            registry = load_shared_registry(self.skills_path, self.mcps_path, stamp)
+            # Swap in one assignment so concurrent requests never see a mix
+            self.registry = registry
+            self._bodies = {}
+            self._matrix = None
+            self._stamp = stamp
+        return True
+
+    def matrix(self):
+        """ScoreMatrix of the current registry, built on first use; None without NumPy."""
+        if self._matrix is None and HAVE_NUMPY:
+            self._matrix = ScoreMatrix(self.registry[2])
+        return self._matrix
+
+    def extract(self, item):
+        """get_full_extraction() with an in-memory cache keyed on the source mtime."""
+        # The shared snapshot already holds the file; no private copy needed
+        text = self.registry[2].source_text(item)
+        if text is not None:
+            return text
+
+        item_path = item.get('path')
+        try:
+            mtime = os.stat(item_path).st_mtime_ns if item_path else None
+        except OSError:
+            mtime = None
+
+        key = (item['inventory'], item['id'], item_path)
+        cached = self._bodies.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        text = get_full_extraction(item['id'], item['inventory'], item_path, item.get('span'))
+        self._bodies[key] = (mtime, text)
+        return text
+
+    def plan_sections(self, item, context_tokens):
+        """
+        The sections to inject for `item`, or None when section extraction does
+        not apply: legacy inventory items, files without `##` headings, or a
+        file edited since the registry recorded its section offsets.
+        """
+        if not item.get('sections'):
+            return None
+        try:
+            st = os.stat(item['path'])
+        except OSError:
+            return None
+        if (st.st_mtime_ns, st.st_size) != item.get('source_stamp'):
+            return None
+        return rank_sections(item, context_tokens)
+
+    def extract_sections(self, item, sections):
+        """Reads only the byte ranges of `sections` from the skill file."""
+        parts = [f"# {item['name']}"]
+        with open(item['path'], 'rb') as f:
+            for section in sections:
+                f.seek(section['offset'])
+                parts.append(f.read(section['length']).decode('utf-8', 'replace'))
+        return "\n\n".join(parts)
+
+    def estimate_tokens(self, item, sections=None):
+        """Token estimate from the source file's size (or the planned sections'); only legacy inventory items are read."""
+        if sections is not None:
+            return estimate_tokens(len(item['name']) + 4 + sum(s['length'] + 2 for s in sections))
+        item_path = item.get('path')
+        try:
+            size = os.path.getsize(item_path) if item_path and os.path.isfile(item_path) else None
+        except OSError:
+            size = None
+        if size is None:
+            size = len(self.extract(item))
+        return estimate_tokens(size)
+
+    def select(self, context, timer=None, budget_tokens=None, sections=False):
+        """
+        Returns (output, top_items, prompt_fragment) for a single context.
+        Without a budget the top three items are injected; with `budget_tokens`
+        the best-scoring set that fits is packed (see pack_budget) and the
+        output gains a "budget" report of chosen and skipped items.
+        With `sections`, each item contributes only its most relevant `##`
+        sections (see rank_sections) instead of the whole file.
+        """
+        timer = timer or PhaseTimer()
+        index = self.registry[2]
+
+        # 2. Score Items
+        scored = score_candidates(index, context)
+        timer.mark("score")
+
+        limit = BUDGET_CANDIDATES if budget_tokens is not None else 3
+        return self.render(context, rank(index, scored, limit), timer, budget_tokens, sections)
+
+    def render(self, context, ranked, timer, budget_tokens=None, sections=False):
+        """select() from an already ranked [(score, item)] list (at least its top candidates)."""
+        context_tokens = frozenset(tokenize(context)) if sections else None
+        plans = {}
+
+        def plan(item):
+            if not sections:
+                return None
+            key = (item['inventory'], item['id'])
+            if key not in plans:
+                plans[key] = self.plan_sections(item, context_tokens)
+            return plans[key]
+
+        # 3. Sort and Filter
+        budget = None
+        if budget_tokens is None:
+            top_items = ranked[:3]
+        else:
+            candidates = [(score, item, self.estimate_tokens(item, plan(item))) for score, item in ranked[:BUDGET_CANDIDATES]]
+            chosen, skipped = pack_budget(candidates, budget_tokens)
+            top_items = [(score, item) for score, item, _ in chosen]
+            budget = {
+                "budget_tokens": budget_tokens,
+                "used_tokens": sum(tokens for _, _, tokens in chosen),
+                "chosen": [{"id": item['id'], "score": round(score, 2), "tokens": tokens} for score, item, tokens in chosen],
+                "skipped": [{"id": item['id'], "score": round(score, 2), "tokens": tokens} for score, item, tokens in skipped],
+            }
+        timer.mark("sort")
+
+        # 4. Prepare Output
+        results = []
+        prompt_fragment = []
+
+        for score, item in top_items:
+            result = {
+                "id": item['id'],
+                "name": item['name'],
+                "score": round(score, 2),
+                "confidence": item['confidence'],
+                "path": item.get('path') or None,
+            }
+            item_sections = plan(item)
+            if item_sections is not None:
+                full_text = self.extract_sections(item, item_sections)
+                result["sections"] = [section['heading'] for section in item_sections]
+            else:
+                # Get full extraction for prompt injection
+                full_text = self.extract(item)
+            results.append(result)
+
+            if full_text:
+                prompt_fragment.append(full_text)
+        timer.mark("extract")
+
+        output = {
+            "results": results,
+            "prompt_injection": "\n\n".join(prompt_fragment) if prompt_fragment else "No relevant skills found."
+        }
+        if budget is not None:
+            output["budget"] = budget
+        return output, top_items, prompt_fragment
+
+class SqliteSelector(Selector):
+    """
+    Selector that ranks against the FTS5 registry database (see
+    gsd_registry_db) instead of the in-memory index, so no registry is
+    loaded per process. Scores come from SQLite's bm25() and can
+    differ from the index backend's; fuzzy matching is not applied.
+    Rendering, packing and extraction are shared with Selector.
+    """
+    def __init__(self, skills_path=SKILLS_INVENTORY, mcps_path=MCPS_INVENTORY, db_path=REGISTRY_DB):
+        super().__init__(skills_path, mcps_path)
+        self.db_path = db_path
+        self._conn = None
+        self._lookup = None
+
+    def refresh(self):
+        """Reopens the database, rebuilding it if stale, when either inventory changed."""
+        stamp = inventory_stamp((self.skills_path, self.mcps_path))
+        if stamp == self._stamp:
+            return False
+        with self._lock:
+            if stamp == self._stamp:
+                return False
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = open_registry_db(self.skills_path, self.mcps_path, stamp, self.db_path)
+            self._lookup = ItemLookup(self._conn)
+            self._bodies = {}
+            self._stamp = stamp
+        return True
+
+    def matrix(self):
+        return None
+
+    def plan_sections(self, item, context_tokens):
+        if 'sections' not in item:
+            item['sections'] = item_sections(self._conn, item['rowid'])
+        return super().plan_sections(item, context_tokens)
+
+    def select(self, context, timer=None, budget_tokens=None, sections=False):
+        timer = timer or PhaseTimer()
+        ranked = rank_items(self._conn, context, BUDGET_CANDIDATES if budget_tokens is not None else 3, {
+            "w_name": W_NAME,
+            "w_id": W_ID,
+            "w_heuristic": W_HEURISTIC,
+            "debug_triggers": DEBUG_TRIGGERS,
+            "debug_id_terms": DEBUG_ID_TERMS,
+        }, self._lookup)
+        timer.mark("score")
+        return self.render(context, ranked, timer, budget_tokens, sections)
+
+def make_selector(backend="index"):
+    return SqliteSelector() if backend == "sqlite" else Selector()
+
+def select_with_event(selector, context, budget_tokens=None, sections=False):
+    """run_selection() without the log write; returns (output, audit event)."""
+    timer = PhaseTimer()
+
+    # 1. Load Registry (no-op when nothing changed since the last call)
+    selector.refresh()
+    timer.mark("load")
+
+    output, top_items, prompt_fragment = selector.select(context, timer, budget_tokens, sections)
+    event = audit_event(context, top_items, prompt_fragment)
+    event["timings_ms"] = dict(timer.phases)
+    return output, event
+
+def run_selection(selector, context, timings=False, budget_tokens=None, sections=False):
+    output, event = select_with_event(selector, context, budget_tokens, sections)
+
+    # 5. Log Execution
+    log_start = time.perf_counter()
+    append_audit_events([event])
+    if timings:
+        # The event is already written, so only the output can carry the log phase
+        output["timings_ms"] = dict(event["timings_ms"], log=round((time.perf_counter() - log_start) * 1000, 3))
+    return output
+
+# --- Batch Mode ---
+
+def vectorized_selections(selector, contexts, budget_tokens=None, sections=False):
+    """
+    select_with_event() for every context, but scored a chunk at a time with
+    score_batch() against the selector's ScoreMatrix. Load and score times
+    are shared by the chunk, so each event reports its amortized share.
+    """
+    k = BUDGET_CANDIDATES if budget_tokens is not None else 3
+    start = 0
+    while start < len(contexts):
+        timer = PhaseTimer()
+        selector.refresh()
+        matrix = selector.matrix()
+        chunk = contexts[start:start + (matrix.chunk_size() if matrix is not None else 1)]
+        timer.mark("load")
+        ranked = score_batch(selector.registry[2], chunk, k, matrix)
+        timer.mark("score")
+        shared = {phase: round(ms / len(chunk), 3) for phase, ms in timer.phases.items()}
+
+        for context, candidates in zip(chunk, ranked):
+            timer = PhaseTimer()
+            try:
+                output, top_items, prompt_fragment = selector.render(context, candidates, timer, budget_tokens, sections)
+            except Exception as e:
+                yield {"error": f"Selection failed: {e}"}, None
+                continue
+            event = audit_event(context, top_items, prompt_fragment)
+            event["timings_ms"] = dict(shared, **timer.phases)
+            yield output, event
+        start += len(chunk)
+
+def parse_batch_line(line, line_no):
+    """
+    A batch line is either a JSONL object {"id": ..., "context": ...} or plain text.
+    Plain-text lines are identified by their 1-based line number.
+    Returns (id, context, None), or (id, None, message) for an object without
+    a string context; raises ValueError for a line that is not JSON.
+    """
+    text = line.strip()
+    if not text.startswith("{"):
+        return line_no, text, None
+    request = json.loads(text)
+    if not isinstance(request, dict):
+        return line_no, None, "Invalid batch line: expected a JSON object"
+    request_id = request.get("id", line_no)
+    context = request.get("context")
+    if not isinstance(context, str):
+        found = "missing" if "context" not in request else type(context).__name__
+        return request_id, None, f"Invalid batch line: context must be a string, got {found}"
+    return request_id, context, None
+
+def _select_or_error(selector, job):
+    """select_with_event(), with a failure reported as ({"error": ...}, None) instead of raised."""
+    try:
+        return select_with_event(selector, *job)
     except Exception as e:
-        # Fail silent on logging errors to not break the tool
-        # In a production system we might print to stderr
+        return {"error": f"Selection failed: {e}"}, None
+
+_worker_selector = None
+
+def _init_batch_worker(backend="index"):
+    global _worker_selector
+    _worker_selector = make_selector(backend)
+
+def _batch_worker(job):
+    return _select_or_error(_worker_selector, job)
+
+def _batch_windows(lines, size):
+    """Groups parsed lines into lists of at most `size` (id, context, error) requests, as they arrive."""
+    window = []
+    for line_no, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            window.append(parse_batch_line(line, line_no))
+        except ValueError as e:
+            window.append((line_no, None, f"Invalid batch line: {e}"))
+        if len(window) >= size:
+            yield window
+            window = []
+    if window:
+        yield window
+
+def run_batch(lines, out, workers=1, timings=False, budget_tokens=None, sections=False, vectorized=False, backend="index"):
+    """
+    Scores every context in `lines`, writing one compact JSON result per line to `out`.
+    The registry is loaded once (per worker) and audit events are flushed in bulk.
+    With `vectorized`, contexts are scored together in-process (see vectorized_selections)
+    and `workers` is ignored; the sqlite backend scores each context in SQL instead.
+    Results stream: serial runs answer each line as it is read, pooled and
+    vectorized runs a window of BATCH_WINDOW lines at a time. A bad line or
+    a failed selection yields an {"error": ...} row; the batch carries on.
+    """
+    vectorized = vectorized and backend == "index"
+    executor = None
+    if vectorized or workers <= 1:
+        selector = Selector() if vectorized else make_selector(backend)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker, initargs=(backend,))
+
+    def emit(request_id, output):
+        out.write(json.dumps(dict({"id": request_id}, **output)) + "\n")
+
+    count = 0
+    pending_events = []
+    try:
+        window_size = BATCH_WINDOW if vectorized or executor is not None else 1
+        for window in _batch_windows(lines, window_size):
+            jobs = [(context, budget_tokens, sections) for _, context, _ in window if context is not None]
+            if vectorized:
+                selections = vectorized_selections(selector, [job[0] for job in jobs], budget_tokens, sections)
+            elif executor is not None:
+                selections = executor.map(_batch_worker, jobs, chunksize=max(1, len(jobs) // (workers * 4)))
+            else:
+                selections = (_select_or_error(selector, job) for job in jobs)
+
+            for request_id, context, error in window:
+                if context is None:
+                    emit(request_id, {"error": error})
+                    continue
+                output, event = next(selections)
+                count += 1
+                if event is None:
+                    emit(request_id, output)
+                    continue
+                if timings:
+                    output["timings_ms"] = event["timings_ms"]
+                emit(request_id, output)
+                pending_events.append(event)
+                if len(pending_events) >= BATCH_LOG_SIZE:
+                    append_audit_events(pending_events)
+                    pending_events = []
+            out.flush()
+    finally:
+        append_audit_events(pending_events)
+        if executor is not None:
+            executor.shutdown()
+    return count
+
+# --- Resident Daemon ---
+
+class _SelectionHandler(socketserver.StreamRequestHandler):
+    """One JSON request per line in, one JSON response per line out."""
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if request.get("ping"):
+                    response = {"pong": os.getpid()}
+                else:
+                    response = run_selection(self.server.selector, request["context"], request.get("timings", False),
+                                             request.get("budget_tokens"), request.get("sections", False))
+            except Exception as e:
+                response = {"error": f"{type(e).__name__}: {e}"}
+            self.wfile.write((json.dumps(response) + "\n").encode('utf-8'))
+            self.wfile.flush()
+
+class SelectionServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, selector):
+        self.selector = selector
+        super().__init__(socket_path, _SelectionHandler)
+
+def _request_daemon(request, socket_path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CLIENT_TIMEOUT)
+        sock.connect(socket_path)
+        sock.sendall((json.dumps(request) + "\n").encode('utf-8'))
+        with sock.makefile('rb') as f:
+            return json.loads(f.readline())
+
+def query_daemon(context, socket_path=SOCKET_PATH, timings=False, budget_tokens=None, sections=False):
+    """
+    Asks a running `--serve` daemon for a selection.
+    Returns None when no daemon answers so the caller can run in-process.
+    """
+    if not os.path.exists(socket_path):
+        return None
+    try:
+        request = {"context": context, "timings": timings, "budget_tokens": budget_tokens, "sections": sections}
+        response = _request_daemon(request, socket_path)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(response, dict) or "error" in response:
+        return None
+    if budget_tokens is not None and "budget" not in response:
+        # A daemon started before --budget-tokens existed; select in-process
+        return None
+    return response
+
+def serve(socket_path=SOCKET_PATH):
+    if os.path.exists(socket_path):
+        try:
+            pid = _request_daemon({"ping": True}, socket_path).get("pong")
+            print(f"gsd_select daemon already running (pid {pid}) on {socket_path}", file=sys.stderr)
+            return 1
+        except (OSError, ValueError):
+            # Stale socket left behind by a daemon that did not shut down cleanly
+            os.unlink(socket_path)
+
+    socket_dir = os.path.dirname(socket_path)
+    if socket_dir:
+        os.makedirs(socket_dir, exist_ok=True)
+
+    selector = Selector()
+    selector.refresh()
+    skills, mcps, _ = selector.registry
+
+    server = SelectionServer(socket_path, selector)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"gsd_select daemon listening on {socket_path} ({len(skills)} skills, {len(mcps)} MCPs)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
         pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+    return 0
+
+
+# --- Library API ---
 
+# One selector per backend, kept for the life of the process
+_shared_selectors = {}
+
+def select(context, use_daemon=True, socket_path=SOCKET_PATH, timings=False, budget_tokens=None, sections=False,
+           backend="index"):
+    """
+    In-process equivalent of `gsd_select.py <context>`: returns the dict the
+    CLI prints as JSON. A running daemon is used when available; otherwise
+    one Selector is kept per process (and backend) so repeated calls reuse
+    the registry. The daemon serves the index backend only.
+    """
+    if not context:
+        return {"error": "No context provided", "usage": "gsd_select.py <context>"}
+    use_daemon = use_daemon and backend == "index"
+    output = query_daemon(context, socket_path, timings, budget_tokens, sections) if use_daemon else None
+    if output is None:
+        if backend not in _shared_selectors:
+            _shared_selectors[backend] = make_selector(backend)
+        output = run_selection(_shared_selectors[backend], context, timings, budget_tokens, sections)
+    return output
 
 def main():
-    if len(sys.argv) < 2:
+    parser = argparse.ArgumentParser(description="Select the skills and MCP servers relevant to a context.", allow_abbrev=False)
+    # Everything from the first context word on is context; without abbreviations `--b` there is never
+    # mistaken for --budget-tokens
+    parser.add_argument("context", nargs=argparse.REMAINDER, help="Free-text context (task objective, error, phase name), after any options; start it with `--` if it begins with `-`")
+    parser.add_argument("--serve", action="store_true", help="Run as a resident daemon answering selections over a Unix socket")
+    parser.add_argument("--socket", default=SOCKET_PATH, help=f"Daemon socket path (default: {SOCKET_PATH})")
+    parser.add_argument("--no-daemon", action="store_true", help="Always select in-process, even if a daemon is running")
+    parser.add_argument("--batch", action="store_true", help="Read one context (or JSONL {id, context}) per stdin line; write one JSON result per line")
+    parser.add_argument("--workers", type=int, default=1, help="Process-pool size for --batch (default: 1)")
+    parser.add_argument("--backend", choices=BACKENDS, default="index", help="Ranking backend: the in-memory index (default) or the SQLite FTS5 registry gsd_sync writes (always in-process)")
+    parser.add_argument("--vectorized", action="store_true", help="With --batch, score all contexts as one sparse matrix product (uses NumPy if installed; otherwise scores each context in turn)")
+    parser.add_argument("--durability", choices=DURABILITY_MODES, help="Audit log durability: strict (fsync per event), batched (group commit) or async (no fsync). Default: $GSD_AUDIT_DURABILITY or strict")
+    parser.add_argument("--timings", action="store_true", help="Include per-phase latency (load/score/sort/extract/log) in the JSON output")
+    parser.add_argument("--budget-tokens", type=int, metavar="N", help="Pack the best-scoring skills whose estimated size fits in N tokens instead of the top 3; reports chosen and skipped items")
+    parser.add_argument("--sections", action="store_true", help="Inject only the most relevant `##` sections of each selected skill, read by byte range")
+    parser.add_argument("--profile", action="store_true", help="Write cProfile stats for this run (in-process) to --profile-out")
+    parser.add_argument("--profile-out", default=PROFILE_PATH, metavar="PATH", help=f"pstats output path for --profile (default: {PROFILE_PATH})")
+    args = parser.parse_args()
+    if args.context[:1] == ["--"]:
+        args.context = args.context[1:]
+
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        _run(args)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profile_dir = os.path.dirname(args.profile_out)
+            if profile_dir:
+                os.makedirs(profile_dir, exist_ok=True)
+            profiler.dump_stats(args.profile_out)
+            print(f"Profile written to {args.profile_out} (python3 -m pstats {args.profile_out})", file=sys.stderr)
+
+def _run(args):
+    if args.durability:
+        set_audit_durability(args.durability)
+
+    if args.serve:
+        sys.exit(serve(args.socket))
+
+    if args.batch:
+        run_batch(sys.stdin, sys.stdout, workers=args.workers, timings=args.timings, budget_tokens=args.budget_tokens,
+                  sections=args.sections, vectorized=args.vectorized, backend=args.backend)
+        return
+
+    context = " ".join(args.context)
+    if not context:
         print(json.dumps({"error": "No context provided", "usage": "gsd_select.py <context>"}, indent=2))
         sys.exit(1)
-        
-    context = " ".join(sys.argv[1:])
-    
-    # 1. Load Registry
-    skills = extract_registry(SKILLS_INVENTORY)
-    mcps = extract_registry(MCPS_INVENTORY)
-    
-    all_items = skills + mcps
-    
-    # 2. Score Items
-    scored_items = []
-    for item in all_items:
-        score = score_item(item, context)
-        if score > 0:
-            scored_items.append((score, item))
-            
-    # 3. Sort and Filter
-    scored_items.sort(key=lambda x: x[0], reverse=True)
-    top_items = scored_items[:3]
-    
-    # 4. Prepare Output
-    results = []
-    prompt_fragment = []
-    
-    for score, item in top_items:
-        # Get full extraction for prompt injection
-        inventory_path = SKILLS_INVENTORY if item in skills else MCPS_INVENTORY
-        full_text = get_full_extraction(item['id'], inventory_path, item.get('path'))
-        
-        results.append({
-            "id": item['id'],
-            "name": item['name'],
-            "score": round(score, 2),
-            "confidence": item['confidence']
-        })
-        
-        if full_text:
-            prompt_fragment.append(full_text)
-            
-    output = {
-        "results": results,
-        "prompt_injection": "\n\n".join(prompt_fragment) if prompt_fragment else "No relevant skills found."
-    }
 
-    # 5. Log Execution
-    log_context_selection(
-        context, 
-        [(score, item) for score, item in top_items], 
-        prompt_fragment
-    )
-    
-    print(json.dumps(output, indent=2))
+    # A profile of the socket round trip says nothing, so profiling runs in-process
+    use_daemon = not (args.no_daemon or args.profile)
+    print(json.dumps(select(context, use_daemon, args.socket, args.timings, args.budget_tokens, args.sections, args.backend), indent=2))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,542 @@
+#!/usr/bin/env python3
+import os
+import json
+import glob
+import mmap
+import stat
+import struct
+import time
+import hashlib
+from array import array
+from bisect import bisect_left, bisect_right
+
+from gsd_index import RegistryIndex
+from gsd_registry import CACHE_DIR, REGISTRY_FORMAT, item_from_record, item_record, load_registry
+
+# Immutable registry snapshots shared by every selector process of a project.
+# One file per registry version, published once (by gsd_sync or the first
+# process to miss it) and mmap'd read-only by the rest: the index arrays,
+# item records and skill bodies are read in place, so attaching costs a
+# header parse and memory stays flat as concurrency grows.
+
+# Snapshots are only published into and mapped from a 0700 directory of the
+# current user, and a file is only mapped if that user owns it and nobody
+# else can write it: /dev/shm is shared by every account on the host.
+
+# --- Configuration ---
+# First usable directory wins; /dev/shm keeps snapshots in RAM, the cache
+# directory covers systems without it (the page cache is shared either way).
+# Snapshots go in a per-user `gsd-<uid>` subdirectory of it
+SNAPSHOT_DIRS = ("/dev/shm", CACHE_DIR)
+SNAPSHOT_MAGIC = b"GSDSNAP1"
+# Bump whenever the section layout or item encoding changes
+SNAPSHOT_FORMAT = 1
+# A publisher's temp file older than this is assumed abandoned
+PUBLISH_STALE_SECONDS = 60
+
+def snapshot_dir():
+    """
+    $GSD_SNAPSHOT_DIR, else the current user's subdirectory of the first
+    existing, writable SNAPSHOT_DIRS entry (None if none is).
+    """
+    override = os.environ.get("GSD_SNAPSHOT_DIR")
+    if override:
+        return override
+    user = f"gsd-{os.getuid()}" if hasattr(os, "getuid") else "gsd"
+    for directory in SNAPSHOT_DIRS:
+        if os.path.isdir(directory) and os.access(directory, os.W_OK):
+            return os.path.join(directory, user)
+    return None
+
+def _untrusted(st, kind):
+    """Why a snapshot directory or file with this stat must not be used, or None."""
+    if not hasattr(os, "getuid"):
+        return None
+    if st.st_uid != os.getuid():
+        return f"{kind} is owned by uid {st.st_uid}"
+    if st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        return f"{kind} is writable by other users"
+    return None
+
+def private_dir(directory, create=False):
+    """
+    Checks (and with `create`, makes) a snapshot directory: a real directory
+    owned by the current user with no group/other access. Raises OSError otherwise.
+    """
+    if create:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    st = os.lstat(directory)
+    if not stat.S_ISDIR(st.st_mode):
+        raise NotADirectoryError(f"snapshot directory is not a directory: {directory}")
+    problem = _untrusted(st, "snapshot directory")
+    if problem is None and hasattr(os, "getuid") and st.st_mode & 0o077:
+        if not create:
+            problem = "snapshot directory is accessible to other users"
+        else:
+            # Ours but too open (e.g. made by an older version): tighten it; the
+            # per-file checks still reject anything another user dropped in
+            os.chmod(directory, 0o700)
+    if problem:
+        raise PermissionError(f"{problem}: {directory}")
+    return directory
+
+def open_snapshot_file(path):
+    """Read-only fd of a snapshot file the current user owns and nobody else can write; raises OSError."""
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+    try:
+        st = os.fstat(fd)
+        problem = "snapshot is not a regular file" if not stat.S_ISREG(st.st_mode) else _untrusted(st, "snapshot")
+        if problem:
+            raise PermissionError(f"{problem}: {path}")
+    except BaseException:
+        os.close(fd)
+        raise
+    return fd
+
+def project_key(root="."):
+    return hashlib.sha256(os.path.realpath(root).encode('utf-8')).hexdigest()[:16]
+
+def snapshot_path(sources, stamp, directory, root="."):
+    """Versioned path: the name changes with the inventories, so a published file never does."""
+    version = hashlib.sha256(json.dumps([SNAPSHOT_FORMAT, REGISTRY_FORMAT, list(sources), stamp]).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(directory, f"gsd-registry-{project_key(root)}-{version}.snap")
+
+def remove_snapshots(root=".", directory=None, keep=None):
+    """
+    Unlinks every published snapshot of the project at `root` except `keep`;
+    attached processes keep their mapping.
+    """
+    directory = directory or snapshot_dir()
+    if directory is None:
+        return
+    for path in glob.glob(os.path.join(directory, f"gsd-registry-{project_key(root)}-*.snap")):
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+# --- Encoding ---
+
+def _string_table(strings):
+    """(blob, offsets) for a list of str or bytes; entry i is blob[offsets[i]:offsets[i + 1]]."""
+    offsets = array('Q', [0])
+    parts = []
+    for s in strings:
+        data = s.encode('utf-8') if isinstance(s, str) else s
+        parts.append(data)
+        offsets.append(offsets[-1] + len(data))
+    return b"".join(parts), offsets
+
+def _encode_item(item, body):
+    record = item_record({k: v for k, v in item.items() if k != 'tokens'})
+    record['sections'] = record.get('sections') or []
+    if body is not None:
+        record['_body'] = body
+    return json.dumps(record, separators=(',', ':'))
+
+def _decode_item(data):
+    return item_from_record(json.loads(data))
+
+def _source_bytes(item):
+    """The item's source file if it still matches the stamp recorded at compile time."""
+    path, stamp = item.get('path'), item.get('source_stamp')
+    if not path or stamp is None:
+        return None
+    try:
+        with open(path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            if (st.st_mtime_ns, st.st_size) != tuple(stamp):
+                return None
+            return f.read()
+    except OSError:
+        return None
+
+def encode_snapshot(compiled):
+    """The snapshot file contents for a compiled registry (see gsd_registry.compile_registry)."""
+    index = compiled["index"]
+    items = compiled["skills"] + compiled["mcps"]
+    sections = {}
+
+    # 1. Item records and the skill bodies they point at, one copy per file
+    bodies, body_of_path, records = [], {}, []
+    for item in items:
+        path = item.get('path')
+        if path not in body_of_path:
+            data = _source_bytes(item)
+            body_of_path[path] = len(bodies) if data is not None else None
+            if data is not None:
+                bodies.append(data)
+        records.append(_encode_item(item, body_of_path[path]))
+    sections["items"] = _string_table(records)
+    sections["ids"] = _string_table([item['id_lc'] for item in items])
+    sections["bodies"] = _string_table(bodies)
+
+    # 2. BM25 postings, by sorted vocabulary
+    vocab = sorted(index.postings)
+    term_id = {term: i for i, term in enumerate(vocab)}
+    ptr, docs, tfs = array('Q', [0]), array('I'), array('I')
+    for term in vocab:
+        for doc, tf in index.postings[term]:
+            docs.append(doc)
+            tfs.append(tf)
+        ptr.append(len(docs))
+    sections["vocab"] = _string_table(vocab)
+    sections["postings.ptr"], sections["postings.docs"], sections["postings.tfs"] = ptr, docs, tfs
+    sections["doc_norm"] = array('d', index.doc_norm)
+
+    # 3. Trigram index over the same vocabulary
+    term_grams = array('H', [0] * len(vocab))
+    for old_id, term in enumerate(index.terms):
+        term_grams[term_id[term]] = index.term_grams[old_id]
+    sections["term_grams"] = term_grams
+    grams = sorted(index.gram_postings)
+    gram_ptr, gram_terms = array('Q', [0]), array('I')
+    for gram in grams:
+        gram_terms.extend(sorted(term_id[index.terms[old_id]] for old_id in index.gram_postings[gram]))
+        gram_ptr.append(len(gram_terms))
+    sections["grams"] = _string_table(grams)
+    sections["grams.ptr"], sections["grams.terms"] = gram_ptr, gram_terms
+
+    # 4. Name/id automaton, with transitions as sorted (state << 21 | codepoint) keys
+    matcher = index.matcher
+    keys = sorted(matcher.goto)
+    sections["matcher.keys"] = array('Q', keys)
+    sections["matcher.next"] = array('I', (matcher.goto[k] for k in keys))
+    sections["matcher.fail"] = array('I', matcher.fail)
+    out_ptr, out = array('Q', [0]), array('Q')
+    for values in matcher.out:
+        out.extend(values)
+        out_ptr.append(len(out))
+    sections["matcher.out_ptr"], sections["matcher.out"] = out_ptr, out
+
+    # 5. Header (JSON section table), then 8-byte aligned sections
+    flat = []
+    for name, value in sections.items():
+        if isinstance(value, tuple):
+            flat.append((f"{name}.blob", 'B', value[0]))
+            flat.append((f"{name}.offsets", 'Q', value[1].tobytes()))
+        else:
+            flat.append((name, value.typecode, value.tobytes()))
+    table, offset = {}, 0
+    for name, typecode, data in flat:
+        table[name] = [offset, len(data), typecode]
+        offset += (len(data) + 7) & ~7
+    header = json.dumps({
+        "format": SNAPSHOT_FORMAT,
+        "sources": list(compiled["sources"]),
+        "stamp": compiled["stamp"],
+        "n_skills": len(compiled["skills"]),
+        "sections": table,
+    }).encode('utf-8')
+    header += b" " * (-(len(SNAPSHOT_MAGIC) + 8 + len(header)) % 8)
+
+    yield SNAPSHOT_MAGIC + struct.pack("<Q", len(header)) + header
+    for _, _, data in flat:
+        yield data
+        yield b"\0" * (-len(data) % 8)
+
+def publish_snapshot(compiled, directory=None):
+    """
+    Writes the snapshot for `compiled` under its versioned name and unlinks
+    older versions. Returns the path, or None if there is no usable directory
+    or another process is publishing the same version right now. Raises
+    OSError if the directory is not private to the current user.
+    """
+    directory = directory or snapshot_dir()
+    if directory is None:
+        return None
+    private_dir(directory, create=True)
+    path = snapshot_path(compiled["sources"], compiled["stamp"], directory)
+    try:
+        os.close(open_snapshot_file(path))
+        return path
+    except FileNotFoundError:
+        pass
+    except OSError:
+        # Never reuse a file that fails the ownership/mode checks; replace it
+        os.remove(path)
+
+    # O_EXCL temp file: concurrent first processes publish once, the rest carry on
+    tmp_path = f"{path}.tmp"
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        try:
+            if os.stat(tmp_path).st_mtime < time.time() - PUBLISH_STALE_SECONDS:
+                os.remove(tmp_path)
+        except OSError:
+            pass
+        return None
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in encode_snapshot(compiled):
+                f.write(chunk)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    remove_snapshots(directory=directory, keep=path)
+    return path
+
+# --- Attaching ---
+
+class _Strings:
+    """Read-only view of a string table; supports len(), indexing and bisect."""
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def raw(self, i):
+        return self.blob[self.offsets[i]:self.offsets[i + 1]]
+
+    def __getitem__(self, i):
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return str(self.raw(i), 'utf-8')
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def find(self, s):
+        """Position of `s` in a sorted table, or -1."""
+        i = bisect_left(self, s)
+        return i if i < len(self) and self[i] == s else -1
+
+class _Items:
+    """Item records decoded on access; slices of the registry order (skills, then MCP servers)."""
+    def __init__(self, records, start=0, stop=None):
+        self.records = records
+        self.start = start
+        self.stop = len(records) if stop is None else stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, doc):
+        if doc < 0:
+            doc += len(self)
+        if not 0 <= doc < len(self):
+            raise IndexError(doc)
+        return _decode_item(str(self.records.raw(self.start + doc), 'utf-8'))
+
+    def __iter__(self):
+        for doc in range(len(self)):
+            yield self[doc]
+
+class _Postings:
+    def __init__(self, docs, tfs):
+        self.docs = docs
+        self.tfs = tfs
+
+    def __len__(self):
+        return len(self.docs)
+
+    def __iter__(self):
+        return zip(self.docs, self.tfs)
+
+class _PostingsView:
+    """token -> postings over the CSR arrays, with the mapping methods RegistryIndex uses."""
+    def __init__(self, vocab, ptr, docs, tfs):
+        self.vocab, self.ptr, self.docs, self.tfs = vocab, ptr, docs, tfs
+
+    def _postings(self, i):
+        a, b = self.ptr[i], self.ptr[i + 1]
+        return _Postings(self.docs[a:b], self.tfs[a:b])
+
+    def get(self, token, default=None):
+        i = self.vocab.find(token)
+        return self._postings(i) if i >= 0 else default
+
+    def __contains__(self, token):
+        return self.vocab.find(token) >= 0
+
+    def __len__(self):
+        return len(self.vocab)
+
+    def __iter__(self):
+        return iter(self.vocab)
+
+    def items(self):
+        for i, token in enumerate(self.vocab):
+            yield token, self._postings(i)
+
+class _GramView:
+    def __init__(self, grams, ptr, terms):
+        self.grams, self.ptr, self.terms = grams, ptr, terms
+
+    def get(self, gram, default=None):
+        i = self.grams.find(gram)
+        return self.terms[self.ptr[i]:self.ptr[i + 1]] if i >= 0 else default
+
+class FlatPatternMatcher:
+    """gsd_index.PatternMatcher over the snapshot's arrays; transitions are found by bisection."""
+    def __init__(self, keys, nxt, fail, out_ptr, out):
+        self.keys, self.nxt, self.fail, self.out_ptr, self.out = keys, nxt, fail, out_ptr, out
+        # Root transitions are taken on almost every unmatched character, so keep them in a dict
+        root_end = bisect_left(keys, 1 << 21)
+        self.root = {keys[i]: nxt[i] for i in range(root_end)}
+
+    def search(self, text):
+        keys, nxt, fail, out_ptr, out, root = self.keys, self.nxt, self.fail, self.out_ptr, self.out, self.root
+        n = len(keys)
+        hits = set()
+        state = 0
+        for ch in text:
+            code = ord(ch)
+            while True:
+                if not state:
+                    state = root.get(code, 0)
+                    break
+                key = state << 21 | code
+                i = bisect_left(keys, key)
+                if i < n and keys[i] == key:
+                    state = nxt[i]
+                    break
+                state = fail[state]
+            if out_ptr[state + 1] != out_ptr[state]:
+                hits.update(out[out_ptr[state]:out_ptr[state + 1]])
+        return hits
+
+class SnapshotIndex(RegistryIndex):
+    """
+    RegistryIndex whose structures are views into a mapped snapshot, so
+    bm25(), fuzzy_terms(), query_weights() and name_id_hits() run unchanged.
+    """
+    def __init__(self, section, find, n_skills):
+        self.items = _Items(_Strings(section("items.blob"), section("items.offsets")))
+        self.n_skills = n_skills
+        self._ids = _Strings(section("ids.blob"), section("ids.offsets"))
+        self._find_id = find("ids.blob")
+        self._bodies = _Strings(section("bodies.blob"), section("bodies.offsets"))
+        vocab = _Strings(section("vocab.blob"), section("vocab.offsets"))
+        self.postings = _PostingsView(vocab, section("postings.ptr"), section("postings.docs"), section("postings.tfs"))
+        self.doc_norm = section("doc_norm")
+        self.terms = vocab
+        self.term_grams = section("term_grams")
+        self.gram_postings = _GramView(_Strings(section("grams.blob"), section("grams.offsets")),
+                                       section("grams.ptr"), section("grams.terms"))
+        self.matcher = FlatPatternMatcher(section("matcher.keys"), section("matcher.next"), section("matcher.fail"),
+                                          section("matcher.out_ptr"), section("matcher.out"))
+        self._id_filters = {}
+
+    def docs_with_id_containing(self, *terms):
+        """Documents whose id contains any of `terms`, found by scanning the id table in place."""
+        cached = self._id_filters.get(terms)
+        if cached is None:
+            offsets, find = self._ids.offsets, self._find_id
+            docs = set()
+            for term in terms:
+                needle = term.lower().encode('utf-8')
+                if not needle:
+                    docs.update(range(len(self._ids)))
+                    continue
+                pos = find(needle, 0)
+                while pos >= 0:
+                    doc = bisect_right(offsets, pos) - 1
+                    if pos + len(needle) <= offsets[doc + 1]:
+                        # Found in this id; resume at the next one
+                        docs.add(doc)
+                        pos = find(needle, offsets[doc + 1])
+                    else:
+                        pos = find(needle, pos + 1)
+            cached = sorted(docs)
+            self._id_filters[terms] = cached
+        return cached
+
+    def source_text(self, item):
+        """The snapshot's copy of the item's source file while the file is unchanged on disk."""
+        body = item.get('_body')
+        if body is None:
+            return None
+        try:
+            st = os.stat(item['path'])
+        except OSError:
+            return None
+        if (st.st_mtime_ns, st.st_size) != item.get('source_stamp'):
+            return None
+        try:
+            text = str(self._bodies.raw(body), 'utf-8')
+        except UnicodeDecodeError:
+            return None
+        # As a text-mode read would return it
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+
+class Snapshot:
+    """A mapped snapshot file; `index`, `skills` and `mcps` stay valid while it is referenced."""
+    def __init__(self, path):
+        with os.fdopen(open_snapshot_file(path), 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mm)
+        if bytes(view[:len(SNAPSHOT_MAGIC)]) != SNAPSHOT_MAGIC:
+            raise ValueError(f"not a registry snapshot: {path}")
+        header_len, = struct.unpack_from("<Q", view, len(SNAPSHOT_MAGIC))
+        base = len(SNAPSHOT_MAGIC) + 8
+        self.header = json.loads(bytes(view[base:base + header_len]))
+        base += header_len
+        if self.header.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"unsupported snapshot format: {path}")
+
+        def section(name):
+            offset, length, typecode = self.header["sections"][name]
+            return view[base + offset:base + offset + length].cast(typecode)
+
+        def find(name):
+            """bytes.find() within one section, without copying it out of the mapping."""
+            offset, length, _ = self.header["sections"][name]
+            start, end = base + offset, base + offset + length
+            def find_in(needle, pos):
+                found = self._mm.find(needle, start + pos, end)
+                return found - start if found >= 0 else -1
+            return find_in
+
+        n_skills = self.header["n_skills"]
+        self.index = SnapshotIndex(section, find, n_skills)
+        self.skills = _Items(self.index.items.records, 0, n_skills)
+        self.mcps = _Items(self.index.items.records, n_skills)
+
+def attach_snapshot(skills_path, mcps_path, stamp, directory=None):
+    """The published snapshot of exactly these inventory stamps, or None."""
+    directory = directory or snapshot_dir()
+    if directory is None or not any(stamp):
+        return None
+    try:
+        private_dir(directory)
+        snapshot = Snapshot(snapshot_path((skills_path, mcps_path), stamp, directory))
+    except (OSError, ValueError, KeyError):
+        return None
+    if snapshot.header["sources"] != [skills_path, mcps_path] or snapshot.header["stamp"] != json.loads(json.dumps(stamp)):
+        return None
+    return snapshot
+
+def load_shared_registry(skills_path, mcps_path, stamp=None, directory=None):
+    """
+    (skills, mcps, index) for the selector: attached from the shared snapshot
+    when one is published for these stamps. Otherwise the registry is loaded
+    as usual (see gsd_registry.load_registry), published for the processes
+    that come next and attached, falling back to the private copy if the
+    snapshot cannot be written.
+    """
+    snapshot = attach_snapshot(skills_path, mcps_path, stamp, directory)
+    if snapshot is None:
+        compiled = load_registry(skills_path, mcps_path, stamp)
+        if compiled["stamp"] != stamp:
+            return compiled["skills"], compiled["mcps"], compiled["index"]
+        try:
+            published = publish_snapshot(compiled, directory)
+        except OSError:
+            published = None
+        if published:
+            snapshot = attach_snapshot(skills_path, mcps_path, stamp, directory)
+        if snapshot is None:
+            return compiled["skills"], compiled["mcps"], compiled["index"]
+    return snapshot.skills, snapshot.mcps, snapshot.index
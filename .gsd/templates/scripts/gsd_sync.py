@@ -4,12 +4,28 @@ import re
 import json
 import datetime
 import sys
-import xml.etree.ElementTree as ET
+import time
+import argparse
+import hashlib
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from gsd_audit import compact_pending
+from gsd_registry import compile_registry, inventory_stamp, read_compiled_registry, source_cache, write_compiled_registry
+from gsd_registry_db import REGISTRY_DB, write_registry_db
+from gsd_snapshot import publish_snapshot, remove_snapshots
 
 # --- Configuration ---
 SKILLS_DIR = ".agent/skills"
+PERSONAS_DIR = ".agent/personas"
 SKILLS_INVENTORY = ".gsd/SKILLS.md"
 MCPS_INVENTORY = ".gsd/MCPS.md"
+# Per-SKILL.md (mtime, size, sha256) plus the parsed record, for incremental syncs
+MANIFEST_PATH = ".gsd/.cache/sync_manifest.json"
+MANIFEST_VERSION = 1
+# --watch polling: seconds between stat sweeps, and quiet time before a burst is applied
+WATCH_INTERVAL = 1.0
+WATCH_DEBOUNCE = 0.5
 
 # Standard macOS paths for MCP configs
 PATHS = {
@@ -27,85 +43,161 @@ PATHS = {
     ]
 }
 
-def scan_skills():
+def parse_skill(skill_name, skill_path, content):
+    """Extracts the inventory record for one SKILL.md from its text."""
+    # Metadata extraction
+    meta_match = re.search(r'^---\n(.*?)\n---', content, re.DOTALL)
+    name = skill_name
+    description = ""
+    if meta_match:
+        meta = meta_match.group(1)
+        name_line = re.search(r'^name:\s*(.*)', meta, re.MULTILINE)
+        desc_line = re.search(r'^description:\s*(.*)', meta, re.MULTILINE)
+        if name_line: name = name_line.group(1).strip()
+        if desc_line: description = desc_line.group(1).strip()
+    
+    # Extraction logic (Full extraction as requested)
+    usage = ""
+    constraints = ""
+    
+    # Extract sections
+    sections = re.split(r'\n##\s+', content)
+    for section in sections:
+        if section.lower().startswith("purpose"):
+            usage += "### Purpose\n" + section[len("purpose"):].strip() + "\n\n"
+        elif "activate" in section.lower() or "when to use" in section.lower():
+            title = "Activation" if "activate" in section.lower() else "When to Use"
+            # Find first line and content
+            lines = section.split('\n')
+            usage += f"### {title}\n" + "\n".join(lines[1:]).strip() + "\n\n"
+        elif "behavior rules" in section.lower() or "constraints" in section.lower():
+            lines = section.split('\n')
+            constraints += "\n".join(lines[1:]).strip() + "\n\n"
+
+    # Fallback description
+    if not description and usage:
+        first_para = re.search(r'^(.*?)\n\n', usage, re.DOTALL)
+        description = first_para.group(1).strip()[:150] if first_para else usage[:150]
+
+    # Confidence scoring
+    score = 0.0
+    has_meta = bool(meta_match)
+    has_details = len(usage) > 50 or len(constraints) > 50
+    if has_meta and has_details:
+        score = 1.0
+    elif has_meta or has_details:
+        score = 0.5
+    
+    return {
+        "id": skill_name,
+        "name": name,
+        "path": skill_path,
+        "description": description or "No description provided.",
+        "usage": usage.strip(),
+        "constraints": constraints.strip(),
+        "confidence": score
+    }
+
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {"version": MANIFEST_VERSION, "skills": {}}
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+
+def scan_skill(skill_name, entry=None):
+    """
+    Builds the record for one skill directory. A SKILL.md whose (mtime, size)
+    or content hash matches its manifest `entry` reuses the stored record
+    instead of being re-parsed.
+    Returns (skill, new manifest entry or None, "reused" | "reparsed" | None).
+    Pure with respect to its arguments, so it can run in a thread or process pool.
+    """
+    skill_dir = os.path.join(SKILLS_DIR, skill_name)
+    skill_path = os.path.join(skill_dir, "SKILL.md")
+    if not os.path.exists(skill_path):
+        # Directory exists but no SKILL.md
+        return {
+            "id": skill_name,
+            "name": skill_name,
+            "path": skill_dir,
+            "description": "[MISSING SKILL.MD]",
+            "usage": "",
+            "constraints": "",
+            "confidence": 0.0
+        }, None, None
+
+    st = os.stat(skill_path)
+    if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+        return entry["meta"], entry, "reused"
+
+    with open(skill_path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    if entry and entry["sha256"] == digest:
+        # Touched but not edited
+        skill, outcome = entry["meta"], "reused"
+    else:
+        # Same newline handling as a text-mode read
+        content = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        skill, outcome = parse_skill(skill_name, skill_path, content), "reparsed"
+
+    return skill, {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": digest, "meta": skill}, outcome
+
+def _scan_skill_job(job):
+    return scan_skill(*job)
+
+def scan_skills(manifest=None, stats=None, jobs=1, processes=False):
+    """
+    Scans .agent/skills/*. With jobs > 1 the skills are read on a thread pool
+    (or a process pool when `processes` is set, for parse-heavy trees);
+    results are merged in directory order, so the output matches a serial run.
+    """
     skills = []
     if not os.path.exists(SKILLS_DIR):
         print(f"Warning: {SKILLS_DIR} not found.")
+        if manifest is not None:
+            manifest["skills"] = {}
         return skills
-    
+
+    entries = manifest["skills"] if manifest is not None else {}
+    jobs_list = []
     for skill_name in sorted(os.listdir(SKILLS_DIR)):
-        skill_dir = os.path.join(SKILLS_DIR, skill_name)
-        if not os.path.isdir(skill_dir):
+        if not os.path.isdir(os.path.join(SKILLS_DIR, skill_name)):
             continue
-            
-        skill_path = os.path.join(skill_dir, "SKILL.md")
-        if os.path.exists(skill_path):
-            with open(skill_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Metadata extraction
-            meta_match = re.search(r'^---\n(.*?)\n---', content, re.DOTALL)
-            name = skill_name
-            description = ""
-            if meta_match:
-                meta = meta_match.group(1)
-                name_line = re.search(r'^name:\s*(.*)', meta, re.MULTILINE)
-                desc_line = re.search(r'^description:\s*(.*)', meta, re.MULTILINE)
-                if name_line: name = name_line.group(1).strip()
-                if desc_line: description = desc_line.group(1).strip()
-            
-            # Extraction logic (Full extraction as requested)
-            usage = ""
-            constraints = ""
-            
-            # Extract sections
-            sections = re.split(r'\n##\s+', content)
-            for section in sections:
-                if section.lower().startswith("purpose"):
-                    usage += "### Purpose\n" + section[len("purpose"):].strip() + "\n\n"
-                elif "activate" in section.lower() or "when to use" in section.lower():
-                    title = "Activation" if "activate" in section.lower() else "When to Use"
-                    # Find first line and content
-                    lines = section.split('\n')
-                    usage += f"### {title}\n" + "\n".join(lines[1:]).strip() + "\n\n"
-                elif "behavior rules" in section.lower() or "constraints" in section.lower():
-                    lines = section.split('\n')
-                    constraints += "\n".join(lines[1:]).strip() + "\n\n"
-
-            # Fallback description
-            if not description and usage:
-                first_para = re.search(r'^(.*?)\n\n', usage, re.DOTALL)
-                description = first_para.group(1).strip()[:150] if first_para else usage[:150]
-
-            # Confidence scoring
-            score = 0.0
-            has_meta = bool(meta_match)
-            has_details = len(usage) > 50 or len(constraints) > 50
-            if has_meta and has_details:
-                score = 1.0
-            elif has_meta or has_details:
-                score = 0.5
-            
-            skills.append({
-                "id": skill_name,
-                "name": name,
-                "path": skill_path,
-                "description": description or "No description provided.",
-                "usage": usage.strip(),
-                "constraints": constraints.strip(),
-                "confidence": score
-            })
-        else:
-            # Directory exists but no SKILL.md
-            skills.append({
-                "id": skill_name,
-                "name": skill_name,
-                "path": skill_dir,
-                "description": "[MISSING SKILL.MD]",
-                "usage": "",
-                "constraints": "",
-                "confidence": 0.0
-            })
+        jobs_list.append((skill_name, entries.get(os.path.join(SKILLS_DIR, skill_name, "SKILL.md"))))
+
+    if jobs > 1 and len(jobs_list) > 1:
+        pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        with pool(max_workers=jobs) as executor:
+            scanned = list(executor.map(_scan_skill_job, jobs_list, chunksize=max(1, len(jobs_list) // (jobs * 4))))
+    else:
+        scanned = [_scan_skill_job(job) for job in jobs_list]
+
+    for skill, entry, outcome in scanned:
+        skills.append(skill)
+        if manifest is not None and entry is not None:
+            entries[skill["path"]] = entry
+        if stats is not None and outcome:
+            stats[outcome] = stats.get(outcome, 0) + 1
+
+    if manifest is not None:
+        # Drop entries for SKILL.md files that no longer exist
+        live = {s["path"] for s in skills}
+        for path in [p for p in manifest["skills"] if p not in live]:
+            del manifest["skills"][path]
+            if stats is not None:
+                stats["dropped"] = stats.get("dropped", 0) + 1
             
     return skills
 
@@ -145,18 +237,28 @@ def scan_mcps():
     
     return mcp_servers
 
-def update_inventory(path, category, items):
-    if not os.path.exists(path):
-        print(f"Error: Inventory file {path} not found.")
+def _escape_text(text):
+    """Character-data escaping, as ElementTree serialises element text."""
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+def _escape_attr(text):
+    """Attribute escaping, as ElementTree serialises attribute values."""
+    return (_escape_text(text).replace('"', "&quot;")
+            .replace("\r", "&#13;").replace("\n", "&#10;").replace("\t", "&#09;"))
+
+def _xml_element(tag, text):
+    if not text:
+        return f"\n        <{tag} />"
+    return f"\n        <{tag}>{_escape_text(text)}</{tag}>"
+
+def render_human_blocks(items):
+    """Yields the human-readable markdown section, one item at a time."""
+    if not items:
+        yield "## [NO ITEMS DISCOVERED]\n_Run discovery again or check configuration paths._\n"
         return
-        
-    with open(path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # 1. Generate human section
-    human_blocks = []
-    for item in items:
-        block = f"## {item['name']}\n"
+    for i, item in enumerate(items):
+        block = "\n" if i else ""
+        block += f"## {item['name']}\n"
         block += f"- **ID**: `{item['id']}`\n"
         block += f"- **Confidence**: `{item['confidence']}`\n"
         if item.get('source'):
@@ -171,44 +273,88 @@ def update_inventory(path, category, items):
             block += f"\n### Behavior & Constraints\n{item['constraints']}\n"
             
         block += "\n---\n"
-        human_blocks.append(block)
-    
-    human_content = "\n".join(human_blocks)
-    if not items:
-        human_content = "## [NO ITEMS DISCOVERED]\n_Run discovery again or check configuration paths._\n"
-    
-    # 2. Generate XML block
-    root = ET.Element("gsd_registry", type=category)
-    root.append(ET.Comment(" MACHINE-READABLE REGISTRY "))
-    for item in items:
-        item_el = ET.SubElement(root, "item", id=item["id"], confidence=str(item["confidence"]))
-        ET.SubElement(item_el, "name").text = item["name"]
-        ET.SubElement(item_el, "path").text = item["path"]
-        ET.SubElement(item_el, "description").text = item["description"]
-    
-    # Pretty print XML
-    xml_registry = ET.tostring(root, encoding='utf-8').decode('utf-8')
-    # Simple indent for readability
-    xml_registry = xml_registry.replace('<item', '\n    <item').replace('</item>', '\n    </item>').replace('</gsd_registry>', '\n</gsd_registry>').replace('<name', '\n        <name').replace('<path', '\n        <path').replace('<description', '\n        <description')
-    
-    # 3. Perform Reflective Swap
-    # Replace content between first --- and <gsd_registry> tag
-    # or just replace everything after the header.
+        yield block
+
+def render_xml_registry(category, items, spans=None):
+    """
+    Yields the <gsd_registry> block, one item at a time, indented for readability.
+    `spans` holds each item's (offset, length) in the file, recorded as attributes
+    so the legacy extraction path can slice the human section directly.
+    """
+    yield f'<gsd_registry type="{_escape_attr(category)}"><!-- MACHINE-READABLE REGISTRY -->'
+    for i, item in enumerate(items):
+        span = f' offset="{spans[i][0]}" length="{spans[i][1]}"' if spans else ""
+        yield (f'\n    <item id="{_escape_attr(item["id"])}" confidence="{_escape_attr(str(item["confidence"]))}"{span}>'
+               + _xml_element("name", item["name"])
+               + _xml_element("path", item["path"])
+               + _xml_element("description", item["description"])
+               + "\n    </item>")
+    yield "\n</gsd_registry>"
+
+def _encoded_len(text):
+    """Bytes `text` occupies once written in text mode (newlines become os.linesep)."""
+    return len(text.encode('utf-8')) + text.count("\n") * (len(os.linesep) - 1)
+
+def _file_digest(path):
+    """sha256 of a file as a text-mode read sees it, or None if it cannot be read."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for chunk in iter(lambda: f.read(1 << 16), ""):
+                digest.update(chunk.encode('utf-8'))
+    except (OSError, UnicodeDecodeError):
+        return None
+    return digest.hexdigest()
+
+def write_if_changed(path, chunks):
+    """
+    Streams `chunks` to a temp file beside `path` while hashing them, then
+    atomically renames it over `path` only if the content differs. An
+    unchanged file keeps its mtime, so mtime-keyed caches stay valid.
+    Returns True if `path` was rewritten.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    digest = hashlib.sha256()
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                digest.update(chunk.encode('utf-8'))
+        if digest.hexdigest() == _file_digest(path):
+            os.remove(tmp_path)
+            return False
+        os.replace(tmp_path, path)
+        return True
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def update_inventory(path, category, items):
+    if not os.path.exists(path):
+        print(f"Error: Inventory file {path} not found.")
+        return False
+        
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
     
-    # Locate the registry tag
+    # 1. Locate the registry tag
     tag_match = re.search(r'<gsd_registry.*?>.*?</gsd_registry>', content, re.DOTALL)
     if not tag_match:
         print(f"Error: Registry tag not found in {path}")
-        return
+        return False
     
-    # Locate the "header" - everything before the first "---" (excluding frontmatter)
+    # 2. Locate the "header" - everything before the first "---" (excluding frontmatter)
     header_parts = re.split(r'\n---\n', content)
     if len(header_parts) > 1:
         header = header_parts[0].strip()
     else:
         header = content.split('##')[0].strip()
-    
-    new_content = f"""{header}
+    del content
+
+    # 3. Perform Reflective Swap: stream header, human section and XML block
+    def render():
+        preamble = f"""{header}
 
 ---
 
@@ -217,17 +363,33 @@ This file is both a human-readable inventory and a machine-readable registry. GS
 
 ---
 
-{human_content}
-
-{xml_registry}
 """
-    with open(path, 'w', encoding='utf-8') as f:
-        f.write(new_content)
-    print(f"Updated {path} with {len(items)} items.")
+        yield preamble
+        position = _encoded_len(preamble)
+
+        # Byte span of each item's section, from its "## " heading to the end of its
+        # text (what the legacy "---"-split extraction returns)
+        spans = []
+        for block in render_human_blocks(items):
+            if items:
+                body = block.lstrip("\n")
+                section = body[:body.rindex("\n---\n")].rstrip()
+                spans.append((position + _encoded_len(block[:len(block) - len(body)]), _encoded_len(section)))
+            yield block
+            position += _encoded_len(block)
+
+        yield "\n\n"
+        yield from render_xml_registry(category, items, spans)
+        yield "\n"
+
+    if write_if_changed(path, render()):
+        print(f"Updated {path} with {len(items)} items.")
+        return True
+    print(f"Unchanged {path} ({len(items)} items).")
+    return False
 
 def hydrate_personas(skills):
     """Injects discovered skills into persona files."""
-    PERSONAS_DIR = ".agent/personas"
     if not os.path.exists(PERSONAS_DIR):
         return
 
@@ -250,26 +412,147 @@ def hydrate_personas(skills):
                 content,
                 flags=re.DOTALL
             )
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
-            print(f"Hydrated persona: {persona_file}")
+            if new_content != content and write_if_changed(path, [new_content]):
+                print(f"Hydrated persona: {persona_file}")
 
-def main():
-    print(f"GSD Discovery Engine v1.1.0 | {datetime.datetime.now().isoformat()}")
-    print("-" * 50)
-    
-    skills = scan_skills()
+def sync(manifest, jobs=1, processes=False, full=False):
+    """
+    One discovery pass; unchanged SKILL.md files, inventories and personas are
+    left alone. With `full`, the compiled registry is rebuilt from scratch too.
+    """
+    stats = {"reused": 0, "reparsed": 0, "dropped": 0}
+    skills = scan_skills(manifest, stats, jobs=jobs, processes=processes)
+    save_manifest(manifest)
+    print(f"Skills: {stats['reused']} reused, {stats['reparsed']} re-parsed, {stats['dropped']} dropped")
     mcps = scan_mcps()
     
     update_inventory(SKILLS_INVENTORY, "skills", skills)
     update_inventory(MCPS_INVENTORY, "mcp_servers", mcps)
+
+    # Pre-normalized sidecar so gsd_select can skip the markdown/XML parse.
+    # Unchanged inventories keep the sidecar as is; otherwise only the SKILL.md
+    # files whose (mtime, size) moved are re-read and re-hashed
+    previous = None if full else read_compiled_registry(SKILLS_INVENTORY, MCPS_INVENTORY, None)
+    stamp = inventory_stamp((SKILLS_INVENTORY, MCPS_INVENTORY))
+    if previous is not None and previous["stamp"] == stamp:
+        compiled = previous
+    else:
+        compiled = compile_registry(SKILLS_INVENTORY, MCPS_INVENTORY, cache=source_cache(previous))
+        write_compiled_registry(compiled)
+
+    # Shared snapshot selector processes attach to instead of loading their own copy
+    try:
+        published = publish_snapshot(compiled)
+        if published:
+            # Older versions of this project's snapshot are dead weight in RAM
+            remove_snapshots(keep=published)
+    except OSError as e:
+        print(f"Warn: could not publish registry snapshot: {e}", file=sys.stderr)
+
+    # Query store for `gsd_select.py --backend sqlite`
+    try:
+        if write_registry_db(compiled):
+            print(f"Updated {REGISTRY_DB} with {len(compiled['skills']) + len(compiled['mcps'])} items.")
+    except sqlite3.Error as e:
+        # e.g. an SQLite build without FTS5; the index backend does not need it
+        print(f"Warn: could not write {REGISTRY_DB}: {e}", file=sys.stderr)
     
+    # Audit segments sealed by selections are compacted here, off their path
+    try:
+        compacted = compact_pending()
+        if compacted:
+            print(f"Compacted {compacted} audit log segment(s).")
+    except OSError as e:
+        print(f"Warn: could not compact audit log segments: {e}", file=sys.stderr)
+
     # Hydration Wave
     print("Initiating Hydration Wave...")
     hydrate_personas(skills)
+
+def watch_snapshot():
+    """(mtime_ns, size) of every watched file: SKILL.md files, personas and MCP configs."""
+    snapshot = {}
+    def stat_into(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        snapshot[path] = (st.st_mtime_ns, st.st_size)
+
+    for directory, filename in ((SKILLS_DIR, "SKILL.md"), (PERSONAS_DIR, None)):
+        try:
+            names = sorted(os.listdir(directory))
+        except OSError:
+            continue
+        for name in names:
+            if filename:
+                # Directories without a SKILL.md still appear in the inventory
+                snapshot[os.path.join(directory, name)] = None
+                stat_into(os.path.join(directory, name, filename))
+            elif name.endswith(".md"):
+                stat_into(os.path.join(directory, name))
+    for paths in PATHS.values():
+        for path in paths:
+            stat_into(path)
+    return snapshot
+
+def watch(manifest, jobs=1, processes=False, interval=WATCH_INTERVAL, debounce=WATCH_DEBOUNCE):
+    """
+    Polls the watched paths and re-syncs after each burst of changes. Idle
+    cost is one stat per watched file every `interval` seconds; the manifest
+    stays in memory, so only touched SKILL.md files are re-parsed.
+    """
+    print(f"Watching {SKILLS_DIR}, {PERSONAS_DIR} and MCP configs (Ctrl-C to stop)...")
+    snapshot = watch_snapshot()
+    while True:
+        time.sleep(interval)
+        current = watch_snapshot()
+        if current == snapshot:
+            continue
+
+        # Debounce: wait until a full quiet period passes without further changes
+        while True:
+            time.sleep(debounce)
+            settled = watch_snapshot()
+            if settled == current:
+                break
+            current = settled
+
+        print("-" * 50)
+        print(f"Change detected | {datetime.datetime.now().isoformat()}")
+        try:
+            sync(manifest, jobs=jobs, processes=processes)
+        except Exception as e:
+            # e.g. a SKILL.md caught mid-save, or deleted between listing and stat;
+            # the next change to it triggers another pass
+            print(f"Error: sync failed, still watching: {e!r}", file=sys.stderr)
+        # Our own persona and inventory writes must not trigger another pass
+        snapshot = watch_snapshot()
+
+def main():
+    parser = argparse.ArgumentParser(description="Discover skills and MCP servers and rebuild the GSD inventories.")
+    parser.add_argument("--full", action="store_true", help="Ignore the sync manifest and re-parse every SKILL.md")
+    parser.add_argument("--jobs", type=int, default=1, help="Scan skills with N parallel workers (default: 1)")
+    parser.add_argument("--processes", action="store_true", help="Use a process pool instead of threads for --jobs")
+    parser.add_argument("--watch", action="store_true", help="Keep running and re-sync whenever skills, personas or MCP configs change")
+    parser.add_argument("--interval", type=float, default=WATCH_INTERVAL, help=f"--watch polling interval in seconds (default: {WATCH_INTERVAL})")
+    parser.add_argument("--debounce", type=float, default=WATCH_DEBOUNCE, help=f"--watch quiet period before applying changes (default: {WATCH_DEBOUNCE})")
+    args, _ = parser.parse_known_args()
+
+    print(f"GSD Discovery Engine v1.1.0 | {datetime.datetime.now().isoformat()}")
+    print("-" * 50)
+    
+    manifest = {"version": MANIFEST_VERSION, "skills": {}} if args.full else load_manifest()
+    sync(manifest, jobs=args.jobs, processes=args.processes, full=args.full)
     
     print("-" * 50)
     print("Sync complete.")
 
+    if args.watch:
+        try:
+            watch(manifest, jobs=args.jobs, processes=args.processes, interval=args.interval, debounce=args.debounce)
+        except KeyboardInterrupt:
+            print("Watch stopped.")
+
 if __name__ == "__main__":
     main()
@@ -2,6 +2,11 @@ import os
 import sys
 from scan_dependencies import identify_libraries
 
+LIBRARIES_DIR = ".agent/libraries"
+
+def library_path(lib):
+    return os.path.join(LIBRARIES_DIR, lib['category'], f"{lib['name']}.md")
+
 def get_library_context():
     """Reads content from active .agent/libraries/ files."""
     active_libs = identify_libraries()
@@ -17,7 +22,7 @@ def get_library_context():
     for lib in active_libs:
         category = lib['category']
         name = lib['name']
-        path = os.path.join(".agent/libraries", category, f"{name}.md")
+        path = library_path(lib)
         
         if os.path.exists(path):
             try:
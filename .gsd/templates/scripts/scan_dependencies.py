@@ -11,6 +11,9 @@ except ImportError:
         print("Warning: neither 'tomllib' nor 'toml' installed. pyproject.toml scanning will fail.", file=sys.stderr)
         tomllib = None
 
+# Files identify_libraries() reads
+MANIFEST_FILES = ("package.json", "pyproject.toml")
+
 # High Value Interest List
 # We only want to fetch intelligence for major frameworks, not every utility lib.
 INTEREST_LIST = {
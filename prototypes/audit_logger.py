@@ -1,38 +1,91 @@
 import fcntl
 import json
 import os
+import time
+import threading
 import contextlib
 
+DURABILITY_MODES = ("strict", "batched", "async")
+
 class SafeAuditLogger:
-    def __init__(self, log_path):
+    def __init__(self, log_path, durability="strict", batch_events=64, batch_interval_ms=200):
+        """
+        durability:
+          strict  - lock, write and fsync every event
+          batched - group commit every `batch_events` events or `batch_interval_ms`, one fsync per group
+          async   - lock and write every event, no fsync (OS-buffered)
+        Call close() before exiting so a batched logger commits its tail.
+        """
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode: {durability}")
         self.log_path = log_path
+        self.durability = durability
+        self.batch_events = batch_events
+        self.batch_interval = batch_interval_ms / 1000.0
+        self.pending = []
+        self.stats = {"commits": 0, "events": 0, "lock_wait_ms": 0.0, "fsync_ms": 0.0}
+        self._lock = threading.Lock()
+        self._timer = None
 
     def log_event(self, event_data):
         """
         Safely append a JSON event to the log file using fcntl locking.
         """
+        with self._lock:
+            self.pending.append(event_data)
+            if self.durability != "batched" or len(self.pending) >= self.batch_events:
+                self._commit()
+            elif self._timer is None:
+                # Deadline flush: the tail is committed even if no further event arrives
+                self._timer = threading.Timer(self.batch_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            self._commit()
+
+    def close(self):
+        self.flush()
+
+    def _commit(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self.pending:
+            return
+        events, self.pending = self.pending, []
+
         # Ensure directory exists
         os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
 
         with open(self.log_path, 'a') as f:
             try:
                 # Acquire an exclusive lock (blocking)
+                wait_start = time.perf_counter()
                 fcntl.flock(f, fcntl.LOCK_EX)
+                self.stats["lock_wait_ms"] += (time.perf_counter() - wait_start) * 1000
                 
-                # Write the JSON line
-                json_line = json.dumps(event_data) + "\n"
-                f.write(json_line)
+                # Write whole JSON lines only, so readers never see a torn line
+                f.write("".join(json.dumps(event) + "\n" for event in events))
                 
                 # Flush buffers to ensure data hits OS buffers
                 f.flush()
-                os.fsync(f.fileno())
+                if self.durability != "async":
+                    fsync_start = time.perf_counter()
+                    os.fsync(f.fileno())
+                    self.stats["fsync_ms"] += (time.perf_counter() - fsync_start) * 1000
                 
             finally:
                 # Release the lock
                 fcntl.flock(f, fcntl.LOCK_UN)
 
+        self.stats["commits"] += 1
+        self.stats["events"] += len(events)
+
 if __name__ == "__main__":
     # verification
     logger = SafeAuditLogger(".gsd/logs/prototype_audit.jsonl")
     logger.log_event({"event": "test_init", "status": "ok"})
+    logger.close()
     print("Log entry written safely.")
@@ -2,10 +2,12 @@ import multiprocessing
 import time
 import random
 import os
-from audit_logger import SafeAuditLogger
+import sys
+import json
+from audit_logger import SafeAuditLogger, DURABILITY_MODES
 
-def worker_task(worker_id):
-    logger = SafeAuditLogger(".gsd/logs/prototype_audit.jsonl")
+def worker_task(worker_id, durability, stats_queue):
+    logger = SafeAuditLogger(".gsd/logs/prototype_audit.jsonl", durability=durability)
     
     # Simulate a large skill payload (10KB)
     large_payload = "X" * 10240
@@ -21,20 +23,37 @@ def worker_task(worker_id):
         # Random sleep to interleave writes
         time.sleep(random.uniform(0.001, 0.005))
 
+    # Child processes skip atexit, so commit the batched tail explicitly
+    logger.close()
+    stats_queue.put(logger.stats)
+
 if __name__ == "__main__":
+    durability = sys.argv[1] if len(sys.argv) > 1 else "strict"
+    if durability not in DURABILITY_MODES:
+        print(f"Usage: stress_test.py [{'|'.join(DURABILITY_MODES)}]")
+        sys.exit(1)
+
     # Clean up previous run
     if os.path.exists(".gsd/logs/prototype_audit.jsonl"):
         os.remove(".gsd/logs/prototype_audit.jsonl")
         
     processes = []
-    print("Starting stress test with 10 processes...")
+    stats_queue = multiprocessing.Queue()
+    print(f"Starting stress test with 10 processes (durability={durability})...")
+    start = time.time()
     
     for i in range(10):
-        p = multiprocessing.Process(target=worker_task, args=(i,))
+        p = multiprocessing.Process(target=worker_task, args=(i, durability, stats_queue))
         processes.append(p)
         p.start()
         
+    totals = {"commits": 0, "events": 0, "lock_wait_ms": 0.0, "fsync_ms": 0.0}
+    for _ in processes:
+        for key, value in stats_queue.get().items():
+            totals[key] += value
+
     for p in processes:
         p.join()
         
-    print("Stress test complete.")
+    totals = {k: round(v, 2) for k, v in totals.items()}
+    print(f"Stress test complete in {time.time() - start:.2f}s: {json.dumps(totals)}")
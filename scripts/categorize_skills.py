@@ -1,12 +1,17 @@
 #!/usr/bin/env python3
 import os
 import re
+import argparse
 import xml.etree.ElementTree as ET
 from urllib.parse import quote
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from gsd_registry import compile_registry, write_compiled_registry
 
 # Configuration
 SKILLS_DIR = ".agent/skills"
 OUTPUT_FILE = ".gsd/SKILLS.md"
+MCPS_INVENTORY = ".gsd/MCPS.md"
 
 # Categorization Keywords (Heuristics)
 CATEGORIES = {
@@ -79,18 +84,33 @@ def generate_registry_xml(skills):
     return xml_str
 
 def main():
+    parser = argparse.ArgumentParser(description="Categorize skills and regenerate SKILLS.md.")
+    parser.add_argument("--jobs", type=int, default=1, help="Read SKILL.md files with N parallel workers (default: 1)")
+    parser.add_argument("--processes", action="store_true", help="Use a process pool instead of threads for --jobs")
+    args, _ = parser.parse_known_args()
+
     print(" scanning skills...")
     
     discovered_skills = []
     
     # Walk through .agent/skills
+    skill_paths = []
     for root, dirs, files in os.walk(SKILLS_DIR):
         if "SKILL.md" in files:
-            skill_path = os.path.join(root, "SKILL.md")
-            meta = get_skill_metadata(skill_path)
-            if meta:
-                meta["category"] = determine_category(meta)
-                discovered_skills.append(meta)
+            skill_paths.append(os.path.join(root, "SKILL.md"))
+
+    # map() keeps walk order, so parallel runs produce the same file as serial ones
+    if args.jobs > 1 and len(skill_paths) > 1:
+        pool = ProcessPoolExecutor if args.processes else ThreadPoolExecutor
+        with pool(max_workers=args.jobs) as executor:
+            metadata = list(executor.map(get_skill_metadata, skill_paths, chunksize=max(1, len(skill_paths) // (args.jobs * 4))))
+    else:
+        metadata = [get_skill_metadata(path) for path in skill_paths]
+
+    for meta in metadata:
+        if meta:
+            meta["category"] = determine_category(meta)
+            discovered_skills.append(meta)
 
     # Sort skills by name
     discovered_skills.sort(key=lambda x: x["name"])
@@ -137,6 +157,13 @@ def main():
     # Write File
     with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
         f.write("\n".join(output_lines))
+
+    # Pre-normalized sidecar so gsd_select can skip the markdown/XML parse;
+    # without it the next load_registry() just parses and retries the write
+    try:
+        write_compiled_registry(compile_registry(OUTPUT_FILE, MCPS_INVENTORY))
+    except OSError:
+        pass
         
     print(f"Successfully generated {OUTPUT_FILE} with {len(discovered_skills)} skills.")
 
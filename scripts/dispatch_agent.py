@@ -1,8 +1,14 @@
 #!/usr/bin/env python3
 import os
 import sys
-import subprocess
-import json
+import time
+import argparse
+
+import gsd_directive_cache
+from gsd_select import MCPS_INVENTORY, SKILLS_INVENTORY, append_audit_events
+from read_library_context import library_path
+from recall_context import ARCHITECTURE_FILE, recall, render_text
+from scan_dependencies import MANIFEST_FILES, identify_libraries
 
 # dispatch_agent.py — The V3.0 Orchestrator
 # This script bridges Persona, Skills, Architecture, and Library Intelligence
@@ -11,48 +17,88 @@ import json
 def print_separator(char="━"):
     print(char * 60)
 
+# Map task types to common persona names
+PERSONA_ALIASES = {
+    "auto": "implementer",
+    "verify": "reviewer",
+    "research": "researcher"
+}
+
+def persona_paths(persona_name):
+    """Candidate persona files, in lookup order: the hydrated one, then the template."""
+    persona_name = PERSONA_ALIASES.get(persona_name, persona_name)
+    return [f".agent/personas/{persona_name}.md", f".gsd/templates/.agent/personas/{persona_name}.md"]
+
 def load_persona(persona_name):
     """Loads the base persona file from .agent/personas/"""
-    # Map task types to common persona names
-    mapping = {
-        "auto": "implementer",
-        "verify": "reviewer",
-        "research": "researcher"
-    }
-    persona_name = mapping.get(persona_name, persona_name)
-    
-    persona_path = f".agent/personas/{persona_name}.md"
-    if not os.path.exists(persona_path):
-        # Fallback to templates if local not yet hydrated
-        persona_path = f".gsd/templates/.agent/personas/{persona_name}.md"
-    
-    if os.path.exists(persona_path):
-        with open(persona_path, 'r') as f:
-            return f.read()
+    # Fallback to templates if local not yet hydrated
+    for persona_path in persona_paths(persona_name):
+        if os.path.exists(persona_path):
+            with open(persona_path, 'r') as f:
+                return f.read()
+    persona_name = PERSONA_ALIASES.get(persona_name, persona_name)
     return f"# {persona_name.capitalize()} Persona\n(Warning: Persona file not found)"
 
 def get_context(objective):
-    """Calls recall_context.py to gather all intelligent fragments."""
-    cmd = [sys.executable, "scripts/recall_context.py", objective]
+    """
+    Gathers all intelligent fragments in-process (see recall_context.recall).
+    Returns (rendered text, recall data or None on failure).
+    """
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        return result.stdout
+        data = recall(objective)
     except Exception as e:
-        return f"Error recalling context: {e}"
-
-def main():
-    if len(sys.argv) < 3:
-        print("Usage: dispatch_agent.py <persona> <objective>")
-        sys.exit(1)
-
-    persona_name = sys.argv[1]
-    objective = " ".join(sys.argv[2:])
+        return f"Error recalling context: {e}", None
+    return render_text(data), data
+
+def static_inputs(persona_name):
+    """
+    The input files known before recall runs. The inventories and manifests
+    among them also decide which skill and library files it reads.
+    """
+    return persona_paths(persona_name) + [ARCHITECTURE_FILE, SKILLS_INVENTORY, MCPS_INVENTORY] + list(MANIFEST_FILES)
+
+def directive_inputs(persona_name, data):
+    """Every file whose content went into a directive built from recall `data`."""
+    paths = static_inputs(persona_name)
+
+    # Selected skills are extracted from their own files; recall already
+    # reports where each one came from
+    paths += [r["path"] for r in data["skills_mcps"].get("results", []) if r.get("path")]
+    paths += [library_path(lib) for lib in identify_libraries()]
+    return paths
+
+def log_cache_event(persona_name, lookup_result):
+    """Directive-cache hit/miss counter in the audit stream (not a selection event)."""
+    append_audit_events([{
+        "timestamp": time.time(),
+        "pid": os.getpid(),
+        "event": "directive_cache",
+        "result": "hit" if lookup_result == "hit" else "miss",
+        "reason": lookup_result,
+        "persona": persona_name,
+    }])
+
+def dispatch(persona_name, objective, use_cache=True):
+    """
+    Builds the active system directive for `persona_name` working on `objective`.
+    With `use_cache`, a directive whose input files are all unchanged is
+    served from .gsd/.cache/directives/ instead of being rebuilt.
+    """
+    if use_cache:
+        directive, result = gsd_directive_cache.lookup(persona_name, objective)
+        log_cache_event(persona_name, result)
+        if directive is not None:
+            return directive
+        # Taken before anything is read, so an edit made while the directive
+        # is being built keeps it out of the cache (see consistent())
+        before = gsd_directive_cache.capture(static_inputs(persona_name))
+        started_ns = time.time_ns()
 
     # 1. Load Persona
     persona_content = load_persona(persona_name)
 
     # 2. Gather Intelligent Context
-    context_output = get_context(objective)
+    context_output, data = get_context(objective)
 
     # 3. Format the Active Directive
     directive = f"""
@@ -80,7 +126,27 @@ You are now adopting the specialized persona below.
  {objective}
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 """
-    print(directive)
+    # Partial context (a timed-out or failed source) is never cached
+    if use_cache and data and all(s["status"] == "ok" for s in data["sources"].values()):
+        try:
+            inputs = gsd_directive_cache.capture(directive_inputs(persona_name, data), known=before)
+            if gsd_directive_cache.consistent(inputs, before, started_ns):
+                gsd_directive_cache.store(persona_name, objective, directive, inputs)
+        except OSError as e:
+            print(f"Warn: could not cache directive: {e}", file=sys.stderr)
+    return directive
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the system directive for a persona and objective.")
+    parser.add_argument("persona", help="Persona name or task type (auto, verify, research)")
+    parser.add_argument("objective", nargs="+", help="Task objective")
+    parser.add_argument("--no-cache", action="store_true", help="Rebuild the directive even if a cached one is still valid")
+    if len(sys.argv) < 3:
+        print("Usage: dispatch_agent.py <persona> <objective>")
+        sys.exit(1)
+    args, extra = parser.parse_known_args()
+
+    print(dispatch(args.persona, " ".join(args.objective + extra), use_cache=not args.no_cache))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Importable GSD pipeline. Runs skill selection, context recall and agent
+dispatch inside the calling process, so no extra interpreters are started
+and no JSON round-trips through stdout.
+
+    import sys; sys.path.insert(0, "scripts")
+    import gsd
+    gsd.select("fix the failing login test")    # dict, as gsd_select.py prints
+    gsd.recall("fix the failing login test")    # {"architecture", "skills_mcps", "library_intelligence"}
+    gsd.dispatch("auto", "fix the failing login test")  # directive text
+
+Paths are relative to the project root, like the CLIs.
+"""
+from dispatch_agent import dispatch
+from gsd_select import select
+from recall_context import recall, render_text
+
+__all__ = ["select", "recall", "render_text", "dispatch"]
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+import os
+import json
+import hashlib
+
+# --- Configuration ---
+# One JSON file per (persona, objective); file mtime doubles as the LRU clock
+DIRECTIVE_CACHE_DIR = ".gsd/.cache/directives"
+DIRECTIVE_CACHE_MAX_BYTES = int(os.environ.get("GSD_DIRECTIVE_CACHE_BYTES", str(8 * 1024 * 1024)))
+# Bump whenever the entry layout changes
+DIRECTIVE_CACHE_FORMAT = 1
+
+def cache_key(persona_name, objective):
+    return hashlib.sha256(f"{persona_name}\0{objective}".encode('utf-8')).hexdigest()
+
+def file_state(path):
+    """[mtime_ns, size, sha256] of an input file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size, digest]
+
+def capture(paths, known=None):
+    """
+    {path: file_state} for `paths`. An entry of `known` (an earlier capture)
+    whose (mtime, size) still matches is reused instead of re-hashing the file.
+    """
+    states = {}
+    for path in sorted(set(paths)):
+        state = (known or {}).get(path)
+        if state is not None:
+            try:
+                st = os.stat(path)
+                if [st.st_mtime_ns, st.st_size] == state[:2]:
+                    states[path] = state
+                    continue
+            except OSError:
+                pass
+        states[path] = file_state(path)
+    return states
+
+def consistent(inputs, before, started_ns):
+    """
+    True if `inputs` (captured after building a directive) can be trusted to
+    describe what the build read: every input captured in `before` (taken
+    before the build started) is unchanged, and every other input was last
+    modified before `started_ns` or is missing.
+    """
+    for path, state in inputs.items():
+        if path in before:
+            if state != before[path]:
+                return False
+        elif state is not None and state[0] >= started_ns:
+            return False
+    return True
+
+def inputs_unchanged(inputs):
+    """
+    True if every recorded input still has the same content (or is still
+    missing). A matching (mtime, size) skips the hash; a touched but
+    unedited file is caught by the content hash.
+    """
+    for path, state in inputs.items():
+        try:
+            st = os.stat(path)
+        except OSError:
+            if state is not None:
+                return False
+            continue
+        if state is None:
+            return False
+        if [st.st_mtime_ns, st.st_size] == state[:2]:
+            continue
+        current = file_state(path)
+        if current is None or current[2] != state[2]:
+            return False
+    return True
+
+def _entry_path(key, cache_dir):
+    return os.path.join(cache_dir, f"{key}.json")
+
+def lookup(persona_name, objective, cache_dir=DIRECTIVE_CACHE_DIR):
+    """
+    Returns (directive, "hit") for a valid entry, else (None, "absent" | "stale").
+    A stale entry is removed; a hit is marked most recently used.
+    """
+    path = _entry_path(cache_key(persona_name, objective), cache_dir)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None, "absent"
+
+    if entry.get("format") != DIRECTIVE_CACHE_FORMAT or not inputs_unchanged(entry.get("inputs", {})):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None, "stale"
+
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return entry["directive"], "hit"
+
+def store(persona_name, objective, directive, inputs, cache_dir=DIRECTIVE_CACHE_DIR, max_bytes=DIRECTIVE_CACHE_MAX_BYTES):
+    """Caches `directive` along with `inputs`, the capture() of every file it was built from."""
+    os.makedirs(cache_dir, exist_ok=True)
+    entry = {
+        "format": DIRECTIVE_CACHE_FORMAT,
+        "persona": persona_name,
+        "objective": objective,
+        "inputs": inputs,
+        "directive": directive,
+    }
+    path = _entry_path(cache_key(persona_name, objective), cache_dir)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, path)
+    evict(cache_dir, max_bytes)
+
+def evict(cache_dir=DIRECTIVE_CACHE_DIR, max_bytes=DIRECTIVE_CACHE_MAX_BYTES):
+    """Removes least recently used entries until the cache fits in `max_bytes`. Returns the count removed."""
+    entries = []
+    try:
+        with os.scandir(cache_dir) as it:
+            for e in it:
+                if e.name.endswith(".json"):
+                    try:
+                        st = e.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime_ns, st.st_size, e.path))
+    except OSError:
+        return 0
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+import os
+import re
+import json
+import hashlib
+import xml.etree.ElementTree as ET
+
+from gsd_index import RegistryIndex, tokenize
+
+# --- Configuration ---
+CACHE_DIR = ".gsd/.cache"
+# Plain JSON, so loading it never runs code from the cache directory; the
+# index is stored alongside the items (RegistryIndex.state) and restored as is
+COMPILED_REGISTRY = os.path.join(CACHE_DIR, "registry.json")
+# Bump whenever the compiled layout (item fields, index class) changes
+REGISTRY_FORMAT = 7
+# Level-2 markdown headings that start a section of a SKILL.md
+SECTION_RE = re.compile(rb'^## +(.+?)[ \t]*\r?$', re.MULTILINE)
+
+def extract_registry(path):
+    if not os.path.exists(path):
+        return []
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    # Locate the registry tag - ensure it's the block and not a text mention
+    tag_match = re.search(r'\n(<gsd_registry.*?>.*?</gsd_registry>)', content, re.DOTALL)
+    if not tag_match:
+        # Fallback to start of string or search without leading newline if it's the only content
+        tag_match = re.search(r'(<gsd_registry.*?>.*?</gsd_registry>)', content, re.DOTALL)
+    
+    if not tag_match:
+        return []
+    
+    registry_xml = tag_match.group(1).strip()
+    
+    try:
+        root = ET.fromstring(registry_xml)
+        items = []
+        for item in root.findall('item'):
+            entry = {
+                "id": item.get('id'),
+                "confidence": float(item.get('confidence', 0)),
+                "name": item.find('name').text if item.find('name') is not None else "",
+                "path": item.find('path').text if item.find('path') is not None else "",
+                "description": item.find('description').text if item.find('description') is not None else ""
+            }
+            # Byte span of the item's human section, written by gsd_sync.update_inventory
+            if item.get('offset') is not None and item.get('length') is not None:
+                entry["span"] = (int(item.get('offset')), int(item.get('length')))
+            items.append(entry)
+        return items
+    except Exception as e:
+        print(f"Error parsing registry in {path}: {e}")
+        return []
+
+def inventory_stamp(paths):
+    """(mtime_ns, size) per inventory; None for a missing file."""
+    stamp = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            stamp.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+def read_source(item):
+    """(bytes, (mtime_ns, size)) of the file the item points at, or (None, None)."""
+    item_path = item.get('path')
+    if item_path and os.path.isfile(item_path):
+        try:
+            with open(item_path, 'rb') as f:
+                st = os.fstat(f.fileno())
+                return f.read(), (st.st_mtime_ns, st.st_size)
+        except OSError:
+            pass
+    return None, None
+
+def content_hash(item, data=None):
+    """sha256 of the skill/config file the item points at, or of its description."""
+    if data is None:
+        data, _ = read_source(item)
+    if data is None:
+        data = (item.get('description') or "").encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+def index_sections(data):
+    """
+    Splits a SKILL.md at its `## ` headings. Returns one entry per section with
+    the heading, the byte range (offset, length) of the section including its
+    heading line, and the section's token set for relevance scoring.
+    Text before the first heading (frontmatter, title) is not a section.
+    """
+    matches = list(SECTION_RE.finditer(data))
+    sections = []
+    for i, match in enumerate(matches):
+        start = match.start()
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(data)
+        heading = match.group(1).decode('utf-8', 'replace')
+        body = data[start:end].decode('utf-8', 'replace')
+        sections.append({
+            "heading": heading,
+            "offset": start,
+            "length": len(data[start:end].rstrip()),
+            "heading_tokens": frozenset(tokenize(heading)),
+            "tokens": frozenset(tokenize(body)),
+        })
+    return sections
+
+def cached_source(item, cache):
+    """
+    The sha256/sections/source_stamp `cache` holds for the item's file if that
+    file's (mtime_ns, size) still matches, so an unchanged SKILL.md is not reopened.
+    """
+    item_path = item.get('path')
+    cached = cache.get(item_path) if cache and item_path else None
+    if cached is None or cached.get('source_stamp') is None:
+        return None
+    try:
+        st = os.stat(item_path)
+    except OSError:
+        return None
+    if (st.st_mtime_ns, st.st_size) != tuple(cached['source_stamp']):
+        return None
+    return cached
+
+def source_cache(compiled):
+    """Per-path source data of an earlier compile_registry() result, for reuse by the next one."""
+    if not compiled:
+        return {}
+    return {item['path']: item for item in compiled["skills"] + compiled["mcps"]
+            if item.get('path') and item.get('source_stamp') is not None}
+
+def normalize_item(item, inventory, cache=None):
+    item['inventory'] = inventory
+    item['name_lc'] = (item.get('name') or "").lower()
+    item['id_lc'] = (item.get('id') or "").lower()
+    item['tokens'] = tokenize(" ".join((item.get('name') or "", item.get('id') or "", item.get('description') or "")))
+    cached = cached_source(item, cache)
+    if cached is not None:
+        item['sha256'] = cached['sha256']
+        item['source_stamp'] = tuple(cached['source_stamp'])
+        item['sections'] = cached['sections']
+        return item
+    data, source_stamp = read_source(item)
+    item['sha256'] = content_hash(item, data)
+    # Section byte ranges are only valid for this exact version of the file
+    item['source_stamp'] = source_stamp
+    item['sections'] = index_sections(data) if data is not None else []
+    return item
+
+def compile_registry(skills_path, mcps_path, cache=None):
+    """
+    Parses both inventories into the pre-normalized form consumers load.
+    `cache` (see source_cache) supplies hashes and sections of unchanged source files.
+    """
+    # Stamp before parsing: an edit that lands mid-compile then reads as stale
+    stamp = inventory_stamp((skills_path, mcps_path))
+    skills = [normalize_item(item, skills_path, cache) for item in extract_registry(skills_path)]
+    mcps = [normalize_item(item, mcps_path, cache) for item in extract_registry(mcps_path)]
+    return {
+        "format": REGISTRY_FORMAT,
+        "sources": (skills_path, mcps_path),
+        "stamp": stamp,
+        "skills": skills,
+        "mcps": mcps,
+        "index": RegistryIndex(skills + mcps),
+    }
+
+def item_record(item):
+    """A normalized item in plain JSON types: section token sets become sorted lists."""
+    record = dict(item)
+    if item.get('sections') is not None:
+        record['sections'] = [dict(section, heading_tokens=sorted(section['heading_tokens']), tokens=sorted(section['tokens']))
+                              for section in item['sections']]
+    return record
+
+def item_from_record(record):
+    """Inverse of item_record()."""
+    for key in ('span', 'source_stamp'):
+        if record.get(key) is not None:
+            record[key] = tuple(record[key])
+    for section in record.get('sections') or ():
+        section['heading_tokens'] = frozenset(section['heading_tokens'])
+        section['tokens'] = frozenset(section['tokens'])
+    return record
+
+def _sidecar_record(item, sections):
+    """
+    item_record() minus the sections, which go in `sections` once per source
+    file however many items share it.
+    """
+    record = item_record({k: v for k, v in item.items() if k != 'sections'})
+    if item.get('path'):
+        if item['path'] not in sections:
+            sections[item['path']] = item_record({'sections': item.get('sections') or []})['sections']
+    else:
+        record['sections'] = item_record({'sections': item.get('sections') or []})['sections']
+    return record
+
+def write_compiled_registry(compiled, path=COMPILED_REGISTRY):
+    """Atomically replaces the sidecar so readers never see a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    sections = {}
+    skills = [_sidecar_record(item, sections) for item in compiled["skills"]]
+    mcps = [_sidecar_record(item, sections) for item in compiled["mcps"]]
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            "format": compiled["format"],
+            "sources": list(compiled["sources"]),
+            "stamp": compiled["stamp"],
+            "skills": skills,
+            "mcps": mcps,
+            "sections": sections,
+            "index": compiled["index"].state(),
+        }, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def read_compiled_registry(skills_path, mcps_path, stamp, path=COMPILED_REGISTRY):
+    """
+    Returns the sidecar if it was compiled from exactly these inventory stamps,
+    else None. With `stamp=None` any sidecar for these inventories is returned.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or data.get("format") != REGISTRY_FORMAT:
+            return None
+        sources = tuple(data["sources"])
+        data_stamp = tuple(tuple(s) if s is not None else None for s in data["stamp"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if sources != (skills_path, mcps_path):
+        return None
+    if stamp is not None and data_stamp != stamp:
+        return None
+    try:
+        sections = {source: item_from_record({'sections': records})['sections']
+                    for source, records in data["sections"].items()}
+        skills = [item_from_record(record) for record in data["skills"]]
+        mcps = [item_from_record(record) for record in data["mcps"]]
+        for item in skills + mcps:
+            if item.get('path'):
+                item['sections'] = sections[item['path']]
+        index = RegistryIndex.from_state(skills + mcps, data["index"])
+    except (KeyError, TypeError, AttributeError, ValueError, OverflowError):
+        return None
+    return {
+        "format": REGISTRY_FORMAT,
+        "sources": sources,
+        "stamp": data_stamp,
+        "skills": skills,
+        "mcps": mcps,
+        "index": index,
+    }
+
+def load_registry(skills_path, mcps_path, stamp=None, path=COMPILED_REGISTRY):
+    """
+    Fast path: the compiled sidecar, validated by one stat per inventory.
+    Slow path: parse the markdown and refresh the sidecar for the next caller.
+    """
+    if stamp is None:
+        stamp = inventory_stamp((skills_path, mcps_path))
+    compiled = read_compiled_registry(skills_path, mcps_path, stamp, path)
+    if compiled is not None:
+        return compiled
+
+    compiled = compile_registry(skills_path, mcps_path)
+    if compiled["stamp"] == stamp and any(stamp):
+        try:
+            write_compiled_registry(compiled, path)
+        except OSError:
+            pass
+    return compiled
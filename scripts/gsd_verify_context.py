@@ -1,45 +1,131 @@
 #!/usr/bin/env python3
+import argparse
 import json
+import math
 import os
 import sys
 from datetime import datetime
 
+from gsd_audit import LogCursor, sealed_segments, tail_events
+
 LOG_FILE = ".gsd/logs/audit.jsonl"
+CHECKPOINT_FILE = ".gsd/logs/verify_checkpoint.json"
 
-def main():
-    if not os.path.exists(LOG_FILE):
-        print(f"No audit log found at {LOG_FILE}")
-        return
+# Memory bounds for the full-history statistics
+TOP_IDS_CAPACITY = 256      # tracked ids (space-saving counter)
+HOURLY_BUCKETS = 24 * 30    # most recent hours kept for throughput
+SIZE_BUCKETS_PER_OCTAVE = 4 # fragment-size histogram resolution (~19% per bucket)
 
-    print(f"📊 Analyzing Context Logs: {LOG_FILE}\n")
-    
-    entries = []
-    with open(LOG_FILE, 'r') as f:
-        for line in f:
-            try:
-                entries.append(json.loads(line))
-            except json.JSONDecodeError:
-                continue
-
-    if not entries:
-        print("Log file is empty.")
-        return
+class HistoryStats:
+    """
+    Full-history statistics in bounded memory: counters, a log-scale
+    histogram of fragment sizes, a space-saving top-k of selected ids and
+    a capped per-hour event count. Serialisable so a checkpoint can resume it.
+    """
+    def __init__(self, state=None):
+        state = state or {}
+        self.total = state.get("total", 0)
+        self.empty_selections = state.get("empty_selections", 0)
+        self.empty_fragments = state.get("empty_fragments", 0)
+        self.size_buckets = {int(k): v for k, v in state.get("size_buckets", {}).items()}
+        self.top_ids = dict(state.get("top_ids", {}))
+        self.hourly = {int(k): v for k, v in state.get("hourly", {}).items()}
+        self.directive_cache = dict({"hit": 0, "miss": 0}, **state.get("directive_cache", {}))
+
+    def to_dict(self):
+        return {
+            "total": self.total,
+            "empty_selections": self.empty_selections,
+            "empty_fragments": self.empty_fragments,
+            "size_buckets": self.size_buckets,
+            "top_ids": self.top_ids,
+            "hourly": self.hourly,
+            "directive_cache": self.directive_cache,
+        }
+
+    def add(self, event):
+        if event.get("event") == "directive_cache":
+            result = event.get("result", "miss")
+            self.directive_cache[result] = self.directive_cache.get(result, 0) + 1
+            return
+        if "selected_ids" not in event:
+            # Not a selection event (e.g. cache or tooling telemetry)
+            return
+        self.total += 1
+        selected = event.get("selected_ids") or []
+        frag_len = event.get("fragment_length", 0) or 0
+        if not selected:
+            self.empty_selections += 1
+        elif frag_len == 0:
+            self.empty_fragments += 1
+
+        bucket = _size_bucket(frag_len)
+        self.size_buckets[bucket] = self.size_buckets.get(bucket, 0) + 1
 
-    # Summary Stats
-    total_calls = len(entries)
+        for item_id in selected:
+            self._count_id(item_id)
+
+        hour = int(event.get("timestamp", 0) // 3600)
+        self.hourly[hour] = self.hourly.get(hour, 0) + 1
+        if len(self.hourly) > HOURLY_BUCKETS:
+            del self.hourly[min(self.hourly)]
+
+    def _count_id(self, item_id):
+        if item_id in self.top_ids or len(self.top_ids) < TOP_IDS_CAPACITY:
+            self.top_ids[item_id] = self.top_ids.get(item_id, 0) + 1
+            return
+        # Space-saving: the newcomer inherits the smallest count (+1), an upper bound
+        victim = min(self.top_ids, key=self.top_ids.get)
+        self.top_ids[item_id] = self.top_ids.pop(victim) + 1
+
+    def percentile(self, p):
+        """Upper bound of the histogram bucket holding the p-th percentile fragment size."""
+        count = sum(self.size_buckets.values())
+        if not count:
+            return 0
+        rank = math.ceil(count * p / 100)
+        seen = 0
+        for bucket in sorted(self.size_buckets):
+            seen += self.size_buckets[bucket]
+            if seen >= rank:
+                return _bucket_upper(bucket)
+        return _bucket_upper(max(self.size_buckets))
+
+def _size_bucket(size):
+    if size <= 0:
+        return 0
+    return int(math.log2(size) * SIZE_BUCKETS_PER_OCTAVE) + 1
+
+def _bucket_upper(bucket):
+    if bucket == 0:
+        return 0
+    return int(2 ** (bucket / SIZE_BUCKETS_PER_OCTAVE))
+
+def load_checkpoint(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_checkpoint(path, position, stats):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"position": position, "stats": stats.to_dict()}, f)
+    os.replace(tmp_path, path)
+
+def print_recent(entries):
     truncated_warns = 0
     empty_selections = 0
-    
-    print(f"Total Injections: {total_calls}")
-    print("-" * 50)
-    
-    # Show last 5 entries
-    for entry in entries[-5:]:
+
+    for entry in entries:
+        if "selected_ids" not in entry:
+            continue
         ts = datetime.fromtimestamp(entry.get('timestamp', 0)).strftime('%Y-%m-%d %H:%M:%S')
         context = entry.get('context', 'unknown')
         selection_count = len(entry.get('selected_ids', []))
         frag_len = entry.get('fragment_length', 0)
-        
+
         status = "✅"
         if selection_count == 0:
             status = "⚠️  (No skills)"
@@ -47,7 +133,7 @@ def main():
         elif frag_len == 0:
             status = "❌ (Empty fragment)"
             truncated_warns += 1
-            
+
         print(f"[{ts}] {status}")
         print(f"   Context: \"{context}\"")
         print(f"   Selected: {entry.get('selected_ids')}")
@@ -58,5 +144,75 @@ def main():
         print("-" * 50)
         print(f"WARNINGS: {empty_selections} empty selections, {truncated_warns} empty fragments")
 
+def print_history(stats, processed):
+    print("-" * 50)
+    print(f"History: {stats.total} selections ({processed} new events processed)")
+    lookups = stats.directive_cache["hit"] + stats.directive_cache["miss"]
+    if lookups:
+        print(f"   Directive cache: {stats.directive_cache['hit']} hits / {stats.directive_cache['miss']} misses ({stats.directive_cache['hit'] / lookups:.1%} hit rate)")
+    if not stats.total:
+        return
+    print(f"   Empty selections: {stats.empty_selections} ({stats.empty_selections / stats.total:.1%})")
+    print(f"   Empty fragments:  {stats.empty_fragments}")
+    print(f"   Fragment size p50/p95/p99: ~{stats.percentile(50)} / ~{stats.percentile(95)} / ~{stats.percentile(99)} chars")
+
+    top = sorted(stats.top_ids.items(), key=lambda x: (-x[1], x[0]))[:10]
+    if top:
+        print("   Top selected: " + ", ".join(f"{item_id} ({count})" for item_id, count in top))
+
+    if stats.hourly:
+        print("   Throughput (last 24h with events, per hour):")
+        for hour in sorted(stats.hourly)[-24:]:
+            label = datetime.fromtimestamp(hour * 3600).strftime('%Y-%m-%d %H:00')
+            print(f"      {label}  {stats.hourly[hour]}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze the GSD context-selection audit log.")
+    parser.add_argument("--last", type=int, default=5, help="Number of recent events to show (default: 5)")
+    parser.add_argument("--since", help="'checkpoint' to resume from the last run, or a byte offset into the active log")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_FILE, help=f"Checkpoint file (default: {CHECKPOINT_FILE})")
+    args = parser.parse_args()
+
+    segments = sealed_segments(LOG_FILE)
+    if not os.path.exists(LOG_FILE) and not segments:
+        print(f"No audit log found at {LOG_FILE}")
+        return
+
+    print(f"📊 Analyzing Context Logs: {LOG_FILE}\n")
+
+    position, stats = None, HistoryStats()
+    if args.since == "checkpoint":
+        checkpoint = load_checkpoint(args.checkpoint)
+        if checkpoint:
+            position, stats = checkpoint["position"], HistoryStats(checkpoint["stats"])
+    elif args.since is not None:
+        try:
+            position = {"first_ts": None, "offset": int(args.since)}
+        except ValueError:
+            parser.error("--since expects 'checkpoint' or a byte offset")
+
+    # Stream only what was appended after `position`; memory stays bounded
+    cursor = LogCursor(position, LOG_FILE)
+    processed = 0
+    for event in cursor:
+        stats.add(event)
+        processed += 1
+
+    # Only selections count towards --last; cache telemetry shares the stream
+    entries = tail_events(args.last, LOG_FILE, where=lambda event: "selected_ids" in event)
+    if not entries and not stats.total:
+        print("Log file is empty.")
+        return
+
+    print(f"Total Injections: {stats.total} ({len(segments)} sealed segments)")
+    print("-" * 50)
+    print_recent(entries)
+    print_history(stats, processed)
+
+    try:
+        save_checkpoint(args.checkpoint, cursor.position, stats)
+    except OSError as e:
+        print(f"Warn: could not save checkpoint {args.checkpoint}: {e}", file=sys.stderr)
+
 if __name__ == "__main__":
     main()
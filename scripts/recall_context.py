@@ -1,78 +1,161 @@
 #!/usr/bin/env python3
 import os
 import sys
-import subprocess
 import json
+import time
+import argparse
+import threading
 
 # Unified Context Recall Script
 # Aggregates:
 # 1. Architecture (Memory) - .gsd/ARCHITECTURE.md
-# 2. Skills/MCPs - scripts/gsd_select.py
-# 3. Library Intelligence - scripts/read_library_context.py
+# 2. Skills/MCPs - gsd_select.select()
+# 3. Library Intelligence - read_library_context.get_library_context()
+# Everything runs in this process; import recall() to skip the CLI entirely.
+# The three sources are independent and gathered concurrently.
 
-def print_banner(title):
-    print(f"\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-    print(f" 🧠 GSD CONTEXT: {title}")
-    print(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+ARCHITECTURE_FILE = ".gsd/ARCHITECTURE.md"
+
+# Seconds each source may take before recall() gives up on it
+SOURCE_TIMEOUTS = {
+    "architecture": 2.0,
+    "skills_mcps": 10.0,
+    "library_intelligence": 5.0,
+}
+
+def banner(title):
+    return (f"\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+            f" 🧠 GSD CONTEXT: {title}\n"
+            f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
 
 def recall_architecture():
-    arch_file = ".gsd/ARCHITECTURE.md"
-    if os.path.exists(arch_file):
-        with open(arch_file, 'r') as f:
+    if os.path.exists(ARCHITECTURE_FILE):
+        with open(ARCHITECTURE_FILE, 'r') as f:
             return f.read()
     return ""
 
-def recall_skills(args):
-    script = "scripts/gsd_select.py"
-    if os.path.exists(script):
-        cmd = [sys.executable, script] + args
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            return result.stdout
-        except Exception as e:
-            return f"Error executing skill selection: {e}"
-    return "Skill selection script not found."
+def recall_skills(context):
+    """The gsd_select result dict, or a string describing why there is none."""
+    try:
+        import gsd_select
+    except ImportError:
+        return "Skill selection script not found."
+    try:
+        return gsd_select.select(context)
+    except Exception as e:
+        return f"Error executing skill selection: {e}"
 
 def recall_libraries():
-    script = "scripts/read_library_context.py"
-    if os.path.exists(script):
-        try:
-            result = subprocess.run([sys.executable, script], capture_output=True, text=True)
-            return result.stdout
-        except Exception as e:
-            return f"Error reading library context: {e}"
-    return "Library intelligence script not found."
+    try:
+        from read_library_context import get_library_context
+    except ImportError:
+        return "Library intelligence script not found."
+    try:
+        return get_library_context() + "\n"
+    except Exception as e:
+        return f"Error reading library context: {e}"
+
+def _fallback(source, message):
+    """Partial-result placeholder for a source that timed out or failed."""
+    if source == "architecture":
+        # Same as a project without ARCHITECTURE.md; the status is in "sources"
+        return ""
+    if source == "skills_mcps":
+        return {"raw": f"Skill selection {message}"}
+    return f"Library intelligence {message}"
+
+def gather(sources, timeouts):
+    """
+    Runs each source callable on its own daemon thread and waits at most
+    timeouts[name] seconds (from the common start) for it. A source that is
+    late or raises does not hold up the others: it is reported with status
+    "timeout" or "error" and its result slot is left empty.
+    Returns ({name: value}, {name: {"status", "latency_ms"}}).
+    """
+    start = time.perf_counter()
+    running = {}
+    for name, fn in sources.items():
+        box = {}
+        def run(fn=fn, box=box):
+            try:
+                box["value"] = fn()
+            except Exception as e:
+                box["error"] = e
+            box["latency_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        # Daemon threads: a hung source must not keep the CLI alive at exit
+        thread = threading.Thread(target=run, name=f"recall-{name}", daemon=True)
+        thread.start()
+        running[name] = (thread, box)
+
+    values, report = {}, {}
+    for name, (thread, box) in running.items():
+        thread.join(max(0.0, start + timeouts[name] - time.perf_counter()))
+        if "latency_ms" not in box:
+            report[name] = {"status": "timeout", "latency_ms": round((time.perf_counter() - start) * 1000, 3)}
+        elif "error" in box:
+            values[name] = box["error"]
+            report[name] = {"status": "error", "latency_ms": box["latency_ms"]}
+        else:
+            values[name] = box["value"]
+            report[name] = {"status": "ok", "latency_ms": box["latency_ms"]}
+    return values, report
+
+def recall(context, timeouts=None):
+    """
+    Gathers all three context sources for `context` (an objective or task text)
+    concurrently, each bounded by its timeout (SOURCE_TIMEOUTS by default).
+    Returns {"architecture", "skills_mcps", "library_intelligence", "sources"};
+    "sources" holds each source's status and latency.
+    """
+    timeouts = dict(SOURCE_TIMEOUTS, **(timeouts or {}))
+    values, report = gather({
+        "architecture": recall_architecture,
+        "skills_mcps": lambda: recall_skills(context),
+        "library_intelligence": recall_libraries,
+    }, timeouts)
+
+    data = {}
+    for name in ("architecture", "skills_mcps", "library_intelligence"):
+        status = report[name]["status"]
+        if status == "timeout":
+            data[name] = _fallback(name, f"timed out: no result after {timeouts[name]:g}s")
+        elif status == "error":
+            data[name] = _fallback(name, f"failed: {values[name]}")
+        else:
+            data[name] = values[name]
+    if not isinstance(data["skills_mcps"], dict):
+        data["skills_mcps"] = {"raw": data["skills_mcps"]}
+    data["sources"] = report
+    return data
+
+def render_text(data):
+    """The banner-formatted report printed by the CLI (and embedded by dispatch_agent)."""
+    skills = data["skills_mcps"]
+    skills_output = skills["raw"] if set(skills) == {"raw"} else json.dumps(skills, indent=2) + "\n"
+    lines = []
+    for title, body in (
+        ("ARCHITECTURE (MEMORY)", data["architecture"] or "No architecture memory found."),
+        ("RELEVANT SKILLS & MCPS", skills_output),
+        ("LIBRARY INTELLIGENCE", data["library_intelligence"]),
+    ):
+        lines.append(banner(title))
+        lines.append(body)
+    return "\n".join(lines) + "\n"
 
 def main():
-    use_json = "--json" in sys.argv
-    clean_args = [a for a in sys.argv[1:] if a != "--json"]
-
-    arch = recall_architecture()
-    skills_output = recall_skills(clean_args)
-    libs = recall_libraries()
-
-    if use_json:
-        # Attempt to parse skills_output as it's usually JSON from gsd_select.py
-        try:
-            skills_data = json.loads(skills_output)
-        except:
-            skills_data = {"raw": skills_output}
-
-        data = {
-            "architecture": arch,
-            "skills_mcps": skills_data,
-            "library_intelligence": libs
-        }
+    parser = argparse.ArgumentParser(description="Recall architecture, skills/MCPs and library intelligence for a context.")
+    parser.add_argument("context", nargs="*", help="Objective or task text")
+    parser.add_argument("--json", action="store_true", help="Print the sources (with per-source status and latency) as JSON")
+    parser.add_argument("--timeout", type=float, help="Per-source timeout in seconds for every source (default: architecture 2s, skills 10s, libraries 5s)")
+    args, extra = parser.parse_known_args()
+
+    timeouts = {name: args.timeout for name in SOURCE_TIMEOUTS} if args.timeout is not None else None
+    data = recall(" ".join(args.context + extra), timeouts)
+
+    if args.json:
         print(json.dumps(data, indent=2))
     else:
-        print_banner("ARCHITECTURE (MEMORY)")
-        print(arch if arch else "No architecture memory found.")
-        
-        print_banner("RELEVANT SKILLS & MCPS")
-        print(skills_output)
-        
-        print_banner("LIBRARY INTELLIGENCE")
-        print(libs)
+        sys.stdout.write(render_text(data))
 
 if __name__ == "__main__":
     main()
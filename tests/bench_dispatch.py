@@ -0,0 +1,107 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+# End-to-end dispatch latency: the old one-interpreter-per-stage chain vs
+# the CLI vs the importable in-process API (directive cache off), plus a
+# directive-cache hit.
+#   python3 tests/bench_dispatch.py --sizes 100,1000 --out dispatch.json
+
+from bench_selection import SCRIPTS_DIR, SyntheticProject, git_revision, int_list, timed
+
+import gsd  # noqa: E402
+import gsd_select  # noqa: E402
+from gsd_registry import compile_registry, write_compiled_registry  # noqa: E402
+from gsd_snapshot import remove_snapshots  # noqa: E402
+
+def run_script(script, *args):
+    subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, script), *args],
+                   capture_output=True, text=True, check=True)
+
+def subprocess_chain(persona, objective):
+    # The pre-API layout: dispatch_agent and recall_context each started an
+    # interpreter, and recall_context ran gsd_select and read_library_context
+    # as two more. Interpreter start-up dominates, so the stages run in sequence.
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", "import json, subprocess"], check=True)
+    run_script("gsd_select.py", "--no-daemon", objective)
+    run_script("read_library_context.py")
+
+def bench_size(size, args, rng):
+    project = SyntheticProject(size, args.skill_bytes, args.skill_files, rng)
+    cwd = os.getcwd()
+    os.chdir(project.root)
+    try:
+        write_compiled_registry(compile_registry(gsd_select.SKILLS_INVENTORY, gsd_select.MCPS_INVENTORY))
+        gsd_select._shared_selectors.clear()
+        objective = project.text(args.objective_words)
+
+        def in_process(use_cache=False):
+            with contextlib.redirect_stderr(io.StringIO()):
+                gsd.dispatch(args.persona, objective, use_cache=use_cache)
+
+        # First call pays the registry load; later calls reuse the process-wide Selector
+        start = time.perf_counter()
+        in_process()
+        first_call = round((time.perf_counter() - start) * 1000, 4)
+
+        return {
+            "registry_size": size,
+            "dispatch_ms": {
+                "subprocess_chain": timed(lambda: subprocess_chain(args.persona, objective), args.repeat),
+                "cli": timed(lambda: run_script("dispatch_agent.py", "--no-cache", args.persona, objective), args.repeat),
+                "in_process_first": first_call,
+                "in_process": timed(in_process, args.repeat),
+                "in_process_cache_hit": timed(lambda: in_process(use_cache=True), args.repeat),
+            },
+        }
+    finally:
+        os.chdir(cwd)
+        # Dispatch publishes the registry snapshot outside the project (see gsd_snapshot)
+        remove_snapshots(project.root)
+        project.cleanup()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark subprocess vs in-process agent dispatch.")
+    parser.add_argument("--sizes", type=int_list, default=[100, 1000, 10000], help="Registry sizes (default: 100,1000,10000)")
+    parser.add_argument("--objective-words", type=int, default=12, help="Words in the dispatch objective (default: 12)")
+    parser.add_argument("--persona", default="auto")
+    parser.add_argument("--skill-bytes", type=int, default=4096, help="Size of each generated SKILL.md (default: 4096)")
+    parser.add_argument("--skill-files", type=int, default=200, help="Distinct SKILL.md files backing the registry (default: 200)")
+    parser.add_argument("--repeat", type=int, default=10, help="Samples per measurement (default: 10)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="Write JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    report = {
+        "meta": {
+            "commit": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+            "args": {k: v for k, v in vars(args).items() if k != "out"},
+        },
+        "results": [],
+    }
+    for size in args.sizes:
+        print(f"Benchmarking dispatch over {size} items...", file=sys.stderr)
+        report["results"].append(bench_size(size, args, rng))
+
+    payload = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+        print(f"Results written to {args.out}", file=sys.stderr)
+    else:
+        print(payload)
+
+if __name__ == '__main__':
+    main()
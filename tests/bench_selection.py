@@ -0,0 +1,196 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Reproducible selection benchmark over synthetic registries.
+#   python3 tests/bench_selection.py --sizes 100,1000 --out bench.json
+# Compare the JSON across commits to catch scaling regressions in
+# registry loading, scoring and extraction.
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS_DIR = os.path.join(REPO_ROOT, "scripts")
+sys.path.insert(0, SCRIPTS_DIR)
+
+import gsd_select  # noqa: E402
+from gsd_index import RegistryIndex  # noqa: E402
+from gsd_registry import compile_registry, extract_registry, read_compiled_registry, write_compiled_registry, inventory_stamp  # noqa: E402
+from gsd_snapshot import attach_snapshot, publish_snapshot  # noqa: E402
+from gsd_sync import update_inventory  # noqa: E402
+
+VOCABULARY_SIZE = 5000
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    def rank(p):
+        return ordered[min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))]
+    return {"p50": round(rank(50), 4), "p95": round(rank(95), 4), "p99": round(rank(99), 4), "n": len(ordered)}
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return percentiles(samples)
+
+def peak_memory(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+class SyntheticProject:
+    """
+    A temporary project whose SKILLS.md holds `size` items. Item paths point
+    into a pool of `skill_files` real SKILL.md files of `skill_bytes` each,
+    so 100k-item registries do not need 100k files on disk.
+    """
+    def __init__(self, size, skill_bytes, skill_files, rng):
+        self.root = tempfile.mkdtemp(prefix=f"gsd-bench-{size}-")
+        self.words = [f"w{i:04d}" for i in range(VOCABULARY_SIZE)]
+        self.rng = rng
+        os.makedirs(os.path.join(self.root, ".gsd"))
+        for name in ("skills.md", "mcps.md"):
+            shutil.copy(os.path.join(REPO_ROOT, ".gsd", "templates", name),
+                        os.path.join(self.root, ".gsd", name.upper().replace(".MD", ".md")))
+
+        pool = []
+        for i in range(min(skill_files, size)):
+            rel = os.path.join(".agent", "skills", f"pool-{i:05d}", "SKILL.md")
+            os.makedirs(os.path.dirname(os.path.join(self.root, rel)))
+            body = self.text(skill_bytes // 6)
+            with open(os.path.join(self.root, rel), "w", encoding="utf-8") as f:
+                f.write(f"---\nname: pool-{i:05d}\ndescription: {self.text(12)}\n---\n\n## Purpose\n{body}\n")
+            pool.append(rel)
+
+        self.items = [{
+            "id": f"skill-{i:06d}",
+            "name": f"{self.word()}-{self.word()}-{i}",
+            "path": pool[i % len(pool)],
+            "description": self.text(12),
+            "confidence": 1.0,
+        } for i in range(size)]
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            update_inventory(os.path.join(self.root, ".gsd", "SKILLS.md"), "skills", self.items)
+
+    def word(self):
+        # Zipf-like skew: a few words are common, most are rare
+        return self.words[min(int(self.rng.paretovariate(1.1)) - 1, VOCABULARY_SIZE - 1)]
+
+    def text(self, words):
+        return " ".join(self.word() for _ in range(words))
+
+    def cleanup(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+def bench_size(size, args, rng):
+    project = SyntheticProject(size, args.skill_bytes, args.skill_files, rng)
+    snapshot_dir = os.path.join(project.root, ".gsd", ".cache", "shm")
+    cwd = os.getcwd()
+    os.chdir(project.root)
+    try:
+        skills_md, mcps_md = gsd_select.SKILLS_INVENTORY, gsd_select.MCPS_INVENTORY
+        compiled = compile_registry(skills_md, mcps_md)
+        write_compiled_registry(compiled)
+        publish_snapshot(compiled, snapshot_dir)
+        del compiled
+        stamp = inventory_stamp((skills_md, mcps_md))
+
+        def parse_load():
+            RegistryIndex(extract_registry(skills_md) + extract_registry(mcps_md))
+
+        result = {
+            "registry_size": size,
+            "load_ms": {
+                "parse": timed(parse_load, args.repeat),
+                "sidecar": timed(lambda: read_compiled_registry(skills_md, mcps_md, stamp), args.repeat),
+                "snapshot": timed(lambda: attach_snapshot(skills_md, mcps_md, stamp, snapshot_dir), args.repeat),
+            },
+            "score_ms": {},
+            "extract_ms": {},
+            "peak_memory_bytes": {
+                "parse": peak_memory(parse_load),
+                "sidecar": peak_memory(lambda: read_compiled_registry(skills_md, mcps_md, stamp)),
+                "snapshot": peak_memory(lambda: attach_snapshot(skills_md, mcps_md, stamp, snapshot_dir)),
+            },
+        }
+
+        compiled = read_compiled_registry(skills_md, mcps_md, stamp)
+        index = compiled["index"]
+        for words in args.context_words:
+            contexts = [project.text(words) for _ in range(args.repeat)]
+            it = iter(contexts)
+            result["score_ms"][str(words)] = timed(lambda: gsd_select.score_items(index, next(it)), args.repeat)
+            result["peak_memory_bytes"][f"score_{words}"] = peak_memory(lambda: gsd_select.score_items(index, contexts[0]))
+
+            top = [item for _, item in gsd_select.score_items(index, contexts[0])[:3]]
+            if top:
+                def extract():
+                    # A fresh Selector per run: cold body cache, as in a one-shot CLI call
+                    selector = gsd_select.Selector()
+                    for item in top:
+                        selector.extract(item)
+                result["extract_ms"][str(words)] = timed(extract, args.repeat)
+        return result
+    finally:
+        os.chdir(cwd)
+        project.cleanup()
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def int_list(value):
+    return [int(v) for v in value.split(",") if v]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark gsd_select against synthetic registries.")
+    parser.add_argument("--sizes", type=int_list, default=[100, 1000, 10000, 100000], help="Registry sizes (default: 100,1000,10000,100000)")
+    parser.add_argument("--context-words", type=int_list, default=[10, 1000, 10000], help="Context lengths in words (default: 10,1000,10000)")
+    parser.add_argument("--skill-bytes", type=int, default=4096, help="Size of each generated SKILL.md (default: 4096)")
+    parser.add_argument("--skill-files", type=int, default=1000, help="Distinct SKILL.md files backing the registry (default: 1000)")
+    parser.add_argument("--repeat", type=int, default=20, help="Samples per measurement (default: 20)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="Write JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    report = {
+        "meta": {
+            "commit": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+            "args": {k: v for k, v in vars(args).items() if k != "out"},
+        },
+        "results": [],
+    }
+    for size in args.sizes:
+        print(f"Benchmarking registry of {size} items...", file=sys.stderr)
+        report["results"].append(bench_size(size, args, rng))
+
+    payload = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+        print(f"Results written to {args.out}", file=sys.stderr)
+    else:
+        print(payload)
+
+if __name__ == '__main__':
+    main()
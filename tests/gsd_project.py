@@ -0,0 +1,95 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+# Throwaway GSD project for tests that must not depend on the local .agent/ tree.
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS_DIR = os.path.join(REPO_ROOT, "scripts")
+TEMPLATES_DIR = os.path.join(REPO_ROOT, ".gsd", "templates")
+
+SAMPLE_SKILLS = {
+    "tdd-workflow": (
+        "tdd-workflow",
+        "TDD workflow for writing tests before code",
+        "## Purpose\nDrive every change through the RED-GREEN-REFACTOR cycle.\n\n"
+        "## When to Use\nWhen adding features or fixing regressions with tests.\n\n"
+        "## Behavior Rules\n- Write the failing test first.\n- Refactor only on green.\n",
+    ),
+    "systematic-debugging": (
+        "systematic-debugging",
+        "Structured debugging of failures, crashes and production bugs",
+        "## Purpose\nFind root causes instead of patching symptoms.\n\n"
+        "## When to Use\nWhen a bug, crash or failing test needs a fix.\n\n"
+        "## Behavior Rules\n- Reproduce before fixing.\n- One hypothesis at a time.\n",
+    ),
+    "codebase-mapper": (
+        "codebase-mapper",
+        "Analyze repository structure and dependencies",
+        "## Purpose\nProduce ARCHITECTURE.md and STACK.md for an existing codebase.\n\n"
+        "## When to Use\nWhen onboarding onto an unfamiliar repository.\n",
+    ),
+    "python-patterns": (
+        "python-patterns",
+        "Idiomatic Python coding patterns and packaging",
+        "## Purpose\nWrite idiomatic, typed Python.\n\n"
+        "## When to Use\nWhen writing or reviewing Python modules.\n",
+    ),
+    "react-patterns": (
+        "react-patterns",
+        "React component and frontend state patterns",
+        "## Purpose\nCompose React components with predictable state.\n\n"
+        "## When to Use\nWhen building frontend components.\n",
+    ),
+}
+
+
+def skill_markdown(name, description, body):
+    return f"---\nname: {name}\ndescription: {description}\n---\n\n# {name}\n\n{body}"
+
+
+class GsdProject:
+    """A temporary project root with seeded inventories and `.agent/skills/`."""
+
+    def __init__(self, skills=SAMPLE_SKILLS):
+        self.root = tempfile.mkdtemp(prefix="gsd-test-")
+        os.makedirs(os.path.join(self.root, ".gsd", "logs"))
+        shutil.copy(os.path.join(TEMPLATES_DIR, "skills.md"), os.path.join(self.root, ".gsd", "SKILLS.md"))
+        shutil.copy(os.path.join(TEMPLATES_DIR, "mcps.md"), os.path.join(self.root, ".gsd", "MCPS.md"))
+        for skill_id, (name, description, body) in skills.items():
+            self.write_skill(skill_id, name, description, body)
+
+    def path(self, *parts):
+        return os.path.join(self.root, *parts)
+
+    def write_skill(self, skill_id, name, description, body):
+        skill_dir = self.path(".agent", "skills", skill_id)
+        os.makedirs(skill_dir, exist_ok=True)
+        with open(os.path.join(skill_dir, "SKILL.md"), "w", encoding="utf-8") as f:
+            f.write(skill_markdown(name, description, body))
+
+    def run(self, script, *args, input=None, check=True):
+        env = dict(os.environ, HOME=self.root)
+        result = subprocess.run(
+            [sys.executable, os.path.join(SCRIPTS_DIR, script), *args],
+            cwd=self.root,
+            env=env,
+            input=input,
+            capture_output=True,
+            text=True,
+        )
+        if check and result.returncode != 0:
+            raise AssertionError(f"{script} {args} failed:\n{result.stdout}\n{result.stderr}")
+        return result
+
+    def sync(self, *args):
+        return self.run("gsd_sync.py", *args)
+
+    def cleanup(self):
+        # Published registry snapshots live outside the project (see gsd_snapshot)
+        sys.path.insert(0, SCRIPTS_DIR)
+        from gsd_snapshot import remove_snapshots
+        remove_snapshots(self.root)
+        shutil.rmtree(self.root, ignore_errors=True)
@@ -0,0 +1,87 @@
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+from gsd_project import SCRIPTS_DIR
+
+sys.path.insert(0, SCRIPTS_DIR)
+from gsd_audit import DURABILITY_MODES, AuditLogger  # noqa: E402
+
+WORKERS = 4
+EVENTS_PER_WORKER = 50
+
+
+def write_events(log_path, durability, worker_id):
+    logger = AuditLogger(log_path, durability=durability, batch_events=8)
+    for i in range(EVENTS_PER_WORKER):
+        logger.log({"worker": worker_id, "iter": i, "payload": "X" * 2048})
+    logger.close()
+
+
+class TestAuditDurability(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="gsd-audit-")
+        self.log_path = os.path.join(self.tmp, "logs", "audit.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def read_log(self):
+        with open(self.log_path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_concurrent_writers_keep_lines_intact(self):
+        for durability in DURABILITY_MODES:
+            with self.subTest(durability=durability):
+                if os.path.exists(self.log_path):
+                    os.remove(self.log_path)
+                processes = [multiprocessing.Process(target=write_events, args=(self.log_path, durability, w))
+                             for w in range(WORKERS)]
+                for p in processes:
+                    p.start()
+                for p in processes:
+                    p.join()
+
+                events = self.read_log()
+                self.assertEqual(len(events), WORKERS * EVENTS_PER_WORKER)
+                for w in range(WORKERS):
+                    iters = [e["iter"] for e in events if e["worker"] == w]
+                    self.assertEqual(iters, list(range(EVENTS_PER_WORKER)))
+                self.assertTrue(all(e["audit"]["durability"] == durability for e in events))
+
+    def test_batched_groups_commits(self):
+        logger = AuditLogger(self.log_path, durability="batched", batch_events=10, batch_interval_ms=60000)
+        for i in range(25):
+            logger.log({"iter": i})
+        self.assertEqual(logger.stats["commits"], 2)
+        logger.close()
+        self.assertEqual(logger.stats["commits"], 3)
+        self.assertEqual(len(self.read_log()), 25)
+
+    def test_batched_interval_flushes_idle_tail(self):
+        logger = AuditLogger(self.log_path, durability="batched", batch_events=100, batch_interval_ms=20)
+        logger.log({"iter": 0})
+        deadline = time.time() + 5
+        while logger.stats["commits"] == 0:
+            self.assertLess(time.time(), deadline, "Timer never committed the pending event")
+            time.sleep(0.01)
+        self.assertEqual(len(self.read_log()), 1)
+
+    def test_async_skips_fsync(self):
+        logger = AuditLogger(self.log_path, durability="async")
+        logger.log({"iter": 0})
+        self.assertEqual(logger.stats["fsync_ms"], 0.0)
+        self.assertIsNone(self.read_log()[0]["audit"]["prev_fsync_ms"])
+
+    def test_unknown_mode_rejected(self):
+        with self.assertRaises(ValueError):
+            AuditLogger(self.log_path, durability="eventually")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import gzip
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from gsd_project import SCRIPTS_DIR
+
+sys.path.insert(0, SCRIPTS_DIR)
+import gsd_audit  # noqa: E402
+from gsd_audit import (AuditLogger, LogCursor, compact_pending, count_events, iter_events, read_segment_index,  # noqa: E402
+                       segment_dir, segment_prefix, tail_events)
+
+
+class TestAuditSegments(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="gsd-segments-")
+        self.log_path = os.path.join(self.tmp, "logs", "audit.jsonl")
+        self.base = round(time.time())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def write(self, count, start=None, **logger_args):
+        logger = AuditLogger(self.log_path, durability="async", **logger_args)
+        start = self.base if start is None else start
+        for i in range(count):
+            logger.log({"timestamp": start + i, "iter": i, "payload": "X" * 100})
+        logger.close()
+        logger.join_compaction()
+
+    def seal_by_hand(self, events, start):
+        """A sealed segment as left by a process that died before compacting it."""
+        os.makedirs(segment_dir(self.log_path), exist_ok=True)
+        path = os.path.join(segment_dir(self.log_path), f"{segment_prefix(start)}1.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for i in events:
+                f.write(json.dumps({"timestamp": start + i, "iter": i}) + "\n")
+        return path
+
+    def test_size_rotation_seals_and_compresses(self):
+        with mock.patch.object(gsd_audit, "SPARSE_INDEX_EVERY", 4):
+            self.write(100, segment_max_bytes=2048)
+
+        segments = read_segment_index(self.log_path)
+        self.assertGreater(len(segments), 1)
+        self.assertEqual(sorted(os.listdir(segment_dir(self.log_path))),
+                         sorted([s["file"] for s in segments] + ["index.json", "index.json.lock"]))
+
+        first = segments[0]
+        with gzip.open(os.path.join(segment_dir(self.log_path), first["file"])) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), first["events"])
+        self.assertEqual(json.loads(lines[0])["timestamp"], first["first_ts"])
+        self.assertEqual(len(first["sparse"]), (first["events"] + 3) // 4)
+
+        self.assertEqual(count_events(self.log_path), 100)
+        self.assertEqual([e["iter"] for e in iter_events(self.log_path)], list(range(100)))
+
+    def test_time_range_reads(self):
+        with mock.patch.object(gsd_audit, "SPARSE_INDEX_EVERY", 4):
+            self.write(100, segment_max_bytes=2048)
+
+        events = list(iter_events(self.log_path, since=self.base + 40, until=self.base + 60))
+        self.assertEqual([e["iter"] for e in events], list(range(40, 61)))
+
+        # Segments entirely before `since` are never opened
+        opened = []
+        real_open = gzip.open
+        with mock.patch.object(gzip, "open", side_effect=lambda p, *a, **k: opened.append(p) or real_open(p, *a, **k)):
+            list(iter_events(self.log_path, since=self.base + 95))
+        self.assertLessEqual(len(opened), 1)
+
+    def test_since_keeps_ties_and_out_of_order_events(self):
+        # Runs of equal timestamps, and late commits carrying older ones
+        stamps = [self.base + (i // 6) * 2 + (3 if i % 7 == 3 else 0) for i in range(100)]
+        logger = AuditLogger(self.log_path, durability="async", segment_max_bytes=1 << 20)
+        with mock.patch.object(gsd_audit, "SPARSE_INDEX_EVERY", 4):
+            for i, ts in enumerate(stamps):
+                logger.log({"timestamp": ts, "iter": i})
+            logger.close()
+            sealed = gsd_audit._seal_active(self.log_path, stamps[0])
+            compact_pending(self.log_path)
+        self.assertFalse(os.path.exists(sealed))
+
+        for since in sorted(set(stamps)):
+            expected = [i for i, ts in enumerate(stamps) if ts >= since]
+            self.assertEqual([e["iter"] for e in iter_events(self.log_path, since=since)], expected, since)
+
+    def test_tail_spans_segments(self):
+        self.write(100, segment_max_bytes=2048)
+        self.assertEqual([e["iter"] for e in tail_events(5, self.log_path)], [95, 96, 97, 98, 99])
+        self.assertEqual([e["iter"] for e in tail_events(60, self.log_path)], list(range(40, 100)))
+
+    def test_tail_counts_only_matching_events(self):
+        self.write(100, segment_max_bytes=2048)
+        odd = tail_events(30, self.log_path, where=lambda e: e["iter"] % 2)
+        self.assertEqual([e["iter"] for e in odd], list(range(41, 100, 2)))
+        self.assertEqual(tail_events(5, self.log_path, where=lambda e: False), [])
+
+    def test_rotation_compacts_off_the_logging_thread(self):
+        threads = []
+        real_compact = gsd_audit.compact_segment
+        def compact(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return real_compact(*args, **kwargs)
+        with mock.patch.object(gsd_audit, "compact_segment", side_effect=compact):
+            self.write(100, segment_max_bytes=2048)
+        self.assertTrue(threads)
+        self.assertNotIn(threading.main_thread(), threads)
+        self.assertEqual([e["iter"] for e in iter_events(self.log_path)], list(range(100)))
+
+    def test_uncompacted_segments_are_read_and_recovered(self):
+        self.write(10, start=self.base + 100, segment_max_bytes=2048)
+        self.write(3, start=self.base + 200, segment_max_bytes=1 << 20)
+        sealed = self.seal_by_hand(range(5), self.base)
+
+        expected = [0, 1, 2, 3, 4] + list(range(10)) + [0, 1, 2]
+        self.assertEqual([e["iter"] for e in iter_events(self.log_path)], expected)
+        self.assertEqual([e["iter"] for e in LogCursor(None, self.log_path)], expected)
+        self.assertEqual([e["iter"] for e in tail_events(15, self.log_path)], expected[-15:])
+        self.assertEqual(count_events(self.log_path), 18)
+
+        # Opening a logger sweeps it into the index
+        logger = AuditLogger(self.log_path, durability="async")
+        logger.join_compaction()
+        self.assertFalse(os.path.exists(sealed))
+        self.assertTrue(read_segment_index(self.log_path)[0]["file"].startswith(segment_prefix(self.base)))
+        self.assertEqual([e["iter"] for e in iter_events(self.log_path)], expected)
+
+    def test_leftover_input_of_finished_compaction_is_not_double_counted(self):
+        sealed = self.seal_by_hand(range(5), self.base)
+        self.assertEqual(compact_pending(self.log_path), 1)
+        with open(sealed, "w", encoding="utf-8") as f:
+            for i in range(5):
+                f.write(json.dumps({"timestamp": self.base + i, "iter": i}) + "\n")
+
+        self.assertEqual(count_events(self.log_path), 5)
+        self.assertEqual(compact_pending(self.log_path), 0)
+        self.assertFalse(os.path.exists(sealed))
+
+    def test_cursor_from_empty_log_follows_rotation(self):
+        cursor = LogCursor(None, self.log_path)
+        self.assertEqual(list(cursor), [])
+        self.assertIsNotNone(cursor.position["first_ts"])
+
+        # Written and sealed before the next read
+        self.write(5, start=self.base + 10, segment_max_bytes=1 << 20)
+        gsd_audit._seal_active(self.log_path, self.base + 10)
+        self.write(3, start=self.base + 20, segment_max_bytes=1 << 20)
+
+        cursor = LogCursor(json.loads(json.dumps(cursor.position)), self.log_path)
+        self.assertEqual([e["iter"] for e in cursor], [0, 1, 2, 3, 4, 0, 1, 2])
+        self.assertEqual(list(LogCursor(cursor.position, self.log_path)), [])
+
+    def test_age_rotation(self):
+        self.write(1, start=self.base - 120, segment_max_age_s=60)
+        self.write(2, segment_max_age_s=60)
+        self.assertEqual(len(read_segment_index(self.log_path)), 1)
+        self.assertEqual(count_events(self.log_path), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
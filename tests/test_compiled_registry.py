@@ -0,0 +1,73 @@
+import json
+import os
+import sys
+import unittest
+
+from gsd_project import GsdProject, SCRIPTS_DIR
+
+sys.path.insert(0, SCRIPTS_DIR)
+from gsd_registry import compile_registry, inventory_stamp, read_compiled_registry  # noqa: E402
+
+SIDECAR = os.path.join(".gsd", ".cache", "registry.json")
+
+
+class TestCompiledRegistry(unittest.TestCase):
+    def setUp(self):
+        self.project = GsdProject()
+        self.project.sync()
+
+    def tearDown(self):
+        self.project.cleanup()
+
+    def load_sidecar(self):
+        with open(self.project.path(SIDECAR), encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_sync_emits_sidecar(self):
+        compiled = self.load_sidecar()
+        ids = [item["id"] for item in compiled["skills"]]
+        self.assertIn("tdd-workflow", ids)
+
+        item = compiled["skills"][ids.index("tdd-workflow")]
+        self.assertEqual(item["name_lc"], "tdd-workflow")
+        self.assertIn("workflow", item["tokens"])
+        self.assertEqual(len(item["sha256"]), 64)
+
+    def test_stale_sidecar_is_ignored(self):
+        # Hand-edit the inventory after sync: the sidecar stamp no longer matches
+        skills_md = self.project.path(".gsd", "SKILLS.md")
+        with open(skills_md, encoding="utf-8") as f:
+            content = f.read()
+        with open(skills_md, "w", encoding="utf-8") as f:
+            f.write(content.replace("<name>react-patterns</name>", "<name>vue-patterns</name>"))
+
+        result = json.loads(self.project.run("gsd_select.py", "--no-daemon", "vue-patterns").stdout)
+        self.assertEqual(result["results"][0]["id"], "react-patterns")
+
+        # The fallback parse refreshed the sidecar for the next caller
+        compiled = self.load_sidecar()
+        names = [item["name"] for item in compiled["skills"]]
+        self.assertIn("vue-patterns", names)
+
+    def test_sidecar_round_trips(self):
+        cwd = os.getcwd()
+        os.chdir(self.project.root)
+        self.addCleanup(os.chdir, cwd)
+        sources = (".gsd/SKILLS.md", ".gsd/MCPS.md")
+
+        compiled = compile_registry(*sources)
+        loaded = read_compiled_registry(*sources, inventory_stamp(sources))
+        self.assertIsNotNone(loaded)
+        self.assertEqual(loaded["stamp"], compiled["stamp"])
+        self.assertEqual(loaded["skills"], compiled["skills"])
+        self.assertEqual(loaded["index"].bm25(["tdd", "workflow"]), compiled["index"].bm25(["tdd", "workflow"]))
+
+    def test_categorize_skills_emits_sidecar(self):
+        os.remove(self.project.path(SIDECAR))
+        self.project.run("categorize_skills.py")
+        ids = [item["id"] for item in self.load_sidecar()["skills"]]
+        self.assertIn("python-patterns", ids)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,10 @@ import os
 import subprocess
 import time
 import shutil
+import sys
+
+sys.path.insert(0, "scripts")
+from gsd_audit import resolve_fragments
 
 LOG_PATH = ".gsd/logs/audit.jsonl"
 
@@ -63,7 +67,8 @@ class TestContextIntegrity(unittest.TestCase):
         selected_ids = found_entry.get("selected_ids", [])
         self.assertIn("tdd-workflow", selected_ids, "Expected skill 'tdd-workflow' not selected")
         
-        full_fragment = found_entry.get("full_fragment", [])
+        # Fragments are logged by sha256 reference; resolve them from the blob store
+        full_fragment = resolve_fragments(found_entry)
         self.assertTrue(len(full_fragment) > 0, "Prompt fragment is empty")
         
         # Check specific content we know is in tdd-workflow skill
@@ -0,0 +1,131 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+from gsd_project import GsdProject, SCRIPTS_DIR
+
+sys.path.insert(0, SCRIPTS_DIR)
+
+import gsd_directive_cache  # noqa: E402
+
+OBJECTIVE = "write tests first with a tdd workflow"
+
+
+class TestDirectiveCache(unittest.TestCase):
+    def setUp(self):
+        self.project = GsdProject()
+        self.project.sync()
+
+    def tearDown(self):
+        self.project.cleanup()
+
+    def dispatch(self, *args):
+        return self.project.run("dispatch_agent.py", "auto", OBJECTIVE, *args).stdout
+
+    def cache_results(self):
+        with open(self.project.path(".gsd", "logs", "audit.jsonl"), encoding="utf-8") as f:
+            events = [json.loads(line) for line in f if line.strip()]
+        return [(e["result"], e["reason"]) for e in events if e.get("event") == "directive_cache"]
+
+    def test_hit_and_invalidation(self):
+        first = self.dispatch()
+        self.assertEqual(self.dispatch(), first)
+        self.assertEqual(self.cache_results(), [("miss", "absent"), ("hit", "hit")])
+
+        # Editing a selected skill's body invalidates the entry, even without a resync
+        self.project.write_skill("tdd-workflow", "tdd-workflow", "TDD workflow for writing tests before code",
+                                 "## Purpose\nAlways start from a failing test (RED-GREEN-REFACTOR, revised).\n")
+        third = self.dispatch()
+        self.assertIn("revised", third)
+        self.assertEqual(self.cache_results()[-1], ("miss", "stale"))
+
+        # So does hydrating a persona that was previously missing
+        os.makedirs(self.project.path(".agent", "personas"))
+        with open(self.project.path(".agent", "personas", "implementer.md"), "w", encoding="utf-8") as f:
+            f.write("# Implementer\nShip small commits.\n")
+        self.assertIn("Ship small commits.", self.dispatch())
+        self.assertEqual(self.cache_results()[-1], ("miss", "stale"))
+
+        output = self.project.run("gsd_verify_context.py").stdout
+        self.assertIn("Directive cache: 1 hits / 3 misses (25.0% hit rate)", output)
+
+    def test_cache_hits_do_not_crowd_out_recent_selections(self):
+        for _ in range(3):
+            self.dispatch()
+        output = self.project.run("gsd_verify_context.py", "--last", "1").stdout
+        self.assertIn(OBJECTIVE, output)
+
+    def test_no_cache_bypasses_lookup(self):
+        self.dispatch("--no-cache")
+        self.dispatch("--no-cache")
+        self.assertEqual(self.cache_results(), [])
+
+
+class TestDirectiveCacheConsistency(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="gsd-inputs-")
+        self.static = os.path.join(self.tmp, "SKILLS.md")
+        self.skill = os.path.join(self.tmp, "SKILL.md")
+        for path in (self.static, self.skill):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("v1")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def edit(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("v2, edited mid-build")
+
+    def test_unchanged_inputs_are_consistent(self):
+        before = gsd_directive_cache.capture([self.static])
+        started_ns = time.time_ns()
+        inputs = gsd_directive_cache.capture([self.static, self.skill], known=before)
+        self.assertTrue(gsd_directive_cache.consistent(inputs, before, started_ns))
+
+    def test_edit_during_build_is_not_cached(self):
+        before = gsd_directive_cache.capture([self.static])
+        started_ns = time.time_ns()
+        self.edit(self.static)
+        inputs = gsd_directive_cache.capture([self.static, self.skill], known=before)
+        self.assertFalse(gsd_directive_cache.consistent(inputs, before, started_ns))
+
+        before = gsd_directive_cache.capture([self.static])
+        started_ns = time.time_ns()
+        self.edit(self.skill)
+        inputs = gsd_directive_cache.capture([self.static, self.skill], known=before)
+        self.assertFalse(gsd_directive_cache.consistent(inputs, before, started_ns))
+
+
+class TestDirectiveCacheEviction(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp(prefix="gsd-directives-")
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def store(self, objective, max_bytes):
+        gsd_directive_cache.store("auto", objective, "x" * 400, {}, cache_dir=self.cache_dir, max_bytes=max_bytes)
+
+    def lookup(self, objective):
+        return gsd_directive_cache.lookup("auto", objective, cache_dir=self.cache_dir)[1]
+
+    def test_least_recently_used_entry_is_evicted(self):
+        for objective in ("a", "b", "c"):
+            self.store(objective, max_bytes=10000)
+            time.sleep(0.01)
+        self.assertEqual(self.lookup("a"), "hit")
+        time.sleep(0.01)
+
+        # Room for three entries: adding a fourth drops "b", the least recently used
+        size = os.path.getsize(os.path.join(self.cache_dir, os.listdir(self.cache_dir)[0]))
+        self.store("d", max_bytes=size * 3 + 10)
+        self.assertEqual([self.lookup(o) for o in ("a", "b", "c", "d")], ["hit", "absent", "hit", "hit"])
+
+
+if __name__ == '__main__':
+    unittest.main()
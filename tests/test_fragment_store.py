@@ -0,0 +1,68 @@
+import json
+import os
+import sys
+import unittest
+
+from gsd_project import GsdProject, SCRIPTS_DIR
+
+sys.path.insert(0, SCRIPTS_DIR)
+from gsd_audit import load_blob, resolve_fragments, store_blob  # noqa: E402
+
+
+class TestFragmentStore(unittest.TestCase):
+    def setUp(self):
+        self.project = GsdProject()
+        self.project.sync()
+
+    def tearDown(self):
+        self.project.cleanup()
+
+    def test_fragments_stored_once_and_resolvable(self):
+        for _ in range(3):
+            self.project.run("gsd_select.py", "--no-daemon", "tdd workflow")
+
+        with open(self.project.path(".gsd", "logs", "audit.jsonl")) as f:
+            events = [json.loads(line) for line in f]
+        self.assertEqual(len(events), 3)
+        self.assertTrue(all("full_fragment" not in e for e in events))
+
+        hashes = {ref["sha256"] for e in events for ref in e["fragments"]}
+        blob_dir = self.project.path(".gsd", "logs", "blobs")
+        self.assertEqual(sorted(os.listdir(blob_dir)), sorted(hashes))
+
+        fragments = resolve_fragments(events[0], blob_dir)
+        with open(self.project.path(".agent", "skills", "tdd-workflow", "SKILL.md"), encoding="utf-8") as f:
+            self.assertEqual(fragments[0], f.read())
+        self.assertEqual(len("\n\n".join(fragments)), events[0]["fragment_length"])
+        self.assertEqual([ref["length"] for ref in events[0]["fragments"]], [len(x) for x in fragments])
+
+    def test_unwritable_blob_dir_keeps_fragments_inline(self):
+        blob_dir = self.project.path(".gsd", "logs", "blobs")
+        os.makedirs(os.path.dirname(blob_dir), exist_ok=True)
+        with open(blob_dir, "w") as f:
+            f.write("not a directory")
+
+        result = self.project.run("gsd_select.py", "--no-daemon", "tdd workflow")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("tdd-workflow", result.stdout)
+
+        with open(self.project.path(".gsd", "logs", "audit.jsonl")) as f:
+            events = [json.loads(line) for line in f]
+        self.assertEqual(len(events), 1)
+        self.assertNotIn("fragments", events[0])
+        self.assertEqual(len("\n\n".join(resolve_fragments(events[0]))), events[0]["fragment_length"])
+
+    def test_deleted_blob_is_rewritten_by_the_same_process(self):
+        blob_dir = self.project.path(".gsd", "logs", "blobs")
+        ref = store_blob("fragment text", blob_dir, durable=False)
+        os.remove(os.path.join(blob_dir, ref["sha256"]))
+
+        self.assertEqual(store_blob("fragment text", blob_dir, durable=False), ref)
+        self.assertEqual(load_blob(ref, blob_dir), "fragment text")
+
+    def test_inline_fragments_still_resolve(self):
+        self.assertEqual(resolve_fragments({"full_fragment": ["a", "b"]}), ["a", "b"])
+
+
+if __name__ == '__main__':
+    unittest.main()
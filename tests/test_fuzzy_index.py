@@ -0,0 +1,64 @@
+import random
+import sys
+import unittest
+
+from gsd_project import SCRIPTS_DIR
+from test_select_scoring import make_item, registry
+
+sys.path.insert(0, SCRIPTS_DIR)
+import gsd_select  # noqa: E402
+from gsd_index import RegistryIndex, trigrams  # noqa: E402
+from gsd_select import score_items  # noqa: E402
+
+
+def brute_force(index, token, threshold, limit=3):
+    grams = trigrams(token)
+    matches = []
+    for term in index.terms:
+        other = trigrams(term)
+        similarity = 2 * len(grams & other) / (len(grams) + len(other))
+        if similarity >= threshold and term != token:
+            matches.append((similarity, term))
+    matches.sort(key=lambda x: (-x[0], x[1]))
+    return [(term, similarity) for similarity, term in matches[:limit]]
+
+
+class TestFuzzyIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = RegistryIndex(registry())
+
+    def ranked_ids(self, context):
+        return [item["id"] for _, item in score_items(self.index, context)]
+
+    def test_typos_select_skills(self):
+        self.assertEqual(self.ranked_ids("debuging the mappr"), ["systematic-debugging", "codebase-mapper"])
+        self.assertEqual(self.ranked_ids("tdd workflw")[0], "tdd-workflow")
+
+    def test_exact_hit_outranks_fuzzy(self):
+        items = [make_item("exact", "one", "workflow"), make_item("fuzzy", "two", "workflows")]
+        self.assertEqual([i["id"] for _, i in score_items(RegistryIndex(items), "workflow")], ["exact"])
+        self.assertEqual([i["id"] for _, i in score_items(RegistryIndex(items), "workflw")], ["exact", "fuzzy"])
+
+    def test_threshold_is_configurable(self):
+        original = gsd_select.FUZZY_THRESHOLD
+        try:
+            gsd_select.FUZZY_THRESHOLD = 0.9
+            self.assertEqual(self.ranked_ids("pythn"), [])
+            gsd_select.FUZZY_THRESHOLD = 0
+            self.assertEqual(self.ranked_ids("debuging"), ["systematic-debugging"])  # debug heuristic only
+        finally:
+            gsd_select.FUZZY_THRESHOLD = original
+        self.assertEqual(self.ranked_ids("pythn"), ["python-patterns"])
+
+    def test_fuzzy_terms_match_brute_force(self):
+        rng = random.Random(11)
+        words = ["".join(rng.choice("abcdef") for _ in range(rng.randint(3, 9))) for _ in range(300)]
+        index = RegistryIndex([make_item(f"item-{i}", "", " ".join(rng.sample(words, 4))) for i in range(100)])
+        for _ in range(200):
+            token = "".join(rng.choice("abcdef") for _ in range(rng.randint(4, 9)))
+            threshold = rng.choice((0.3, 0.5, 0.7, 1.0))
+            self.assertEqual(index.fuzzy_terms(token, threshold), brute_force(index, token, threshold), (token, threshold))
+
+
+if __name__ == '__main__':
+    unittest.main()
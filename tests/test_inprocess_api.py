@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+from gsd_project import GsdProject, SCRIPTS_DIR
+
+sys.path.insert(0, SCRIPTS_DIR)
+
+import gsd  # noqa: E402
+import gsd_select  # noqa: E402
+
+
+class TestInProcessApi(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.project = GsdProject()
+        cls.project.sync()
+        cls.cwd = os.getcwd()
+        os.chdir(cls.project.root)
+
+    @classmethod
+    def tearDownClass(cls):
+        os.chdir(cls.cwd)
+        if gsd_select._audit_logger is not None:
+            gsd_select._audit_logger.close()
+        gsd_select._audit_logger = None
+        gsd_select._shared_selectors.clear()
+        cls.project.cleanup()
+
+    def test_dispatch_matches_cli(self):
+        objective = "write tests first with a tdd workflow"
+        cli = self.project.run("dispatch_agent.py", "auto", objective).stdout
+        # print() adds the trailing newline
+        self.assertEqual(gsd.dispatch("auto", objective) + "\n", cli)
+        self.assertIn("RED-GREEN-REFACTOR", cli)
+
+    def test_dispatch_spawns_no_interpreters(self):
+        with mock.patch.object(subprocess, "run", side_effect=AssertionError("subprocess.run")), \
+             mock.patch.object(subprocess, "Popen", side_effect=AssertionError("subprocess.Popen")):
+            directive = gsd.dispatch("auto", "debug the crash")
+        self.assertIn("systematic-debugging", directive)
+
+    def test_recall_returns_structured_sources(self):
+        data = gsd.recall("tdd workflow")
+        self.assertEqual(set(data), {"architecture", "skills_mcps", "library_intelligence", "sources"})
+        self.assertEqual(data["skills_mcps"]["results"][0]["id"], "tdd-workflow")
+        self.assertIn("RELEVANT SKILLS & MCPS", gsd.render_text(data))
+
+    def test_select_empty_context(self):
+        self.assertEqual(gsd.select("")["error"], "No context provided")
+
+
+if __name__ == '__main__':
+    unittest.main()
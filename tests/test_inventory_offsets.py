@@ -0,0 +1,53 @@
+import os
+import sys
+import unittest
+
+from gsd_project import GsdProject, SCRIPTS_DIR
+
+sys.path.insert(0, SCRIPTS_DIR)
+from gsd_registry import extract_registry  # noqa: E402
+from gsd_select import get_full_extraction  # noqa: E402
+
+
+class TestInventoryOffsets(unittest.TestCase):
+    def setUp(self):
+        self.project = GsdProject()
+        self.project.write_skill("unicode-notes", "unicode-notes", "Ünïcødé handling — naïve café ✓",
+                                 "## Purpose\nNormalize ß, é and 漢字 before comparing.\n")
+        self.project.sync()
+        self.inventory = self.project.path(".gsd", "SKILLS.md")
+
+    def tearDown(self):
+        self.project.cleanup()
+
+    def test_span_matches_legacy_extraction(self):
+        items = extract_registry(self.inventory)
+        self.assertEqual(len(items), 6)
+        for item in items:
+            self.assertIn("span", item)
+            legacy = get_full_extraction(item["id"], self.inventory)
+            self.assertTrue(legacy.startswith(f"## {item['name']}"))
+            self.assertEqual(get_full_extraction(item["id"], self.inventory, span=item["span"]), legacy)
+
+    def test_stale_span_falls_back(self):
+        items = {item["id"]: item for item in extract_registry(self.inventory)}
+        legacy = get_full_extraction("tdd-workflow", self.inventory)
+
+        # A hand edit above the section shifts every offset
+        with open(self.inventory, encoding="utf-8") as f:
+            content = f.read()
+        with open(self.inventory, "w", encoding="utf-8") as f:
+            f.write(content.replace("## Technical Details", "## Technical Details (edited)", 1))
+
+        self.assertEqual(get_full_extraction("tdd-workflow", self.inventory, span=items["tdd-workflow"]["span"]), legacy)
+        self.assertEqual(get_full_extraction("tdd-workflow", self.inventory, span=(10 ** 9, 10)), legacy)
+
+    def test_selection_uses_span_without_skill_file(self):
+        os.remove(self.project.path(".agent", "skills", "tdd-workflow", "SKILL.md"))
+        output = self.project.run("gsd_select.py", "--no-daemon", "tdd", "workflow").stdout
+        self.assertIn("- **ID**: `tdd-workflow`", output)
+        self.assertIn("RED-GREEN-REFACTOR", output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import random
+import sys
+import unittest
+
+from gsd_project import SCRIPTS_DIR
+
+sys.path.insert(0, SCRIPTS_DIR)
+from gsd_index import PatternMatcher  # noqa: E402
+
+
+def brute_force(patterns, text):
+    return {value for pattern, value in patterns if pattern and pattern in text}
+
+
+class TestPatternMatcher(unittest.TestCase):
+    def test_overlapping_patterns(self):
+        patterns = [("he", 0), ("she", 1), ("his", 2), ("hers", 3), ("", 4)]
+        matcher = PatternMatcher(patterns)
+        self.assertEqual(matcher.search("ushers"), {0, 1, 3})
+        self.assertEqual(matcher.search("ahishers"), {0, 1, 2, 3})
+        self.assertEqual(matcher.search(""), set())
+
+    def test_duplicate_patterns_report_every_value(self):
+        matcher = PatternMatcher([("react", 0), ("react", 1), ("react-patterns", 2)])
+        self.assertEqual(matcher.search("use react-patterns here"), {0, 1, 2})
+
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        alphabet = "ab-cé"
+        for _ in range(200):
+            patterns = [("".join(rng.choice(alphabet) for _ in range(rng.randint(1, 5))), i) for i in range(rng.randint(1, 12))]
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+            self.assertEqual(PatternMatcher(patterns).search(text), brute_force(patterns, text), (patterns, text))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import json
+import sys
+import time
+import unittest
+from unittest import mock
+
+from gsd_project import GsdProject, SCRIPTS_DIR
+
+sys.path.insert(0, SCRIPTS_DIR)
+
+import recall_context  # noqa: E402
+
+
+def slow(value, seconds):
+    def source(*_):
+        time.sleep(seconds)
+        return value
+    return source
+
+
+class TestRecallConcurrent(unittest.TestCase):
+    def patch_sources(self, architecture, skills, libraries):
+        return mock.patch.multiple(recall_context, recall_architecture=architecture,
+                                   recall_skills=skills, recall_libraries=libraries)
+
+    def test_sources_run_concurrently(self):
+        with self.patch_sources(slow("arch", 0.3), slow({"results": []}, 0.3), slow("libs", 0.3)):
+            start = time.perf_counter()
+            data = recall_context.recall("anything")
+            elapsed = time.perf_counter() - start
+        self.assertLess(elapsed, 0.8)
+        self.assertEqual(data["architecture"], "arch")
+        self.assertEqual(data["library_intelligence"], "libs")
+        for report in data["sources"].values():
+            self.assertEqual(report["status"], "ok")
+            self.assertGreaterEqual(report["latency_ms"], 250)
+
+    def test_slow_source_yields_partial_result(self):
+        with self.patch_sources(slow("arch", 0), slow({"results": []}, 0), slow("libs", 5)):
+            start = time.perf_counter()
+            data = recall_context.recall("anything", {"library_intelligence": 0.2})
+            elapsed = time.perf_counter() - start
+        self.assertLess(elapsed, 2)
+        self.assertEqual(data["architecture"], "arch")
+        self.assertEqual(data["skills_mcps"], {"results": []})
+        self.assertEqual(data["sources"]["library_intelligence"]["status"], "timeout")
+        self.assertIn("timed out", data["library_intelligence"])
+        self.assertIn("Library intelligence timed out", recall_context.render_text(data))
+
+    def test_failing_source_is_reported(self):
+        def boom():
+            raise OSError("disk gone")
+        with self.patch_sources(boom, slow({"results": []}, 0), slow("libs", 0)):
+            data = recall_context.recall("anything")
+        self.assertEqual(data["architecture"], "")
+        self.assertEqual(data["sources"]["architecture"]["status"], "error")
+        self.assertEqual(data["sources"]["skills_mcps"]["status"], "ok")
+
+    def test_cli_json_reports_latency(self):
+        project = GsdProject()
+        try:
+            project.sync()
+            output = project.run("recall_context.py", "--json", "tdd", "workflow").stdout
+        finally:
+            project.cleanup()
+        data = json.loads(output)
+        self.assertEqual(data["skills_mcps"]["results"][0]["id"], "tdd-workflow")
+        self.assertEqual(set(data["sources"]), {"architecture", "skills_mcps", "library_intelligence"})
+        self.assertTrue(all("latency_ms" in r for r in data["sources"].values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import os
+import random
+import shutil
+import stat
+import sys
+import tempfile
+import unittest
+
+from gsd_project import SCRIPTS_DIR, GsdProject
+from test_select_scoring import make_item
+
+sys.path.insert(0, SCRIPTS_DIR)
+from gsd_index import HAVE_NUMPY, RegistryIndex, ScoreMatrix  # noqa: E402
+from gsd_registry import compile_registry, inventory_stamp  # noqa: E402
+from gsd_select import score_items  # noqa: E402
+from gsd_snapshot import Snapshot, attach_snapshot, project_key, publish_snapshot, snapshot_dir  # noqa: E402
+
+SOURCES = (".gsd/SKILLS.md", ".gsd/MCPS.md")
+CONTEXTS = ["tdd workflow", "fix bug in production", "debuging the mappr", "use pyfmt", "idiomatic python", "", "kubernetes"]
+
+
+def summary(ranked):
+    return [(round(score, 9), item["id"]) for score, item in ranked]
+
+
+class TestRegistrySnapshot(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="gsd-snapshot-")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def publish(self, items, n_skills=None, stamp=((1, 1), (2, 2))):
+        n_skills = len(items) if n_skills is None else n_skills
+        compiled = {"sources": SOURCES, "stamp": stamp, "skills": items[:n_skills], "mcps": items[n_skills:],
+                    "index": RegistryIndex(items)}
+        return compiled, Snapshot(publish_snapshot(compiled, self.directory))
+
+    def test_scoring_matches_private_index(self):
+        rng = random.Random(5)
+        words = ["alpha", "beta", "gamma", "delta", "pyfmt", "debugger", "mapper", "ünïcode"]
+        items = [make_item(f"{rng.choice(words)}-{i}", f"{rng.choice(words)}-{rng.choice(words)}",
+                           " ".join(rng.choice(words) for _ in range(4))) for i in range(150)]
+        compiled, snapshot = self.publish(items, n_skills=100)
+        index = snapshot.index
+
+        self.assertEqual((len(snapshot.skills), len(snapshot.mcps)), (100, 50))
+        self.assertEqual(snapshot.mcps[0]["id"], items[100]["id"])
+        contexts = CONTEXTS + [" ".join(rng.choice(words) + rng.choice(("", "s", "x")) for _ in range(3)) for _ in range(40)]
+        for context in contexts:
+            self.assertEqual(summary(score_items(index, context)), summary(score_items(compiled["index"], context)), context)
+            self.assertEqual(index.name_id_hits(context.lower()), compiled["index"].name_id_hits(context.lower()))
+        for terms in (("debug", "fix"), ("mapper",), ("ünï",)):
+            self.assertEqual(index.docs_with_id_containing(*terms), compiled["index"].docs_with_id_containing(*terms))
+
+    @unittest.skipUnless(HAVE_NUMPY, "NumPy not installed")
+    def test_score_matrix_from_snapshot(self):
+        items = [make_item(f"item-{i}", f"n{i}", f"alpha beta w{i % 7}") for i in range(40)]
+        compiled, snapshot = self.publish(items)
+        queries = [["alpha"], ["w3", "beta"], ["missing"]]
+        self.assertEqual(ScoreMatrix(snapshot.index).scores(queries).round(9).tolist(),
+                         ScoreMatrix(compiled["index"]).scores(queries).round(9).tolist())
+
+    def test_versioned_and_immutable(self):
+        items = [make_item("one", "one", "alpha")]
+        first = publish_snapshot(self.publish(items)[0], self.directory)
+        second = publish_snapshot(self.publish(items, stamp=((1, 1), (3, 3)))[0], self.directory)
+        self.assertNotEqual(first, second)
+        self.assertFalse(os.path.exists(first))
+        self.assertEqual(os.listdir(self.directory), [os.path.basename(second)])
+
+    def test_writable_snapshot_is_never_mapped_or_reused(self):
+        compiled, snapshot = self.publish([make_item("one", "one", "alpha")])
+        path = publish_snapshot(compiled, self.directory)
+        os.chmod(path, 0o666)
+        with self.assertRaises(PermissionError):
+            Snapshot(path)
+        self.assertIsNone(attach_snapshot(*SOURCES, compiled["stamp"], self.directory))
+
+        # Republished in place rather than trusted
+        self.assertEqual(publish_snapshot(compiled, self.directory), path)
+        self.assertEqual(os.stat(path).st_mode & 0o077, 0)
+        self.assertIsNotNone(attach_snapshot(*SOURCES, compiled["stamp"], self.directory))
+
+    @unittest.skipUnless(hasattr(os, "getuid") and os.getuid() == 0, "needs root to chown")
+    def test_foreign_owner_is_rejected(self):
+        compiled, snapshot = self.publish([make_item("one", "one", "alpha")])
+        path = publish_snapshot(compiled, self.directory)
+        os.chown(path, 12345, -1)
+        with self.assertRaises(PermissionError):
+            Snapshot(path)
+        self.assertIsNone(attach_snapshot(*SOURCES, compiled["stamp"], self.directory))
+
+        os.chown(self.directory, 12345, -1)
+        with self.assertRaises(PermissionError):
+            publish_snapshot(compiled, self.directory)
+
+    def test_open_directory_is_not_attached(self):
+        compiled, snapshot = self.publish([make_item("one", "one", "alpha")])
+        os.chmod(self.directory, 0o777)
+        self.assertIsNone(attach_snapshot(*SOURCES, compiled["stamp"], self.directory))
+
+
+class TestSnapshotProject(unittest.TestCase):
+    def setUp(self):
+        self.project = GsdProject()
+        self.project.sync()
+        self.cwd = os.getcwd()
+        os.chdir(self.project.root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.project.cleanup()
+
+    def test_sync_publishes_and_selectors_attach(self):
+        stamp = inventory_stamp(SOURCES)
+        snapshot = attach_snapshot(*SOURCES, stamp)
+        self.assertIsNotNone(snapshot)
+        self.assertTrue(any(name.startswith(f"gsd-registry-{project_key()}-") for name in os.listdir(snapshot_dir())))
+
+        compiled = compile_registry(*SOURCES)
+        for context in CONTEXTS:
+            self.assertEqual(summary(score_items(snapshot.index, context)), summary(score_items(compiled["index"], context)))
+
+    def test_sync_prunes_older_versions(self):
+        current = attach_snapshot(*SOURCES, inventory_stamp(SOURCES))
+        self.assertIsNotNone(current)
+        old = os.path.join(snapshot_dir(), f"gsd-registry-{project_key()}-0000000000000000.snap")
+        with open(old, "wb") as f:
+            f.write(b"old version")
+
+        self.project.sync()
+        names = [name for name in os.listdir(snapshot_dir()) if name.startswith(f"gsd-registry-{project_key()}-")]
+        self.assertEqual(len(names), 1)
+        self.assertFalse(os.path.exists(old))
+        self.assertEqual(stat.S_IMODE(os.stat(snapshot_dir()).st_mode), 0o700)
+
+    def test_source_text_tracks_the_file(self):
+        index = attach_snapshot(*SOURCES, inventory_stamp(SOURCES)).index
+        item = next(item for item in index.items if item["id"] == "tdd-workflow")
+        with open(item["path"], encoding="utf-8") as f:
+            self.assertEqual(index.source_text(item), f.read())
+
+        self.project.write_skill("tdd-workflow", "tdd-workflow", "Edited.", "## Purpose\nChanged.\n")
+        self.assertIsNone(index.source_text(item))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import random
+import sys
+import unittest
+
+from gsd_project import SCRIPTS_DIR
+from test_select_scoring import make_item, registry
+
+sys.path.insert(0, SCRIPTS_DIR)
+from gsd_index import HAVE_NUMPY, RegistryIndex, ScoreMatrix  # noqa: E402
+from gsd_select import score_batch, score_items  # noqa: E402
+
+CONTEXTS = [
+    "tdd workflow",
+    "fix bug in production",
+    "idiomatic python packaging",
+    "map the repo and use react-patterns",
+    "kubernetes",
+    "",
+]
+
+
+def summary(ranked):
+    return [[(round(score, 6), item["id"]) for score, item in candidates] for candidates in ranked]
+
+
+class TestScoreBatch(unittest.TestCase):
+    def setUp(self):
+        self.index = RegistryIndex(registry())
+
+    def expected(self, index, contexts, k):
+        return summary([score_items(index, context)[:k] for context in contexts])
+
+    def test_fallback_matches_single_queries(self):
+        self.assertEqual(summary(score_batch(self.index, CONTEXTS, 3)), self.expected(self.index, CONTEXTS, 3))
+
+    @unittest.skipUnless(HAVE_NUMPY, "NumPy not installed")
+    def test_matrix_matches_single_queries(self):
+        matrix = ScoreMatrix(self.index)
+        for k in (1, 3, 32):
+            self.assertEqual(summary(score_batch(self.index, CONTEXTS, k, matrix)), self.expected(self.index, CONTEXTS, k))
+
+    @unittest.skipUnless(HAVE_NUMPY, "NumPy not installed")
+    def test_matrix_ties_and_chunks(self):
+        # Many identical descriptions force ties at the k-th score; a tiny chunk size splits the batch
+        rng = random.Random(7)
+        words = ["alpha", "beta", "gamma", "delta", "epsilon"]
+        items = [make_item(f"item-{i:03d}", f"n{i}", " ".join(rng.choice(words) for _ in range(3))) for i in range(200)]
+        index = RegistryIndex(items)
+        contexts = [" ".join(rng.choice(words) for _ in range(2)) for _ in range(25)]
+
+        matrix = ScoreMatrix(index)
+        matrix.chunk_size = lambda: 4
+        self.assertEqual(summary(score_batch(index, contexts, 5, matrix)), self.expected(index, contexts, 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
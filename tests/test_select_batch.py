@@ -0,0 +1,83 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from gsd_project import SCRIPTS_DIR, GsdProject
+
+CONTEXTS = ["tdd workflow", "fix bug in production", "idiomatic python", "kubernetes"]
+
+
+class TestSelectBatch(unittest.TestCase):
+    def setUp(self):
+        self.project = GsdProject()
+        self.project.sync()
+
+    def tearDown(self):
+        self.project.cleanup()
+
+    def run_batch(self, *args):
+        stdin = "".join(json.dumps({"id": f"task-{i}", "context": c}) + "\n" for i, c in enumerate(CONTEXTS))
+        result = self.project.run("gsd_select.py", "--batch", *args, input=stdin)
+        return [json.loads(line) for line in result.stdout.splitlines()]
+
+    def audit_events(self):
+        with open(self.project.path(".gsd", "logs", "audit.jsonl")) as f:
+            return [json.loads(line) for line in f]
+
+    def test_batch_matches_single_queries(self):
+        batch = self.run_batch()
+        self.assertEqual([r["id"] for r in batch], [f"task-{i}" for i in range(len(CONTEXTS))])
+
+        for context, row in zip(CONTEXTS, batch):
+            single = json.loads(self.project.run("gsd_select.py", "--no-daemon", context).stdout)
+            row.pop("id")
+            self.assertEqual(row, single)
+
+    def test_workers_preserve_order(self):
+        self.assertEqual(self.run_batch("--workers", "3"), self.run_batch())
+
+    def test_vectorized_matches_batch(self):
+        self.assertEqual(self.run_batch("--vectorized"), self.run_batch())
+        self.assertEqual(self.run_batch("--vectorized", "--budget-tokens", "400"), self.run_batch("--budget-tokens", "400"))
+        self.assertEqual(len(self.audit_events()), 4 * len(CONTEXTS))
+
+    def test_bad_lines_become_error_rows(self):
+        lines = [
+            {"id": "null", "context": None},
+            {"id": "number", "context": 5},
+            {"id": "missing"},
+            {"id": "ok", "context": "tdd workflow"},
+        ]
+        stdin = "".join(json.dumps(line) + "\n" for line in lines) + "{not json\n"
+        for args in ((), ("--workers", "2"), ("--vectorized",)):
+            result = self.project.run("gsd_select.py", "--batch", *args, input=stdin)
+            rows = [json.loads(line) for line in result.stdout.splitlines()]
+            self.assertEqual([r["id"] for r in rows], ["null", "number", "missing", "ok", 5], args)
+            self.assertTrue(all("error" in r for r in rows[:3] + rows[4:]), args)
+            self.assertEqual(rows[3]["results"][0]["id"], "tdd-workflow")
+
+    def test_results_stream_before_stdin_closes(self):
+        proc = subprocess.Popen([sys.executable, os.path.join(SCRIPTS_DIR, "gsd_select.py"), "--batch"],
+                                cwd=self.project.root, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        try:
+            proc.stdin.write("tdd workflow\n")
+            proc.stdin.flush()
+            self.assertEqual(json.loads(proc.stdout.readline())["id"], 1)
+        finally:
+            proc.stdin.close()
+            proc.wait(timeout=30)
+            proc.stdout.close()
+
+    def test_plain_lines_and_bulk_audit(self):
+        result = self.project.run("gsd_select.py", "--batch", input="tdd workflow\n\nfix bug\n")
+        rows = [json.loads(line) for line in result.stdout.splitlines()]
+        self.assertEqual([r["id"] for r in rows], [1, 3])
+
+        events = self.audit_events()
+        self.assertEqual([e["context"] for e in events], ["tdd workflow", "fix bug"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import sys
+import unittest
+
+from gsd_project import GsdProject, SCRIPTS_DIR
+
+sys.path.insert(0, SCRIPTS_DIR)
+from gsd_select import pack_budget  # noqa: E402
+
+
+def candidates(*specs):
+    return [(score, {"id": item_id}, tokens) for item_id, score, tokens in specs]
+
+
+def ids(packed):
+    return [item["id"] for _, item, _ in packed]
+
+
+class TestPackBudget(unittest.TestCase):
+    def test_small_items_beat_one_large(self):
+        chosen, skipped = pack_budget(candidates(("big", 10, 900), ("a", 6, 300), ("b", 5, 300), ("c", 4, 300)), 1000)
+        self.assertEqual(ids(chosen), ["a", "b", "c"])
+        self.assertEqual(ids(skipped), ["big"])
+
+    def test_large_item_kept_when_worth_it(self):
+        chosen, _ = pack_budget(candidates(("big", 20, 900), ("a", 6, 300), ("b", 5, 300)), 1000)
+        self.assertEqual(ids(chosen), ["big"])
+
+    def test_never_exceeds_budget(self):
+        specs = [(f"s{i}", 10 - i * 0.5, 137 + i * 61) for i in range(15)]
+        for budget in (0, 100, 500, 1234, 5000, 100000):
+            chosen, skipped = pack_budget(candidates(*specs), budget)
+            self.assertLessEqual(sum(t for _, _, t in chosen), budget)
+            self.assertEqual(len(chosen) + len(skipped), len(specs))
+
+    def test_ties_prefer_higher_rank(self):
+        chosen, _ = pack_budget(candidates(("first", 5, 100), ("second", 5, 100)), 150)
+        self.assertEqual(ids(chosen), ["first"])
+
+
+class TestBudgetCli(unittest.TestCase):
+    def setUp(self):
+        self.project = GsdProject()
+        # A python skill large enough to blow a small budget on its own
+        self.project.write_skill("python-deep-dive", "python-deep-dive", "Exhaustive Python patterns reference",
+                                 "## Purpose\n" + "Python patterns in depth. " * 800)
+        self.project.sync()
+
+    def tearDown(self):
+        self.project.cleanup()
+
+    def select(self, *args):
+        return json.loads(self.project.run("gsd_select.py", "--no-daemon", *args).stdout)
+
+    def test_budget_skips_oversized_skill(self):
+        unbounded = self.select("python", "patterns")
+        self.assertIn("python-deep-dive", [r["id"] for r in unbounded["results"]])
+        self.assertNotIn("budget", unbounded)
+
+        output = self.select("--budget-tokens", "500", "python", "patterns")
+        budget = output["budget"]
+        self.assertEqual(budget["budget_tokens"], 500)
+        self.assertLessEqual(budget["used_tokens"], 500)
+        self.assertEqual([r["id"] for r in output["results"]], [c["id"] for c in budget["chosen"]])
+        self.assertIn("python-patterns", [c["id"] for c in budget["chosen"]])
+        skipped = {c["id"]: c["tokens"] for c in budget["skipped"]}
+        self.assertGreater(skipped["python-deep-dive"], 500)
+
+    def test_option_like_context_words_stay_context(self):
+        # `--b` would otherwise abbreviate --budget-tokens
+        output = self.select("python", "patterns", "--b", "500", "-v")
+        self.assertNotIn("budget", output)
+        self.assertEqual(output, self.select("--", "python", "patterns", "--b", "500", "-v"))
+        self.assertIn("python-deep-dive", [r["id"] for r in output["results"]])
+
+
+if __name__ == '__main__':
+    unittest.main()
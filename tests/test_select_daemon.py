@@ -0,0 +1,66 @@
+import json
+import os
+import subprocess
+import sys
+import time
+import unittest
+
+from gsd_project import GsdProject, SCRIPTS_DIR
+
+SOCKET = ".gsd/.cache/gsd_select.sock"
+
+
+class TestSelectDaemon(unittest.TestCase):
+    def setUp(self):
+        self.project = GsdProject()
+        self.project.sync()
+        self.daemon = subprocess.Popen(
+            [sys.executable, os.path.join(SCRIPTS_DIR, "gsd_select.py"), "--serve"],
+            cwd=self.project.root,
+            stderr=subprocess.PIPE,
+        )
+        deadline = time.time() + 10
+        while not os.path.exists(self.project.path(SOCKET)):
+            self.assertLess(time.time(), deadline, "Daemon never created its socket")
+            time.sleep(0.05)
+
+    def tearDown(self):
+        self.daemon.terminate()
+        self.daemon.wait(timeout=10)
+        self.daemon.stderr.close()
+        self.project.cleanup()
+
+    def select(self, *args):
+        return json.loads(self.project.run("gsd_select.py", *args).stdout)
+
+    def test_daemon_matches_in_process(self):
+        context = "tdd workflow"
+        self.assertEqual(self.select(context), self.select("--no-daemon", context))
+
+        with open(self.project.path(".gsd", "logs", "audit.jsonl")) as f:
+            pids = [json.loads(line)["pid"] for line in f]
+        self.assertIn(self.daemon.pid, pids, "Client did not go through the daemon")
+
+    def test_daemon_honours_budget(self):
+        args = ("--budget-tokens", "100", "tdd workflow")
+        self.assertEqual(self.select(*args), self.select("--no-daemon", *args))
+        self.assertIn("budget", self.select(*args))
+
+    def test_reload_on_inventory_change(self):
+        self.assertEqual(self.select("kubernetes")["results"], [])
+
+        self.project.write_skill("kubernetes-ops", "kubernetes-ops", "Kubernetes cluster operations", "## Purpose\nShip pods.\n")
+        self.project.sync()
+
+        ids = [r["id"] for r in self.select("kubernetes")["results"]]
+        self.assertIn("kubernetes-ops", ids)
+
+    def test_fallback_without_daemon(self):
+        self.daemon.terminate()
+        self.daemon.wait(timeout=10)
+        result = self.select("tdd workflow")
+        self.assertIn("tdd-workflow", [r["id"] for r in result["results"]])
+
+
+if __name__ == '__main__':
+    unittest.main()
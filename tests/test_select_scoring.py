@@ -0,0 +1,62 @@
+import sys
+import unittest
+
+from gsd_project import SAMPLE_SKILLS, SCRIPTS_DIR
+
+sys.path.insert(0, SCRIPTS_DIR)
+from gsd_index import RegistryIndex  # noqa: E402
+from gsd_registry import normalize_item  # noqa: E402
+from gsd_select import score_items  # noqa: E402
+
+
+def make_item(item_id, name, description):
+    return normalize_item({"id": item_id, "name": name, "description": description, "path": "", "confidence": 1.0}, "SKILLS.md")
+
+
+def registry():
+    return [make_item(skill_id, name, description) for skill_id, (name, description, _) in SAMPLE_SKILLS.items()]
+
+
+class TestSelectScoring(unittest.TestCase):
+    def setUp(self):
+        self.index = RegistryIndex(registry())
+
+    def ranked_ids(self, context):
+        return [item["id"] for _, item in score_items(self.index, context)]
+
+    def test_description_terms_rank(self):
+        self.assertEqual(self.ranked_ids("idiomatic python packaging")[0], "python-patterns")
+
+    def test_name_boost_outranks_description(self):
+        ids = self.ranked_ids("use react-patterns for frontend state in python")
+        self.assertEqual(ids[0], "react-patterns")
+        self.assertIn("python-patterns", ids)
+
+    def test_debug_heuristic_without_token_overlap(self):
+        self.assertEqual(self.ranked_ids("fix it")[0], "systematic-debugging")
+
+    def test_mapper_heuristic(self):
+        self.assertIn("codebase-mapper", self.ranked_ids("map the repo"))
+
+    def test_no_overlap_selects_nothing(self):
+        self.assertEqual(self.ranked_ids("kubernetes helm chart"), [])
+
+    def test_name_substring_without_token_overlap(self):
+        index = RegistryIndex([
+            make_item("pyfmt", "pyfmt", "Formatter"),
+            make_item("other", "other", "Unrelated"),
+        ])
+        # "pyfmt" is not a token of the context, but occurs in it
+        scored = score_items(index, "run mypyfmtx over the tree")
+        self.assertEqual([(score, item["id"]) for score, item in scored], [(13, "pyfmt")])
+
+    def test_ties_keep_registry_order(self):
+        index = RegistryIndex([
+            make_item("beta", "beta", "shared term"),
+            make_item("alpha", "alpha", "shared term"),
+        ])
+        self.assertEqual([item["id"] for _, item in score_items(index, "shared")], ["beta", "alpha"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import json
+import sys
+import unittest
+
+from gsd_project import GsdProject, SCRIPTS_DIR
+
+sys.path.insert(0, SCRIPTS_DIR)
+from gsd_registry import index_sections  # noqa: E402
+
+SKILL = (b"---\nname: demo\ndescription: Demo skill\n---\n\n# demo\n\n"
+         b"## Purpose\nExplain things.\n\n## When to Use\nWhen asked.\n\n## Behavior Rules\n- Be brief.\n")
+
+
+class TestIndexSections(unittest.TestCase):
+    def test_offsets_slice_each_section(self):
+        sections = index_sections(SKILL)
+        self.assertEqual([s["heading"] for s in sections], ["Purpose", "When to Use", "Behavior Rules"])
+        for section in sections:
+            text = SKILL[section["offset"]:section["offset"] + section["length"]].decode()
+            self.assertTrue(text.startswith("## " + section["heading"]))
+            self.assertFalse(text.endswith("\n"))
+        self.assertIn("when", sections[1]["heading_tokens"])
+        self.assertIn("brief", sections[2]["tokens"])
+
+    def test_no_headings(self):
+        self.assertEqual(index_sections(b'{"mcpServers": {}}'), [])
+
+
+class TestSelectSections(unittest.TestCase):
+    def setUp(self):
+        self.project = GsdProject()
+        self.project.sync()
+
+    def tearDown(self):
+        self.project.cleanup()
+
+    def select(self, *args):
+        return json.loads(self.project.run("gsd_select.py", "--no-daemon", *args).stdout)
+
+    def test_injects_only_relevant_sections(self):
+        context = ("tdd-workflow", "refactor", "only", "on", "green")
+        full = self.select(*context)
+        output = self.select("--sections", *context)
+
+        self.assertEqual(output["results"][0]["id"], "tdd-workflow")
+        self.assertEqual(output["results"][0]["sections"], ["Purpose", "Behavior Rules"])
+        fragment = output["prompt_injection"]
+        self.assertTrue(fragment.startswith("# tdd-workflow\n\n## Purpose"))
+        self.assertIn("- Refactor only on green.", fragment)
+        self.assertNotIn("## When to Use", fragment)
+        self.assertNotIn("description:", fragment)
+        self.assertLess(len(fragment), len(full["prompt_injection"]))
+
+    def test_edited_file_falls_back_to_whole_file(self):
+        with open(self.project.path(".agent", "skills", "tdd-workflow", "SKILL.md"), "a", encoding="utf-8") as f:
+            f.write("\n## Notes\nAdded after the last sync.\n")
+        output = self.select("--sections", "tdd-workflow")
+        self.assertNotIn("sections", output["results"][0])
+        self.assertIn("Added after the last sync.", output["prompt_injection"])
+
+
+if __name__ == '__main__':
+    unittest.main()
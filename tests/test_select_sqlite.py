@@ -0,0 +1,111 @@
+import json
+import os
+import sqlite3
+import sys
+import unittest
+from unittest import mock
+
+from gsd_project import SCRIPTS_DIR, GsdProject
+
+sys.path.insert(0, SCRIPTS_DIR)
+import gsd_registry_db  # noqa: E402
+from gsd_registry import compile_registry  # noqa: E402
+from gsd_registry_db import FTS_WEIGHTS, ItemLookup, connect, fts_query, rank_items, write_registry_db  # noqa: E402
+from gsd_select import DEBUG_ID_TERMS, DEBUG_TRIGGERS, W_HEURISTIC, W_ID, W_NAME  # noqa: E402
+
+CONTEXTS = ["tdd workflow", "fix bug in production", "idiomatic python", "kubernetes", "map the repo"]
+WEIGHTS = {"w_name": W_NAME, "w_id": W_ID, "w_heuristic": W_HEURISTIC,
+           "debug_triggers": DEBUG_TRIGGERS, "debug_id_terms": DEBUG_ID_TERMS}
+
+# Every item scored in SQL: the reference rank_items() must agree with
+FULL_SCAN_SQL = """
+WITH fts AS (SELECT rowid, -bm25(item_text, {weights}) AS relevance FROM item_text WHERE item_text MATCH :query)
+SELECT * FROM (
+    SELECT items.rowid, items.id,
+        COALESCE(fts.relevance, 0)
+        + CASE WHEN name_lc != '' AND instr(:context, name_lc) THEN :w_name ELSE 0 END
+        + CASE WHEN id_lc != '' AND instr(:context, id_lc) THEN :w_id ELSE 0 END
+        + CASE WHEN :debug AND ({debug_ids}) THEN :w_heuristic ELSE 0 END
+        + CASE WHEN :map AND instr(id_lc, 'mapper') THEN :w_heuristic ELSE 0 END AS score
+    FROM items LEFT JOIN fts ON fts.rowid = items.rowid
+) WHERE score > 0 ORDER BY score DESC, rowid
+"""
+
+
+class TestSelectSqlite(unittest.TestCase):
+    def setUp(self):
+        self.project = GsdProject()
+        self.project.sync()
+        self.db_path = self.project.path(".gsd", ".cache", "registry.sqlite")
+
+    def tearDown(self):
+        self.project.cleanup()
+
+    def select(self, *args):
+        return json.loads(self.project.run("gsd_select.py", *args).stdout)
+
+    def test_sync_writes_database(self):
+        self.assertTrue(os.path.exists(self.db_path))
+        with sqlite3.connect(self.db_path) as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(conn.execute("SELECT count(*) FROM items").fetchone()[0], 5)
+            self.assertEqual(conn.execute("SELECT count(*) FROM item_text WHERE item_text MATCH 'refactor'").fetchone()[0], 1)
+
+    def test_matches_index_backend(self):
+        for context in CONTEXTS:
+            index = self.select("--no-daemon", context)["results"]
+            sqlite = self.select("--backend", "sqlite", context)["results"]
+            self.assertEqual([r["id"] for r in sqlite[:1]], [r["id"] for r in index[:1]], context)
+
+    def test_same_output_format(self):
+        index = self.select("--no-daemon", "--budget-tokens", "300", "--sections", "tdd workflow")
+        sqlite = self.select("--backend", "sqlite", "--budget-tokens", "300", "--sections", "tdd workflow")
+        self.assertEqual(sqlite.keys(), index.keys())
+        self.assertEqual(sqlite["prompt_injection"], index["prompt_injection"])
+        self.assertEqual(sqlite["results"][0]["sections"], index["results"][0]["sections"])
+
+    def test_body_terms_are_searchable(self):
+        # "green" only appears in the tdd-workflow SKILL.md body
+        self.assertEqual([r["id"] for r in self.select("--backend", "sqlite", "green")["results"]], ["tdd-workflow"])
+
+    def test_stale_database_is_rebuilt(self):
+        self.project.write_skill("kube-ops", "kube-ops", "Operate kubernetes clusters.", "## Purpose\nHelm and kubectl.\n")
+        self.project.sync()
+        os.remove(self.db_path)
+        self.assertEqual([r["id"] for r in self.select("--backend", "sqlite", "kubernetes")["results"]], ["kube-ops"])
+        self.assertTrue(os.path.exists(self.db_path))
+
+    def test_rank_items_matches_full_scan(self):
+        conn = connect(self.db_path)
+        self.addCleanup(conn.close)
+        lookup = ItemLookup(conn)
+        debug_ids = " OR ".join(f"instr(id_lc, '{term}')" for term in DEBUG_ID_TERMS) or "0"
+        sql = FULL_SCAN_SQL.format(weights=", ".join(map(str, FTS_WEIGHTS)), debug_ids=debug_ids)
+        for context in CONTEXTS + ["python-patterns and react", "debug the codebase-mapper", "", "!!"]:
+            lowered = context.lower()
+            params = {"query": fts_query(lowered) or '""', "context": lowered, "w_name": W_NAME, "w_id": W_ID,
+                      "w_heuristic": W_HEURISTIC, "debug": any(t in lowered for t in DEBUG_TRIGGERS), "map": "map" in lowered}
+            expected = [(round(row["score"], 9), row["id"]) for row in conn.execute(sql, params)][:3]
+            ranked = rank_items(conn, context, 3, WEIGHTS, lookup)
+            self.assertEqual([(round(score, 9), item["id"]) for score, item in ranked], expected, context)
+
+    def test_rebuild_rechecks_under_the_write_lock(self):
+        cwd = os.getcwd()
+        os.chdir(self.project.root)
+        self.addCleanup(os.chdir, cwd)
+        compiled = compile_registry(".gsd/SKILLS.md", ".gsd/MCPS.md")
+        compiled["skills"] = compiled["skills"][:1]
+        # Stale when first checked, rebuilt by another process by the time the lock is held
+        with mock.patch.object(gsd_registry_db, "is_current", side_effect=[False, True]):
+            self.assertFalse(write_registry_db(compiled, self.db_path))
+        with sqlite3.connect(self.db_path) as conn:
+            self.assertEqual(conn.execute("SELECT count(*) FROM items").fetchone()[0], 5)
+
+    def test_fts_query_quotes_operators(self):
+        self.assertEqual(fts_query('NOT "near" AND x'), '"not" OR "near" OR "and"')
+        self.assertIsInstance(self.select("--backend", "sqlite", 'NOT "near" AND ( *')["results"], list)
+        self.assertEqual(self.select("--backend", "sqlite", "!!")["results"], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
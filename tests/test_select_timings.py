@@ -0,0 +1,45 @@
+import json
+import pstats
+import unittest
+
+from gsd_project import GsdProject
+
+PHASES = ["load", "score", "sort", "extract"]
+
+
+class TestSelectTimings(unittest.TestCase):
+    def setUp(self):
+        self.project = GsdProject()
+        self.project.sync()
+
+    def tearDown(self):
+        self.project.cleanup()
+
+    def last_event(self):
+        with open(self.project.path(".gsd", "logs", "audit.jsonl")) as f:
+            return json.loads(f.readlines()[-1])
+
+    def test_timings_in_output_and_audit(self):
+        output = json.loads(self.project.run("gsd_select.py", "--no-daemon", "--timings", "tdd workflow").stdout)
+        self.assertEqual(list(output["timings_ms"]), PHASES + ["log"])
+        self.assertTrue(all(v >= 0 for v in output["timings_ms"].values()))
+        self.assertEqual(list(self.last_event()["timings_ms"]), PHASES)
+
+    def test_timings_hidden_by_default(self):
+        output = json.loads(self.project.run("gsd_select.py", "--no-daemon", "tdd workflow").stdout)
+        self.assertNotIn("timings_ms", output)
+        self.assertIn("timings_ms", self.last_event())
+
+    def test_batch_timings(self):
+        result = self.project.run("gsd_select.py", "--batch", "--timings", input="tdd workflow\n")
+        self.assertEqual(list(json.loads(result.stdout)["timings_ms"]), PHASES)
+
+    def test_profile_dump(self):
+        result = self.project.run("gsd_select.py", "--profile", "--profile-out", "select.prof", "tdd workflow")
+        self.assertIn("tdd-workflow", [r["id"] for r in json.loads(result.stdout)["results"]])
+        stats = pstats.Stats(self.project.path("select.prof"))
+        self.assertTrue(any(func[2] == "select_with_event" for func in stats.stats))
+
+
+if __name__ == '__main__':
+    unittest.main()
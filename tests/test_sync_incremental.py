@@ -0,0 +1,109 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import unittest
+
+from gsd_project import GsdProject, SCRIPTS_DIR
+
+
+# Runs gsd_sync with an audit hook and prints every SKILL.md it opened, one per line
+COUNT_OPENS = """
+import os, runpy, sys
+opened = []
+sys.addaudithook(lambda event, args: event == "open" and str(args[0]).endswith("SKILL.md") and opened.append(str(args[0])))
+sys.argv = [sys.argv[1]]
+sys.path.insert(0, os.path.dirname(sys.argv[0]))
+try:
+    with open(os.devnull, "w") as sys.stdout:
+        runpy.run_path(sys.argv[0], run_name="__main__")
+finally:
+    sys.stdout = sys.__stdout__
+    print("\\n".join(opened))
+"""
+
+
+class TestSyncIncremental(unittest.TestCase):
+    def setUp(self):
+        self.project = GsdProject()
+
+    def tearDown(self):
+        self.project.cleanup()
+
+    def sync_stats(self, *args):
+        output = self.project.sync(*args).stdout
+        reused, reparsed, dropped = re.search(r"Skills: (\d+) reused, (\d+) re-parsed, (\d+) dropped", output).groups()
+        return int(reused), int(reparsed), int(dropped)
+
+    def inventory(self):
+        with open(self.project.path(".gsd", "SKILLS.md"), encoding="utf-8") as f:
+            return f.read()
+
+    def test_only_changed_skills_reparsed(self):
+        self.assertEqual(self.sync_stats(), (0, 5, 0))
+        self.assertEqual(self.sync_stats(), (5, 0, 0))
+
+        self.project.write_skill("python-patterns", "python-patterns", "Typed Python idioms", "## Purpose\nTypes.\n")
+        self.assertEqual(self.sync_stats(), (4, 1, 0))
+        self.assertIn("Typed Python idioms", self.inventory())
+
+        # A touch without an edit is caught by the content hash
+        os.utime(self.project.path(".agent", "skills", "react-patterns", "SKILL.md"), ns=(1, 1))
+        self.assertEqual(self.sync_stats(), (5, 0, 0))
+
+        shutil.rmtree(self.project.path(".agent", "skills", "codebase-mapper"))
+        self.assertEqual(self.sync_stats(), (4, 0, 1))
+        self.assertNotIn("codebase-mapper", self.inventory())
+
+    def opened_skills(self):
+        result = subprocess.run(
+            [sys.executable, "-c", COUNT_OPENS, os.path.join(SCRIPTS_DIR, "gsd_sync.py")],
+            cwd=self.project.root, capture_output=True, text=True, check=True,
+        )
+        return sorted(os.path.basename(os.path.dirname(p)) for p in result.stdout.split())
+
+    def test_noop_sync_opens_no_skill_files(self):
+        self.project.sync()
+        sidecar = self.project.path(".gsd", ".cache", "registry.json")
+        os.utime(sidecar, ns=(1, 1))
+
+        self.assertEqual(self.opened_skills(), [])
+        self.assertEqual(os.stat(sidecar).st_mtime_ns, 1)
+
+        self.project.write_skill("python-patterns", "python-patterns", "Typed Python idioms", "## Purpose\nTypes.\n")
+        self.assertIn("python-patterns", self.opened_skills())
+        self.assertNotEqual(os.stat(sidecar).st_mtime_ns, 1)
+
+    def test_full_sync_rebuilds_the_sidecar(self):
+        self.project.sync()
+        sidecar = self.project.path(".gsd", ".cache", "registry.json")
+        with open(sidecar, encoding="utf-8") as f:
+            good = json.load(f)
+        tampered = json.loads(json.dumps(good))
+        for item in tampered["skills"]:
+            item["sha256"] = "0" * 64
+        with open(sidecar, "w", encoding="utf-8") as f:
+            json.dump(tampered, f)
+
+        self.project.sync()
+        with open(sidecar, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["skills"][0]["sha256"], "0" * 64)
+
+        self.project.sync("--full")
+        with open(sidecar, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["skills"], good["skills"])
+
+    def test_full_rebuild_matches_incremental(self):
+        self.sync_stats()
+        self.project.write_skill("react-patterns", "react-patterns", "React hooks", "## Purpose\nHooks.\n")
+        self.sync_stats()
+        incremental = self.inventory()
+
+        self.assertEqual(self.sync_stats("--full"), (0, 5, 0))
+        self.assertEqual(self.inventory(), incremental)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from gsd_project import GsdProject
+
+
+def many_skills(count):
+    return {
+        f"skill-{i:03d}": (f"skill-{i:03d}", f"Generated skill number {i}", f"## Purpose\nSkill {i} body.\n\n## When to Use\nCase {i}.\n")
+        for i in range(count)
+    }
+
+
+class TestSyncParallel(unittest.TestCase):
+    def setUp(self):
+        self.project = GsdProject(skills=many_skills(40))
+
+    def tearDown(self):
+        self.project.cleanup()
+
+    def read(self, *parts):
+        with open(self.project.path(*parts), "rb") as f:
+            return f.read()
+
+    def test_gsd_sync_parallel_is_byte_identical(self):
+        self.project.sync("--full")
+        serial = self.read(".gsd", "SKILLS.md")
+        for args in (["--jobs", "4"], ["--jobs", "4", "--processes"]):
+            with self.subTest(args=args):
+                self.project.sync("--full", *args)
+                self.assertEqual(self.read(".gsd", "SKILLS.md"), serial)
+
+    def test_categorize_skills_parallel_is_byte_identical(self):
+        self.project.run("categorize_skills.py")
+        serial = self.read(".gsd", "SKILLS.md")
+        for args in (["--jobs", "4"], ["--jobs", "4", "--processes"]):
+            with self.subTest(args=args):
+                self.project.run("categorize_skills.py", *args)
+                self.assertEqual(self.read(".gsd", "SKILLS.md"), serial)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+import unittest
+
+from gsd_project import GsdProject, SCRIPTS_DIR
+
+
+class TestSyncWatch(unittest.TestCase):
+    def setUp(self):
+        self.project = GsdProject()
+        self.proc = subprocess.Popen(
+            [sys.executable, "-u", os.path.join(SCRIPTS_DIR, "gsd_sync.py"), "--watch", "--interval", "0.05", "--debounce", "0.1"],
+            cwd=self.project.root,
+            env=dict(os.environ, HOME=self.project.root),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        )
+
+    def tearDown(self):
+        if self.proc.poll() is None:
+            self.proc.kill()
+            self.proc.communicate()
+        self.project.cleanup()
+
+    def inventory(self):
+        with open(self.project.path(".gsd", "SKILLS.md"), encoding="utf-8") as f:
+            return f.read()
+
+    def wait_for(self, predicate, timeout=10):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.05)
+        return False
+
+    def test_edit_is_picked_up_incrementally(self):
+        self.assertTrue(self.wait_for(lambda: "tdd-workflow" in self.inventory()))
+        # Let the watcher take its baseline snapshot after the initial sync
+        time.sleep(0.3)
+
+        self.project.write_skill("react-patterns", "react-patterns", "React hooks and suspense", "## Purpose\nHooks.\n")
+        self.assertTrue(self.wait_for(lambda: "React hooks and suspense" in self.inventory()))
+
+        self.proc.send_signal(signal.SIGINT)
+        output, _ = self.proc.communicate(timeout=10)
+        self.assertIn("Skills: 0 reused, 5 re-parsed, 0 dropped", output)
+        self.assertIn("Change detected", output)
+        self.assertIn("Skills: 4 reused, 1 re-parsed, 0 dropped", output)
+        self.assertIn("Watch stopped.", output)
+
+    def test_failed_sync_keeps_watching(self):
+        self.assertTrue(self.wait_for(lambda: "tdd-workflow" in self.inventory()))
+        time.sleep(0.3)
+
+        # A half-written save: truncated mid multi-byte character
+        with open(self.project.path(".agent", "skills", "react-patterns", "SKILL.md"), "wb") as f:
+            f.write("---\nname: react-patterns\ndescription: Caf\u00e9".encode("utf-8")[:-1])
+        time.sleep(1)
+        self.assertIsNone(self.proc.poll())
+
+        self.project.write_skill("react-patterns", "react-patterns", "React hooks and suspense", "## Purpose\nHooks.\n")
+        self.assertTrue(self.wait_for(lambda: "React hooks and suspense" in self.inventory()))
+
+        self.proc.send_signal(signal.SIGINT)
+        output, _ = self.proc.communicate(timeout=10)
+        self.assertIn("Error: sync failed, still watching: UnicodeDecodeError", output)
+        self.assertIn("Watch stopped.", output)
+
+
+if __name__ == '__main__':
+    unittest.main()
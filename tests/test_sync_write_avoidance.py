@@ -0,0 +1,54 @@
+import os
+import unittest
+
+from gsd_project import GsdProject
+
+
+PERSONA = "# Developer\n\n## Skills\n<!-- SKILLS_START -->\n<!-- SKILLS_END -->\n"
+
+
+class TestSyncWriteAvoidance(unittest.TestCase):
+    def setUp(self):
+        self.project = GsdProject()
+        os.makedirs(self.project.path(".agent", "personas"))
+        with open(self.persona_path(), "w", encoding="utf-8") as f:
+            f.write(PERSONA)
+
+    def tearDown(self):
+        self.project.cleanup()
+
+    def persona_path(self):
+        return self.project.path(".agent", "personas", "developer.md")
+
+    def stamps(self):
+        paths = [self.project.path(".gsd", "SKILLS.md"), self.project.path(".gsd", "MCPS.md"), self.persona_path()]
+        return [os.stat(p).st_mtime_ns for p in paths]
+
+    def test_unchanged_sync_leaves_files_untouched(self):
+        first = self.project.sync().stdout
+        self.assertIn("Hydrated persona: developer.md", first)
+
+        # Backdate so a rewrite would be visible even on coarse-mtime filesystems
+        for path in (self.project.path(".gsd", "SKILLS.md"), self.project.path(".gsd", "MCPS.md"), self.persona_path()):
+            os.utime(path, ns=(1, 1))
+        before = self.stamps()
+
+        second = self.project.sync().stdout
+        self.assertIn("Unchanged .gsd/SKILLS.md (5 items).", second)
+        self.assertNotIn("Hydrated persona", second)
+        self.assertEqual(self.stamps(), before)
+        self.assertEqual([f for f in os.listdir(self.project.path(".gsd")) if f.endswith(".tmp")], [])
+
+    def test_edit_rewrites_only_affected_files(self):
+        self.project.sync()
+        self.project.write_skill("react-patterns", "react-patterns", "React hooks and suspense", "## Purpose\nHooks.\n")
+        output = self.project.sync().stdout
+        self.assertIn("Updated .gsd/SKILLS.md with 5 items.", output)
+        self.assertIn("Unchanged .gsd/MCPS.md (0 items).", output)
+        self.assertIn("Hydrated persona: developer.md", output)
+        with open(self.persona_path(), encoding="utf-8") as f:
+            self.assertIn("React hooks and suspense", f.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from gsd_project import SCRIPTS_DIR
+
+sys.path.insert(0, SCRIPTS_DIR)
+import gsd_verify_context  # noqa: E402
+from gsd_audit import AuditLogger  # noqa: E402
+from gsd_verify_context import HistoryStats  # noqa: E402
+
+
+class TestVerifyContext(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="gsd-verify-")
+        self.log_path = os.path.join(self.root, ".gsd", "logs", "audit.jsonl")
+        self.logger = AuditLogger(self.log_path, durability="async", segment_max_bytes=1024)
+        self.written = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def write(self, count, selected=("tdd-workflow",)):
+        for _ in range(count):
+            self.logger.log({"timestamp": time.time(), "context": f"task {self.written}",
+                             "selected_ids": list(selected), "fragment_length": 120 if selected else 0})
+            self.written += 1
+
+    def verify(self, *args):
+        result = subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, "gsd_verify_context.py"), *args],
+                                cwd=self.root, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return result.stdout
+
+    def history(self, output):
+        total, processed = re.search(r"History: (\d+) selections \((\d+) new events", output).groups()
+        return int(total), int(processed)
+
+    def test_full_history_and_last(self):
+        self.write(30)
+        self.write(10, selected=())
+        output = self.verify("--last", "3")
+        self.assertEqual(self.history(output), (40, 40))
+        self.assertEqual(output.count("Context: "), 3)
+        self.assertIn("Empty selections: 10 (25.0%)", output)
+        self.assertIn("Top selected: tdd-workflow (30)", output)
+
+    def test_checkpoint_processes_only_new_events(self):
+        self.write(20)
+        self.verify()
+        # Enough new events to seal the checkpointed segment in between
+        self.write(25)
+        output = self.verify("--since", "checkpoint")
+        self.assertEqual(self.history(output), (45, 25))
+        output = self.verify("--since", "checkpoint")
+        self.assertEqual(self.history(output), (45, 0))
+
+
+class TestHistoryStats(unittest.TestCase):
+    def test_percentiles_are_bucket_bounds(self):
+        stats = HistoryStats()
+        for size in range(1, 1001):
+            stats.add({"timestamp": 0, "selected_ids": ["x"], "fragment_length": size})
+        self.assertTrue(500 <= stats.percentile(50) <= 500 * 1.2)
+        self.assertTrue(990 <= stats.percentile(99) <= 1000 * 1.2)
+
+    def test_top_ids_bounded(self):
+        stats = HistoryStats()
+        original = gsd_verify_context.TOP_IDS_CAPACITY
+        gsd_verify_context.TOP_IDS_CAPACITY = 4
+        try:
+            for i in range(100):
+                stats.add({"timestamp": 0, "selected_ids": ["hot", f"cold-{i}"], "fragment_length": 1})
+        finally:
+            gsd_verify_context.TOP_IDS_CAPACITY = original
+        self.assertEqual(len(stats.top_ids), 4)
+        self.assertEqual(max(stats.top_ids, key=stats.top_ids.get), "hot")
+
+    def test_state_round_trip(self):
+        stats = HistoryStats()
+        stats.add({"timestamp": 7200, "selected_ids": ["a"], "fragment_length": 10})
+        self.assertEqual(HistoryStats(stats.to_dict()).to_dict(), stats.to_dict())
+
+
+if __name__ == '__main__':
+    unittest.main()